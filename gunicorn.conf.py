@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+# WSGI by default. For the async views serve the ASGI application instead
+# (which runs without persistent database connections):
+#   gunicorn -c gunicorn.conf.py -k uvicorn_worker.UvicornWorker \
+#       theatre_api.asgi:application
+wsgi_app = "theatre_api.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+# Every thread keeps its own persistent database connection, so PostgreSQL
+# needs max_connections >= workers * threads.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to bound memory growth.
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = "-"
@@ -8,6 +8,9 @@ from .models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
+    HeldSeat,
+    DailySales,
 )
 
 admin.site.register(TheatreHall)
@@ -17,3 +20,6 @@ admin.site.register(Play)
 admin.site.register(Performance)
 admin.site.register(Reservation)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
+admin.site.register(HeldSeat)
+admin.site.register(DailySales)
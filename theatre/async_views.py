@@ -0,0 +1,133 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework.response import Response
+
+from theatre.conditional import aconditional_on_version
+from theatre.views import PerformanceViewSet, PlayViewSet
+
+
+class AsyncReadView(View):
+    """
+    Native async view serving one read action of a DRF viewset.
+
+    The viewset still runs authentication, permissions, throttling, content
+    negotiation and exception handling, so the endpoint behaves like its
+    sync counterpart; only the data is loaded with the async ORM.
+    """
+
+    viewset_class = None
+    action = None
+    query_budget = None
+
+    def get_viewset(self, request, *args, **kwargs):
+        initkwargs = getattr(getattr(self.viewset_class, self.action), "kwargs", {})
+        viewset = self.viewset_class(**initkwargs)
+        viewset.action_map = {"get": self.action, "head": self.action}
+        viewset.args = args
+        viewset.kwargs = kwargs
+        viewset.request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.headers = viewset.default_response_headers
+        return viewset
+
+    async def get(self, request, *args, **kwargs):
+        self.viewset = self.get_viewset(request, *args, **kwargs)
+        request = self.viewset.request
+        try:
+            await sync_to_async(self.viewset.initial)(request, *args, **kwargs)
+            response = await self.handle(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.viewset.handle_exception(exc)
+        return self.viewset.finalize_response(request, response, *args, **kwargs)
+
+    async def handle(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    async def aget_object(self):
+        viewset = self.viewset
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist,
+            TypeError,
+            ValueError,
+            DjangoValidationError,
+        ):
+            raise Http404
+        await sync_to_async(viewset.check_object_permissions)(viewset.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        viewset = self.viewset
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        projection = viewset.get_list_projection()
+        if projection is not None:
+            queryset = projection.project(queryset)
+        page = await viewset.paginator.apaginate_queryset(
+            queryset, request, view=viewset
+        )
+        if projection is not None:
+            data = await sync_to_async(projection.to_representation)(page)
+        else:
+            data = viewset.get_serializer(page, many=True).data
+        return viewset.get_paginated_response(data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.viewset.get_serializer(instance).data)
+
+
+class PlayListView(AsyncReadView):
+    viewset_class = PlayViewSet
+    action = "list"
+    query_budget = 5
+
+    async def handle(self, request, *args, **kwargs):
+        return await self.viewset.acached_response(self.alist, request, *args, **kwargs)
+
+
+class PlayDetailView(AsyncReadView):
+    viewset_class = PlayViewSet
+    action = "retrieve"
+    query_budget = 5
+
+    async def handle(self, request, *args, **kwargs):
+        return await self.viewset.acached_response(
+            self.aretrieve, request, *args, **kwargs
+        )
+
+
+class PerformanceListView(AsyncReadView):
+    viewset_class = PerformanceViewSet
+    action = "list"
+    query_budget = 3
+
+    async def handle(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class PerformanceDetailView(AsyncReadView):
+    viewset_class = PerformanceViewSet
+    action = "retrieve"
+    query_budget = 8
+
+    @aconditional_on_version
+    async def handle(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+
+class PerformanceSeatMapView(AsyncReadView):
+    viewset_class = PerformanceViewSet
+    action = "seat_map"
+    query_budget = 5
+
+    @aconditional_on_version
+    async def handle(self, request, *args, **kwargs):
+        performance = await self.aget_object()
+        places = [place async for place in self.viewset.unavailable_places(performance)]
+        return self.viewset.seat_map_response(request, performance.theatre_hall, places)
@@ -0,0 +1,225 @@
+import logging
+import operator
+import random
+import time
+from collections import Counter
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from theatre.models import (
+    DailySales,
+    HeldSeat,
+    Performance,
+    Reservation,
+    SeatHold,
+    Ticket,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.05
+
+
+class SeatsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are no longer available."
+    default_code = "seats_unavailable"
+
+    def __init__(self, places):
+        super().__init__()
+        self.places = sorted(places)
+        self.detail = {
+            "detail": self.detail,
+            "seats": [
+                {"performance": performance_id, "row": row, "seat": seat}
+                for performance_id, row, seat in self.places
+            ],
+        }
+
+
+class TooManyHolds(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "You already hold the maximum number of seat selections; confirm or "
+        "release one first."
+    )
+    default_code = "too_many_holds"
+
+
+class HoldExpired(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This hold has expired."
+    default_code = "hold_expired"
+
+
+def places_filter(places):
+    """ORs together (performance_id, row, seat) places into one filter."""
+    return reduce(
+        operator.or_,
+        (
+            Q(performance_id=performance_id, row=row, seat=seat)
+            for performance_id, row, seat in places
+        ),
+    )
+
+
+def contested_places(places, holder=None):
+    """
+    Returns the places that are sold or held, ignoring the holds of
+    ``holder``.
+    """
+    held = HeldSeat.objects.active().filter(places_filter(places))
+    if holder is not None:
+        held = held.exclude(hold__user=holder)
+    taken = Ticket.objects.filter(places_filter(places))
+    return {
+        *held.values_list("performance_id", "row", "seat"),
+        *taken.values_list("performance_id", "row", "seat"),
+    }
+
+
+def lock_performances(performance_ids):
+    """
+    Serializes seat writers per performance by locking the performance rows,
+    in primary key order so concurrent bookings cannot deadlock.
+    """
+    list(
+        Performance.objects.select_for_update()
+        .filter(pk__in=performance_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _with_retries(operation, places, holder=None):
+    """
+    Runs ``operation`` in a transaction, retrying deadlocks, lock timeouts and
+    unique violations with jittered exponential backoff.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return operation()
+        except (IntegrityError, OperationalError) as exc:
+            if attempt == MAX_ATTEMPTS:
+                if isinstance(exc, IntegrityError):
+                    raise SeatsUnavailable(
+                        contested_places(places, holder) or places
+                    ) from exc
+                raise
+            logger.info("Booking attempt %s failed, retrying: %s", attempt, exc)
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+
+def reserve(user, places):
+    """
+    Sells ``places`` (performance_id, row, seat) to ``user`` as one
+    reservation, releasing any of them the user was holding.
+    """
+    places = list(places)
+
+    def operation():
+        lock_performances({performance_id for performance_id, _, _ in places})
+        contested = contested_places(places, holder=user)
+        if contested:
+            raise SeatsUnavailable(contested)
+
+        reservation = Reservation.objects.create(user=user)
+        Ticket.objects.bulk_create(
+            Ticket(
+                reservation=reservation,
+                performance_id=performance_id,
+                row=row,
+                seat=seat,
+            )
+            for performance_id, row, seat in places
+        )
+        HeldSeat.objects.filter(places_filter(places), hold__user=user).delete()
+        counts = Counter(performance_id for performance_id, _, _ in places)
+        Performance.add_tickets_sold(counts)
+        DailySales.record(reservation.created_at, counts)
+        return reservation
+
+    return _with_retries(operation, places, holder=user)
+
+
+def hold(user, performance, seats):
+    """
+    Holds ``seats`` (row, seat) of ``performance`` for SEAT_HOLD_TTL, unless
+    ``user`` already has SEAT_HOLD_MAX_ACTIVE active holds.
+    """
+    places = [(performance.pk, row, seat) for row, seat in seats]
+
+    def operation():
+        # Locking the user serialises their holds, so concurrent requests
+        # cannot both pass the limit.
+        list(
+            get_user_model()
+            .objects.select_for_update()
+            .filter(pk=user.pk)
+            .values_list("pk", flat=True)
+        )
+        active = SeatHold.objects.active().filter(user=user).count()
+        if active >= settings.SEAT_HOLD_MAX_ACTIVE:
+            raise TooManyHolds()
+        lock_performances([performance.pk])
+        contested = contested_places(places)
+        if contested:
+            raise SeatsUnavailable(contested)
+
+        # Lapsed holds keep their rows until the sweeper runs.
+        HeldSeat.objects.expired().filter(places_filter(places)).delete()
+        seat_hold = SeatHold.objects.create(
+            performance=performance,
+            user=user,
+            expires_at=timezone.now() + settings.SEAT_HOLD_TTL,
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(hold=seat_hold, performance=performance, row=row, seat=seat)
+            for row, seat in seats
+        )
+        Performance.bump_version([performance.pk])
+        return seat_hold
+
+    return _with_retries(operation, places)
+
+
+def confirm(seat_hold):
+    """Turns an active hold into a reservation of its seats."""
+    places = [
+        (seat_hold.performance_id, held.row, held.seat)
+        for held in seat_hold.seats.all()
+    ]
+
+    def operation():
+        lock_performances([seat_hold.performance_id])
+        # Deleting the hold claims it; an expired or already confirmed hold
+        # deletes nothing.
+        deleted = SeatHold.objects.active().filter(pk=seat_hold.pk).delete()[1]
+        if not deleted.get(SeatHold._meta.label):
+            raise HoldExpired()
+
+        reservation = Reservation.objects.create(user=seat_hold.user)
+        Ticket.objects.bulk_create(
+            Ticket(
+                reservation=reservation,
+                performance_id=performance_id,
+                row=row,
+                seat=seat,
+            )
+            for performance_id, row, seat in places
+        )
+        counts = {seat_hold.performance_id: len(places)}
+        Performance.add_tickets_sold(counts)
+        DailySales.record(reservation.created_at, counts)
+        return reservation
+
+    return _with_retries(operation, places, holder=seat_hold.user)
@@ -0,0 +1,125 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+CATALOGUE_CACHE = "catalogue"
+STATS = ("hits", "misses", "invalidations")
+
+
+def _cache():
+    return caches[CATALOGUE_CACHE]
+
+
+def _version_key(namespace):
+    return f"catalogue:version:{namespace}"
+
+
+def _count(stat, delta=1):
+    key = f"catalogue:stats:{stat}"
+    if not _cache().add(key, delta, timeout=None):
+        try:
+            _cache().incr(key, delta)
+        except ValueError:
+            _cache().set(key, delta, timeout=None)
+
+
+def get_versions(namespaces):
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = _cache().get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A fresh, unique version so entries stored under an evicted
+            # version can never be served again.
+            _cache().add(key, time.time_ns(), timeout=None)
+            versions[key] = _cache().get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(namespaces):
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            _cache().incr(key)
+        except ValueError:
+            _cache().set(key, time.time_ns(), timeout=None)
+
+
+def invalidate(*namespaces):
+    """
+    Evicts every cached response that depends on one of ``namespaces``.
+
+    Inside a transaction the namespaces are bumped again on commit so a
+    response cached from the old data in between is not served either.
+    The invalidations stat counts each namespace once.
+    """
+    _count("invalidations", len(namespaces))
+    _bump(namespaces)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(namespaces))
+
+
+def get_stats():
+    values = _cache().get_many([f"catalogue:stats:{stat}" for stat in STATS])
+    return {stat: values.get(f"catalogue:stats:{stat}", 0) for stat in STATS}
+
+
+class CachedResponseMixin:
+    """
+    Caches the response data of the list action; viewsets wrap any other
+    read action in ``cached_response`` themselves.
+
+    Entries are keyed by path, query parameters and the current versions of
+    the namespaces returned by ``get_cache_namespaces``; theatre.signals
+    bumps those versions whenever the underlying models change.
+    """
+
+    cache_namespaces = ()
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def get_cache_key(self, request):
+        namespaces = self.get_cache_namespaces()
+        versions = get_versions(namespaces)
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = "|".join(
+            [request.path, query] + [f"{ns}={v}" for ns, v in zip(namespaces, versions)]
+        )
+        return "catalogue:response:" + hashlib.md5(raw.encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = _cache().get(key)
+        if data is not None:
+            _count("hits")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        _count("misses")
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            _cache().set(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """``cached_response`` for an async ``handler``."""
+        key = await sync_to_async(self.get_cache_key)(request)
+        data = await _cache().aget(key)
+        if data is not None:
+            await sync_to_async(_count)("hits")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        await sync_to_async(_count)("misses")
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            await _cache().aset(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
@@ -0,0 +1,103 @@
+from functools import wraps
+
+from django.db.models import OuterRef, Subquery
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from theatre.models import Performance, SeatHold
+
+
+def performance_etag(request, pk):
+    """
+    Builds the ETag of a performance representation from its version, or
+    returns ``None`` if the performance does not exist. theatre.signals
+    bumps the version when the play or hall it embeds is edited.
+    """
+    try:
+        version, next_expiry = _etag_values(pk).get()
+    except (Performance.DoesNotExist, ValueError):
+        return None
+    return _etag(request, pk, version, next_expiry)
+
+
+async def aperformance_etag(request, pk):
+    """``performance_etag`` for async views."""
+    try:
+        version, next_expiry = await _etag_values(pk).aget()
+    except (Performance.DoesNotExist, ValueError):
+        return None
+    return _etag(request, pk, version, next_expiry)
+
+
+def _etag_values(pk):
+    # A hold stops counting at its expiry, before the sweeper deletes it
+    # and bumps the version, so the next expiry is part of the tag too.
+    next_expiry = (
+        SeatHold.objects.active()
+        .filter(performance=OuterRef("pk"))
+        .order_by("expires_at")
+        .values("expires_at")[:1]
+    )
+    return (
+        Performance.objects.filter(pk=pk)
+        .annotate(next_expiry=Subquery(next_expiry))
+        .values_list("version", "next_expiry")
+    )
+
+
+def _etag(request, pk, version, next_expiry):
+    expiry = f"-{next_expiry:%Y%m%d%H%M%S%f}" if next_expiry else ""
+    return quote_etag(f"{pk}-{version}{expiry}-{request.accepted_renderer.format}")
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in [tag.removeprefix("W/") for tag in etags]
+
+
+def conditional_on_version(view_method):
+    """
+    Answers ``If-None-Match`` with 304 Not Modified from the ETag of the
+    performance in ``kwargs["pk"]`` alone, and sets the ETag of fresh
+    responses.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag = performance_etag(request, kwargs["pk"])
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = view_method(self, request, *args, **kwargs)
+        return with_etag(response, etag)
+
+    return wrapper
+
+
+def aconditional_on_version(view_method):
+    """``conditional_on_version`` for async view methods."""
+
+    @wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        etag = await aperformance_etag(request, kwargs["pk"])
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = await view_method(self, request, *args, **kwargs)
+        return with_etag(response, etag)
+
+    return wrapper
+
+
+def not_modified(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def with_etag(response, etag):
+    if etag is not None and response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+    return response
@@ -0,0 +1,492 @@
+"""
+Synthetic catalogue, users and bookings at a configurable scale, for
+benchmarking the API against a realistically sized database.
+"""
+
+import csv
+import heapq
+import io
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from theatre.cache import invalidate
+from theatre.models import (
+    Actor,
+    DailySales,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+# Rows per model, and the number of tickets spread over the performances.
+SCALES = {
+    "tiny": {
+        "genres": 5,
+        "actors": 20,
+        "halls": 2,
+        "plays": 10,
+        "performances": 24,
+        "users": 20,
+        "tickets": 2_000,
+    },
+    "small": {
+        "genres": 20,
+        "actors": 500,
+        "halls": 5,
+        "plays": 200,
+        "performances": 1_000,
+        "users": 2_000,
+        "tickets": 200_000,
+    },
+    "medium": {
+        "genres": 30,
+        "actors": 2_000,
+        "halls": 10,
+        "plays": 1_000,
+        "performances": 5_000,
+        "users": 20_000,
+        "tickets": 1_000_000,
+    },
+    "large": {
+        "genres": 50,
+        "actors": 10_000,
+        "halls": 20,
+        "plays": 5_000,
+        "performances": 25_000,
+        "users": 100_000,
+        "tickets": 5_000_000,
+    },
+}
+SHOW_TIMES = (time(13, 0), time(16, 30), time(20, 0))
+# Relative demand per show of the day and per weekday, Monday first.
+SHOW_DEMAND = (0.75, 0.9, 1.2)
+WEEKDAY_DEMAND = (0.7, 0.8, 0.85, 0.95, 1.25, 1.4, 1.1)
+# Seats booked together, and how often parties of each size book.
+PARTY_SIZES = (1, 2, 3, 4, 5, 6)
+PARTY_WEIGHTS = (15, 45, 10, 20, 5, 5)
+# Days between booking and show: exponential with this mean, capped.
+BOOKING_LEAD_DAYS = 14
+MAX_LEAD_DAYS = 120
+# Performances whose bookings are planned and loaded as one unit.
+CHUNK_SIZE = 50
+USER_EMAIL = "benchmark-{}@example.com"
+USER_PASSWORD = "benchmark"
+
+WORDS = (
+    "Night", "Winter", "Garden", "Crown", "Storm", "Mirror", "River", "Glass",
+    "Summer", "Masks", "Lantern", "Orchard", "Tempest", "Harbour", "Shadow",
+    "Letters", "Dream", "Island", "Tower", "Wedding", "Ghost", "Bridge",
+)  # fmt: skip
+FIRST_NAMES = (
+    "Anna", "Ben", "Clara", "David", "Elena", "Felix", "Grace", "Hugo", "Iris",
+    "Jonas", "Kate", "Leo", "Maria", "Nina", "Oscar", "Paula", "Sam", "Vera",
+)  # fmt: skip
+LAST_NAMES = (
+    "Adler", "Brook", "Carter", "Dunn", "Ellis", "Fischer", "Hale", "Ivanova",
+    "Kovacs", "Lind", "Moreau", "Novak", "Price", "Rossi", "Stone", "Weber",
+)  # fmt: skip
+
+# User ids bookings are drawn from, set in every worker process.
+_users = []
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def generate(
+    scale,
+    seed=0,
+    batch_size=10_000,
+    start=None,
+    progress=None,
+    workers=1,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Inserts a dataset of the ``scale`` preset (a key of SCALES or a dict
+    like its values). The catalogue is written with bulk_create,
+    reservations, tickets and sales with COPY on PostgreSQL and batched
+    INSERTs elsewhere.
+
+    Performances run daily from ``start`` (2025-01-01 by default), three
+    shows a day per hall. How full each one gets follows its demand: the
+    popularity of the play, the weekday, the time of day and the size of
+    the hall, scaled so the performances sell about the requested number
+    of tickets. Central seats near the stage go first, to parties of
+    neighbouring seats booked up to MAX_LEAD_DAYS before the show.
+
+    Bookings are planned and loaded ``chunk_size`` performances at a time,
+    each chunk in its own transaction and, on PostgreSQL with ``workers``
+    above one, in parallel processes. Every chunk draws from its own
+    random generator, so the same seed and chunk size produce the same
+    data, row ids aside, whatever the number of workers or batch size.
+    Users are created once and reused by later runs.
+
+    ``progress(model_name, count)`` is called after every batch or chunk.
+    Returns the number of rows created per model.
+    """
+    counts = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1)
+    if settings.USE_TZ and timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    progress = progress or (lambda name, count: None)
+    created = {}
+
+    def report(name, count):
+        created[name] = created.get(name, 0) + count
+        progress(name, created[name])
+
+    genres = _genres(counts["genres"])
+    report("genres", len(genres))
+    actors = _bulk_create(
+        "actors",
+        Actor,
+        (
+            Actor(first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES))
+            for _ in range(counts["actors"])
+        ),
+        batch_size,
+        report,
+    )
+    halls = _bulk_create(
+        "halls",
+        TheatreHall,
+        (
+            TheatreHall(
+                name=f"Hall {index + 1}",
+                rows=rng.randint(10, 30),
+                seats_in_row=rng.randint(15, 40),
+            )
+            for index in range(counts["halls"])
+        ),
+        batch_size,
+        report,
+    )
+    plays = _bulk_create(
+        "plays",
+        Play,
+        (
+            Play(
+                title=" ".join(rng.sample(WORDS, rng.randint(1, 3))),
+                description=" ".join(rng.choices(WORDS, k=rng.randint(20, 80))),
+            )
+            for _ in range(counts["plays"])
+        ),
+        batch_size,
+        report,
+    )
+    _link(plays, Play.genres.through, "genre_id", genres, (1, 3), rng, batch_size)
+    _link(plays, Play.actors.through, "actor_id", actors, (3, 12), rng, batch_size)
+    users = _users_for(counts["users"], batch_size)
+    report("users", len(users))
+
+    popularity = {play.pk: rng.lognormvariate(0, 0.5) for play in plays}
+    average_capacity = sum(hall.capacity for hall in halls) / len(halls)
+    performances, demands = [], []
+    for index in range(counts["performances"]):
+        hall = halls[index % len(halls)]
+        day, show = divmod(index // len(halls), len(SHOW_TIMES))
+        show_time = start + timedelta(
+            days=day, hours=SHOW_TIMES[show].hour, minutes=SHOW_TIMES[show].minute
+        )
+        play = rng.choice(plays)
+        performances.append(
+            Performance(play=play, theatre_hall=hall, show_time=show_time)
+        )
+        demands.append(
+            popularity[play.pk]
+            * SHOW_DEMAND[show]
+            * WEEKDAY_DEMAND[show_time.weekday()]
+            * (average_capacity / hall.capacity) ** 0.5
+            * rng.lognormvariate(0, 0.25)
+        )
+    capacities = [performance.theatre_hall.capacity for performance in performances]
+    sold = _tickets_sold(capacities, demands, counts["tickets"])
+    for performance, tickets_sold in zip(performances, sold):
+        performance.tickets_sold = tickets_sold
+    performances = _bulk_create(
+        "performances", Performance, performances, batch_size, report
+    )
+
+    tasks = [
+        (
+            index,
+            seed,
+            [
+                (
+                    performance.pk,
+                    performance.theatre_hall.rows,
+                    performance.theatre_hall.seats_in_row,
+                    performance.tickets_sold,
+                    performance.show_time,
+                )
+                for performance in chunk
+            ],
+        )
+        for index, chunk in enumerate(batched(performances, chunk_size))
+    ]
+    for reservations, tickets in _load_chunks(tasks, users, workers):
+        report("reservations", reservations)
+        report("tickets", tickets)
+
+    # Nothing above sends signals, so evict cached responses here.
+    invalidate("genres", "actors", "theatre_halls", "plays", "play_relations")
+    return created
+
+
+def _bulk_create(name, model, objects, batch_size, report):
+    created = []
+    for batch in batched(objects, batch_size):
+        created += model.objects.bulk_create(batch)
+        report(name, len(batch))
+    return created
+
+
+def _genres(count):
+    names = [f"Genre {index + 1}" for index in range(count)]
+    Genre.objects.bulk_create(
+        (Genre(name=name) for name in names), ignore_conflicts=True
+    )
+    return list(Genre.objects.filter(name__in=names).order_by("name"))
+
+
+def _users_for(count, batch_size):
+    emails = [USER_EMAIL.format(index + 1) for index in range(count)]
+    # Hashing is deliberately slow, so every user shares one hash.
+    password = make_password(USER_PASSWORD)
+    user_model = get_user_model()
+    for batch in batched(emails, batch_size):
+        user_model.objects.bulk_create(
+            (user_model(email=email, password=password) for email in batch),
+            ignore_conflicts=True,
+        )
+    pks = {}
+    for batch in batched(emails, batch_size):
+        pks.update(
+            user_model.objects.filter(email__in=batch).values_list("email", "pk")
+        )
+    return [pks[email] for email in emails]
+
+
+def _link(plays, through, column, targets, sizes, rng, batch_size):
+    links = (
+        through(play_id=play.pk, **{column: target.pk})
+        for play in plays
+        for target in rng.sample(targets, min(len(targets), rng.randint(*sizes)))
+    )
+    for batch in batched(links, batch_size):
+        through.objects.bulk_create(batch)
+
+
+def _tickets_sold(capacities, demands, tickets):
+    """
+    Scales ``demands`` so the performances sell about ``tickets`` seats in
+    total, none more than its capacity. Returns the seats sold per
+    performance.
+    """
+
+    def sold(scale):
+        return [
+            min(capacity, round(capacity * demand * scale))
+            for capacity, demand in zip(capacities, demands)
+        ]
+
+    low, high = 0.0, 1.0
+    while sum(sold(high)) < tickets and high < 2**20:
+        low, high = high, high * 2
+    for _ in range(30):
+        middle = (low + high) / 2
+        if sum(sold(middle)) < tickets:
+            low = middle
+        else:
+            high = middle
+    return sold(high)
+
+
+def _seat_plan(rows, seats_in_row, sold, rng):
+    """
+    Picks ``sold`` seats, favouring central ones near the stage, and
+    returns them as ``(row, seat)`` pairs in row-major order.
+    """
+    middle = (seats_in_row - 1) / 2
+
+    def key(place):
+        row, seat = divmod(place, seats_in_row)
+        weight = (1 - abs(seat - middle) / seats_in_row) * (1 - row / (2 * rows))
+        # Weighted sampling without replacement (Efraimidis-Spirakis).
+        return rng.random() ** (1 / weight)
+
+    places = heapq.nlargest(sold, range(rows * seats_in_row), key=key)
+    return [
+        (place // seats_in_row + 1, place % seats_in_row + 1)
+        for place in sorted(places)
+    ]
+
+
+def _load_chunks(tasks, users, workers):
+    """
+    Runs ``_load_chunk`` over ``tasks``, in ``workers`` forked processes
+    where that is possible. Yields what every chunk returns, in order.
+    """
+    parallel = (
+        workers > 1
+        and len(tasks) > 1
+        and connection.vendor == "postgresql"
+        # Workers cannot see rows this transaction has not committed.
+        and not connection.in_atomic_block
+        and "fork" in multiprocessing.get_all_start_methods()
+    )
+    if not parallel:
+        _init_worker(users)
+        yield from map(_load_chunk, tasks)
+        return
+
+    # Every worker opens its own connections.
+    connections.close_all()
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(users,),
+    ) as executor:
+        yield from executor.map(_load_chunk, tasks)
+
+
+def _init_worker(users):
+    global _users
+    _users = users
+
+
+def _load_chunk(task):
+    """
+    Books the seats of a chunk of performances and writes the
+    reservations, tickets and daily sales in one transaction. Returns the
+    number of reservations and tickets written.
+    """
+    index, seed, performances = task
+    rng = random.Random(f"{seed}:{index}")
+    reservations, tickets, sales = [], [], {}
+    for performance, rows, seats_in_row, sold, show_time in performances:
+        places = _seat_plan(rows, seats_in_row, sold, rng)
+        while places:
+            size = rng.choices(PARTY_SIZES, PARTY_WEIGHTS)[0]
+            party, places = places[:size], places[size:]
+            lead = min(rng.expovariate(1 / BOOKING_LEAD_DAYS), MAX_LEAD_DAYS)
+            created_at = show_time - timedelta(days=lead)
+            tickets += [
+                (performance, len(reservations), row, seat) for row, seat in party
+            ]
+            reservations.append((created_at, rng.choice(_users)))
+            day = (
+                timezone.localtime(created_at)
+                if timezone.is_aware(created_at)
+                else created_at
+            ).date()
+            sales[day, performance] = sales.get((day, performance), 0) + len(party)
+
+    with transaction.atomic():
+        db = connections[Reservation.objects.db]
+        if db.vendor == "postgresql":
+            # Seed data is cheap to regenerate, so a crash losing the last
+            # chunks is fine; not waiting for the WAL flush is not.
+            with db.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit TO OFF")
+        ids = _allocate_ids(Reservation, len(reservations))
+        _insert(
+            Reservation,
+            ("id", "created_at", "user"),
+            ((pk, *reservation) for pk, reservation in zip(ids, reservations)),
+        )
+        _insert(
+            Ticket,
+            ("performance", "reservation", "row", "seat"),
+            (
+                (performance, ids[reservation], row, seat)
+                for performance, reservation, row, seat in tickets
+            ),
+        )
+        _insert(
+            DailySales,
+            ("date", "performance", "tickets_sold"),
+            ((day, performance, count) for (day, performance), count in sales.items()),
+        )
+    return len(reservations), len(tickets)
+
+
+def _allocate_ids(model, count):
+    """Reserves ``count`` primary keys of ``model`` for rows about to be loaded."""
+    db = connections[model.objects.db]
+    if db.vendor == "postgresql":
+        with db.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [model._meta.db_table, model._meta.pk.column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+    # Elsewhere chunks load one at a time, so the keys after the last are free.
+    last = model.objects.aggregate(last=Max("pk"))["last"] or 0
+    return list(range(last + 1, last + count + 1))
+
+
+def _insert(model, fields, rows, batch_size=10_000):
+    """
+    Writes ``rows``, tuples of the values of ``fields``, to the table of
+    ``model``: with COPY on PostgreSQL, in batched INSERTs elsewhere.
+    """
+    db = connections[model.objects.db]
+    quote = db.ops.quote_name
+    fields = [model._meta.get_field(name) for name in fields]
+    table = quote(model._meta.db_table)
+    columns = ", ".join(quote(field.column) for field in fields)
+    with db.cursor() as cursor:
+        if db.vendor == "postgresql":
+            _copy(cursor.cursor, f"COPY {table} ({columns}) FROM STDIN", rows)
+            return
+        # Multi-row INSERTs as bulk_create writes them, within the backend's
+        # limit on query parameters.
+        placeholder = f"({', '.join(['%s'] * len(fields))})"
+        rows = list(rows)
+        size = min(batch_size, db.ops.bulk_batch_size(fields, rows) or batch_size)
+        for batch in batched(rows, size):
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES "
+                + ", ".join([placeholder] * len(batch)),
+                [
+                    field.get_db_prep_save(value, db)
+                    for row in batch
+                    for field, value in zip(fields, row)
+                ],
+            )
+
+
+def _copy(cursor, sql, rows):
+    if hasattr(cursor, "copy"):
+        # psycopg 3
+        with cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+    # psycopg2 reads the data from a file; none of the values here is
+    # NULL or an empty string, which CSV could not tell apart.
+    data = io.StringIO()
+    csv.writer(data).writerows(rows)
+    data.seek(0)
+    cursor.copy_expert(f"{sql} WITH (FORMAT csv)", data)
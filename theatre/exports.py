@@ -0,0 +1,109 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+
+from theatre.models import Reservation, Ticket
+
+CHUNK_SIZE = 2000
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+# Column name -> lookup, per export. Rows are read with values_list(), so
+# an export never builds model instances or nests related objects.
+COLUMNS = {
+    "reservations": {
+        "id": "id",
+        "created_at": "created_at",
+        "user": "user_id",
+        "user_email": "user__email",
+        "tickets": "ticket_count",
+    },
+    "tickets": {
+        "id": "id",
+        "reservation": "reservation_id",
+        "created_at": "reservation__created_at",
+        "user_email": "reservation__user__email",
+        "performance": "performance_id",
+        "show_time": "performance__show_time",
+        "play": "performance__play__title",
+        "theatre_hall": "performance__theatre_hall__name",
+        "row": "row",
+        "seat": "seat",
+    },
+}
+
+
+def export_rows(kind, start=None, end=None, performance=None):
+    """
+    Returns the column names and a lazy iterator over the rows of the
+    ``kind`` export, read in chunks through a server-side cursor where the
+    database supports one. ``start`` and ``end`` bound the reservation time
+    as a half-open ``[start, end)`` range.
+    """
+    if kind == "reservations":
+        queryset = Reservation.objects.all()
+        created_at, performance_lookup = "created_at", "tickets__performance"
+    else:
+        queryset = Ticket.objects.all()
+        created_at, performance_lookup = "reservation__created_at", "performance"
+
+    if start is not None:
+        queryset = queryset.filter(**{f"{created_at}__gte": start})
+    if end is not None:
+        queryset = queryset.filter(**{f"{created_at}__lt": end})
+    if performance is not None:
+        queryset = queryset.filter(**{performance_lookup: performance})
+    if kind == "reservations":
+        # Counts only the tickets matching the performance filter.
+        queryset = queryset.annotate(ticket_count=Count("tickets"))
+
+    columns = COLUMNS[kind]
+    rows = (
+        queryset.order_by("id")
+        .values_list(*columns.values())
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return list(columns), rows
+
+
+class Echo:
+    """File-like object handing back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def render(columns, rows, file_format):
+    """Yields the export as text, a chunk of rows at a time."""
+    if file_format == "csv":
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        lines = map(writer.writerow, rows)
+    else:
+        lines = (
+            json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+            for row in rows
+        )
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+async def arender(columns, rows, file_format):
+    """
+    render() for ASGI, which would otherwise read a synchronous iterator to
+    the end before sending any of it. Every chunk is built in the same sync
+    thread, the one holding the database connection and its cursor.
+    """
+    chunks = render(columns, rows, file_format)
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
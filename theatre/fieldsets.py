@@ -0,0 +1,207 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=OpenApiTypes.STR,
+        description=(
+            "Comma separated fields to return, dotted for nested ones, "
+            "e.g. id,show_time,play.title; unknown names are ignored"
+        ),
+    ),
+    OpenApiParameter(
+        "expand",
+        type=OpenApiTypes.STR,
+        description=(
+            "Comma separated relations to nest, e.g. tickets.performance; the "
+            "others are returned as ids. Every relation is nested by default"
+        ),
+    ),
+]
+
+
+def _split(path):
+    if isinstance(path, tuple):
+        return path
+    return tuple(path.split(".")) if path else ()
+
+
+def _parse(value):
+    if value is None:
+        return None
+    return {_split(path.strip()) for path in value.split(",") if path.strip()}
+
+
+class Fieldset:
+    """
+    The fields and nested relations a request asks for with ``?fields=``
+    and ``?expand=``. Paths are dotted, relative to the serialized object.
+
+    Without ``fields`` every field is returned. Without ``expand`` every
+    expandable relation is nested as usual; with it only the listed ones
+    (and the relations on the way to them) are, the rest render as ids.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        expand = _parse(query_params.get("expand"))
+        if expand is not None:
+            expand = {path[:end] for path in expand for end in range(1, len(path) + 1)}
+        return cls(_parse(query_params.get("fields")), expand)
+
+    def at(self, path):
+        """Returns the fieldset of the object nested at ``path``."""
+        prefix = _split(path)
+        if not prefix:
+            return self
+
+        def relative(paths):
+            return {
+                item[len(prefix) :]
+                for item in paths
+                if item[: len(prefix)] == prefix and len(item) > len(prefix)
+            }
+
+        fields = self.fields
+        if fields is not None and not any(
+            prefix[: len(item)] == item for item in fields
+        ):
+            fields = relative(fields)
+        else:
+            # The object itself, or one enclosing it, was asked for whole.
+            fields = None
+        return Fieldset(fields, None if self.expand is None else relative(self.expand))
+
+    def wants(self, path):
+        """Whether the field at ``path`` is part of the response."""
+        if self.fields is None:
+            return True
+        path = _split(path)
+        return any(
+            item[: len(path)] == path or path[: len(item)] == item
+            for item in self.fields
+        )
+
+    def expands(self, path):
+        """Whether the relation at ``path`` is returned as a nested object."""
+        return self.wants(path) and (self.expand is None or _split(path) in self.expand)
+
+    def prune(self, path, fields, expandable=()):
+        """
+        Returns the ``fields`` of the serializer at ``path`` the request
+        wants, with the ``expandable`` ones it does not expand as ids.
+        """
+        fieldset = self.at(path)
+        pruned = {}
+        for name, field in fields.items():
+            if not fieldset.wants(name):
+                continue
+            if name in expandable and not fieldset.expands(name):
+                field = serializers.PrimaryKeyRelatedField(
+                    source=field.source,
+                    many=isinstance(field, serializers.ListSerializer),
+                    read_only=True,
+                )
+            pruned[name] = field
+        return pruned
+
+    def only(self, queryset, columns, always=()):
+        """
+        Loads the columns and joins the relations the wanted fields read.
+
+        ``columns`` maps field paths to the lookups behind them, e.g.
+        ``{"play_title": ["play__title"]}``; every relation crossed by a
+        wanted lookup is joined with select_related. Without ``?fields=``
+        all columns of the joined tables are loaded.
+        """
+        lookups = set(always)
+        for path, needed in columns.items():
+            if self.wants(path):
+                lookups.update(needed)
+        related = {
+            "__".join(parts[:end])
+            for parts in (lookup.split("__") for lookup in lookups)
+            for end in range(1, len(parts))
+        }
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        if self.fields is None:
+            return queryset
+        return queryset.only(queryset.model._meta.pk.name, *lookups, *related)
+
+
+class FieldsetSerializerMixin:
+    """
+    Leaves out the fields the request's fieldset does not want and returns
+    the ``Meta.expandable_fields`` it does not expand as ids.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get("fieldset")
+        if fieldset is None:
+            return fields
+        return fieldset.prune(
+            self.fieldset_path,
+            fields,
+            getattr(self.Meta, "expandable_fields", ()),
+        )
+
+    @property
+    def fieldset_path(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(path))
+
+
+class FieldsetViewMixin:
+    """
+    Accepts ``?fields=`` and ``?expand=`` on read actions. The serializers
+    drop what is not asked for and the queryset only loads the columns
+    and joins the relations behind the remaining fields.
+
+    ``fieldset_columns`` maps field paths to the lookups they read, see
+    ``Fieldset.only``; viewsets override ``get_fieldset_columns`` when the
+    fields differ between actions.
+    """
+
+    fieldset_columns = {}
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            request = getattr(self, "request", None)
+            if request is None or request.method not in SAFE_METHODS:
+                self._fieldset = Fieldset()
+            else:
+                self._fieldset = Fieldset.from_query_params(request.query_params)
+        return self._fieldset
+
+    def get_fieldset_columns(self):
+        return self.fieldset_columns
+
+    def get_queryset(self):
+        # Keyset pagination reads the ordering fields of the page edges.
+        ordering = getattr(self.pagination_class, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return self.get_fieldset().only(
+            super().get_queryset(),
+            self.get_fieldset_columns(),
+            always=[name.lstrip("-") for name in ordering],
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
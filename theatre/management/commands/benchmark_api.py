@@ -0,0 +1,650 @@
+import json
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from contextlib import ExitStack, nullcontext
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError, OutputWrapper
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre import booking, dataset
+from theatre.cache import CATALOGUE_CACHE
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from theatre.query_budget import QueryBudgetMiddleware, QueryCounter
+
+ADMIN_EMAIL = "benchmark-admin@example.com"
+# Far enough ahead that the benchmark never collides with scheduled shows.
+FREE_DATE = "2100-01-04"
+UNTHROTTLED_RATE = "1000000/second"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the p50/p95/p99 latency, query count and response size of "
+        "every theatre endpoint and writes them as JSON, so runs on different "
+        "commits can be diffed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            choices=dataset.SCALES,
+            help="Insert a synthetic dataset of this scale before measuring.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Measured requests per endpoint."
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=3,
+            help="Unmeasured requests per endpoint before measuring.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help=(
+                'Only endpoints whose name contains this, e.g. "performances"; '
+                "repeatable."
+            ),
+        )
+        parser.add_argument(
+            "--url",
+            help=(
+                "Base URL of a running server, e.g. http://localhost:8000, to "
+                "measure over HTTP instead of in-process. Only read endpoints "
+                "are measured, query counts come from the X-Query-Count "
+                "header the server sends in DEBUG mode, and the server needs "
+                "THROTTLE_RATE_USER raised to let the requests through."
+            ),
+        )
+        parser.add_argument(
+            "--cold-cache",
+            action="store_true",
+            help="Clear the catalogue response cache before every request.",
+        )
+        parser.add_argument(
+            "--output", default="-", help='JSON report file, "-" for stdout.'
+        )
+        parser.add_argument(
+            "--compare", help="Earlier JSON report to print the changes against."
+        )
+
+    def handle(self, *args, **options):
+        """
+        Requests every endpoint ``--warmup`` times and then ``--requests``
+        times, recording the latency, queries and bytes of each response.
+
+        In-process, requests go through the full middleware stack of the
+        Django test client with throttling lifted. Write endpoints run
+        inside a transaction that is rolled back after every request, so
+        each one sees the same data; so do reads needing a fresh seat hold.
+        """
+        self.log = self.stdout
+        if options["output"] == "-":
+            # Keep stdout for the report.
+            self.log = OutputWrapper(self.stderr._out)
+        if options["cold_cache"] and options["url"]:
+            raise CommandError("--cold-cache only works in-process.")
+
+        if options["generate"]:
+            created = dataset.generate(
+                options["generate"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                progress=lambda name, count: self.log.write(f"{count} {name}"),
+            )
+            self.log.write(
+                self.style.SUCCESS(
+                    "Generated "
+                    + ", ".join(f"{count} {name}" for name, count in created.items())
+                )
+            )
+
+        fixtures = self.fixtures()
+        self.tokens = fixtures["tokens"]
+        scenarios = self.scenarios(fixtures)
+        if options["url"]:
+            scenarios = [s for s in scenarios if s[1] == "GET" and not callable(s[3])]
+        if options["endpoints"]:
+            scenarios = [
+                s
+                for s in scenarios
+                if any(part in s[0] for part in options["endpoints"])
+            ]
+
+        endpoints = {}
+        with ExitStack() as stack:
+            if not options["url"]:
+                stack.enter_context(self.in_process())
+            for scenario in scenarios:
+                endpoints[scenario[0]] = self.measure(scenario, options)
+                self.log.write(self.describe(scenario[0], endpoints[scenario[0]]))
+
+        report = {
+            "commit": self.commit(),
+            "database": connection.vendor,
+            "dataset": {
+                model._meta.model_name: model.objects.count()
+                for model in (Genre, Actor, TheatreHall, Play, Performance, Ticket)
+            },
+            "target": options["url"] or "in-process",
+            "requests": options["requests"],
+            "endpoints": endpoints,
+        }
+        content = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if options["output"] == "-":
+            self.stdout.write(content, ending="")
+        else:
+            with open(options["output"], "w") as file:
+                file.write(content)
+            self.log.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                self.compare(json.load(file)["endpoints"], endpoints)
+
+    def fixtures(self):
+        """Picks the rows the endpoints are requested with."""
+        performance = (
+            Performance.objects.select_related("theatre_hall")
+            .order_by("-tickets_sold", "id")
+            .first()
+        )
+        if performance is None:
+            raise CommandError(
+                "There are no performances to benchmark; pass --generate tiny."
+            )
+        emptiest = (
+            Performance.objects.select_related("theatre_hall")
+            .order_by("tickets_sold", "id")
+            .first()
+        )
+        taken = set(emptiest.tickets.values_list("row", "seat"))
+        hall = emptiest.theatre_hall
+        free = [
+            (row, seat)
+            for row in range(1, hall.rows + 1)
+            for seat in range(1, hall.seats_in_row + 1)
+            if (row, seat) not in taken
+        ][:2]
+        if len(free) < 2:
+            raise CommandError("Every performance is sold out.")
+
+        customer = (
+            Reservation.objects.values("user")
+            .annotate(count=Count("id"))
+            .order_by("-count", "user")
+            .first()
+        )
+        users = get_user_model().objects
+        customer = (
+            users.get(pk=customer["user"])
+            if customer
+            else users.get_or_create(email=dataset.USER_EMAIL.format(1))[0]
+        )
+        admin, _ = users.get_or_create(email=ADMIN_EMAIL, defaults={"is_staff": True})
+        return {
+            "performance": performance,
+            "emptiest": emptiest,
+            "free": free,
+            "genre": Genre.objects.order_by("id").first(),
+            "actor": Actor.objects.order_by("id").first(),
+            "customer": customer,
+            "tokens": {
+                "customer": str(AccessToken.for_user(customer)),
+                "admin": str(AccessToken.for_user(admin)),
+            },
+            "date": performance.show_time.date().isoformat(),
+            "word": performance.play.title.split()[0],
+        }
+
+    @staticmethod
+    def scenarios(f):
+        """
+        ``(name, method, user, path, data, headers)`` per endpoint. A
+        callable path runs inside the rolled back transaction, creating
+        what the request needs, and returns the path.
+        """
+        performance, emptiest = f["performance"], f["emptiest"]
+        (row, seat), (other_row, other_seat) = f["free"]
+        customer = f["customer"]
+
+        def url(name, *args):
+            return reverse(f"theatre:{name}", args=args)
+
+        def held(name):
+            def path():
+                seat_hold = booking.hold(customer, emptiest, [(row, seat)])
+                return url(name, seat_hold.pk)
+
+            return path
+
+        def reserved():
+            reservation = booking.reserve(customer, [(emptiest.pk, row, seat)])
+            return url("reservation-detail", reservation.pk)
+
+        octet = {"Accept": "application/octet-stream"}
+        return [
+            ("GET genres/", "GET", "customer", url("genre-list"), None, {}),
+            ("GET actors/", "GET", "customer", url("actor-list"), None, {}),
+            (
+                "GET theatre_halls/",
+                "GET",
+                "customer",
+                url("theatrehall-list"),
+                None,
+                {},
+            ),
+            ("GET plays/", "GET", "customer", url("play-list"), None, {}),
+            (
+                "GET plays/?search=",
+                "GET",
+                "customer",
+                f"{url('play-list')}?search={f['word']}",
+                None,
+                {},
+            ),
+            (
+                "GET plays/{pk}/",
+                "GET",
+                "customer",
+                url("play-detail", performance.play_id),
+                None,
+                {},
+            ),
+            ("GET performances/", "GET", "customer", url("performance-list"), None, {}),
+            (
+                "GET performances/?date=",
+                "GET",
+                "customer",
+                f"{url('performance-list')}?date={f['date']}",
+                None,
+                {},
+            ),
+            (
+                "GET performances/{pk}/",
+                "GET",
+                "customer",
+                url("performance-detail", performance.pk),
+                None,
+                {},
+            ),
+            (
+                "GET performances/{pk}/seat_map/",
+                "GET",
+                "customer",
+                url("performance-seat-map", performance.pk),
+                None,
+                {},
+            ),
+            (
+                "GET performances/{pk}/seat_map/ (binary)",
+                "GET",
+                "customer",
+                url("performance-seat-map", performance.pk),
+                None,
+                octet,
+            ),
+            ("GET reservations/", "GET", "customer", url("reservation-list"), None, {}),
+            ("GET seat_holds/", "GET", "customer", url("seathold-list"), None, {}),
+            (
+                "GET seat_holds/{pk}/",
+                "GET",
+                "customer",
+                held("seathold-detail"),
+                None,
+                {},
+            ),
+            *(
+                (
+                    f"GET analytics/{report}/",
+                    "GET",
+                    "admin",
+                    url(f"analytics-{report.replace('_', '-')}"),
+                    None,
+                    {},
+                )
+                for report in (
+                    "performances",
+                    "plays",
+                    "theatre_halls",
+                    "days",
+                    "sales",
+                )
+            ),
+            ("GET cache_stats/", "GET", "admin", url("cache-stats"), None, {}),
+            *(
+                (
+                    f"GET exports/{kind}.{file_format}?performance=",
+                    "GET",
+                    "admin",
+                    f"{url('export', kind, file_format)}?performance={performance.pk}",
+                    None,
+                    {},
+                )
+                for kind in ("reservations", "tickets")
+                for file_format in ("csv", "jsonl")
+            ),
+            ("GET async/plays/", "GET", "customer", url("async-play-list"), None, {}),
+            (
+                "GET async/plays/{pk}/",
+                "GET",
+                "customer",
+                url("async-play-detail", performance.play_id),
+                None,
+                {},
+            ),
+            (
+                "GET async/performances/",
+                "GET",
+                "customer",
+                url("async-performance-list"),
+                None,
+                {},
+            ),
+            (
+                "GET async/performances/{pk}/",
+                "GET",
+                "customer",
+                url("async-performance-detail", performance.pk),
+                None,
+                {},
+            ),
+            (
+                "GET async/performances/{pk}/seat_map/",
+                "GET",
+                "customer",
+                url("async-performance-seat-map", performance.pk),
+                None,
+                {},
+            ),
+            (
+                "POST genres/",
+                "POST",
+                "admin",
+                url("genre-list"),
+                {"name": "Benchmark genre"},
+                {},
+            ),
+            (
+                "POST actors/",
+                "POST",
+                "admin",
+                url("actor-list"),
+                {"first_name": "Benchmark", "last_name": "Actor"},
+                {},
+            ),
+            (
+                "POST theatre_halls/",
+                "POST",
+                "admin",
+                url("theatrehall-list"),
+                {"name": "Benchmark hall", "rows": 20, "seats_in_row": 30},
+                {},
+            ),
+            (
+                "POST plays/",
+                "POST",
+                "admin",
+                url("play-list"),
+                {
+                    "title": "Benchmark play",
+                    "description": "Measured and rolled back.",
+                    "genres": [f["genre"].pk] if f["genre"] else [],
+                    "actors": [f["actor"].pk] if f["actor"] else [],
+                },
+                {},
+            ),
+            (
+                "POST performances/",
+                "POST",
+                "admin",
+                url("performance-list"),
+                {
+                    "show_time": f"{FREE_DATE}T10:00:00",
+                    "play": performance.play_id,
+                    "theatre_hall": performance.theatre_hall_id,
+                },
+                {},
+            ),
+            (
+                "POST performances/schedule/",
+                "POST",
+                "admin",
+                url("performance-schedule"),
+                {
+                    "play": performance.play_id,
+                    "theatre_hall": performance.theatre_hall_id,
+                    "start_date": FREE_DATE,
+                    "end_date": "2100-03-28",
+                    "weekdays": ["FR", "SA"],
+                    "times": ["10:00"],
+                },
+                {},
+            ),
+            (
+                "PATCH performances/{pk}/",
+                "PATCH",
+                "admin",
+                url("performance-detail", performance.pk),
+                {"show_time": f"{FREE_DATE}T10:00:00"},
+                {},
+            ),
+            (
+                "DELETE performances/{pk}/",
+                "DELETE",
+                "admin",
+                url("performance-detail", performance.pk),
+                None,
+                {},
+            ),
+            (
+                "POST reservations/",
+                "POST",
+                "customer",
+                url("reservation-list"),
+                {
+                    "tickets": [
+                        {"row": row, "seat": seat, "performance": emptiest.pk},
+                        {
+                            "row": other_row,
+                            "seat": other_seat,
+                            "performance": emptiest.pk,
+                        },
+                    ]
+                },
+                {},
+            ),
+            ("DELETE reservations/{pk}/", "DELETE", "customer", reserved, None, {}),
+            (
+                "POST seat_holds/",
+                "POST",
+                "customer",
+                url("seathold-list"),
+                {
+                    "performance": emptiest.pk,
+                    "seats": [
+                        {"row": row, "seat": seat},
+                        {"row": other_row, "seat": other_seat},
+                    ],
+                },
+                {},
+            ),
+            (
+                "DELETE seat_holds/{pk}/",
+                "DELETE",
+                "customer",
+                held("seathold-detail"),
+                None,
+                {},
+            ),
+            (
+                "POST seat_holds/{pk}/confirm/",
+                "POST",
+                "customer",
+                held("seathold-confirm"),
+                None,
+                {},
+            ),
+        ]
+
+    def in_process(self):
+        stack = ExitStack()
+        self.client = Client(
+            # Outside INTERNAL_IPS, so the debug toolbar stays out of the way.
+            REMOTE_ADDR="192.0.2.1",
+        )
+        stack.enter_context(
+            override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"])
+        )
+        stack.enter_context(
+            mock.patch.dict(
+                SimpleRateThrottle.THROTTLE_RATES,
+                {
+                    scope: UNTHROTTLED_RATE
+                    for scope in SimpleRateThrottle.THROTTLE_RATES
+                },
+            )
+        )
+        return stack
+
+    def measure(self, scenario, options):
+        name, method, user, path, data, headers = scenario
+        headers = {
+            "Authorization": f"Bearer {self.tokens[user]}",
+            "Accept": "application/json",
+            **headers,
+        }
+        request = self.request_http if options["url"] else self.request_in_process
+        timings, queries, sizes, statuses = [], [], [], set()
+        for attempt in range(options["warmup"] + max(options["requests"], 1)):
+            status, elapsed, count, size = request(method, path, data, headers, options)
+            if attempt < options["warmup"]:
+                continue
+            timings.append(elapsed * 1000)
+            sizes.append(size)
+            statuses.add(status)
+            if count is not None:
+                queries.append(count)
+        return {
+            "p50_ms": round(self.percentile(timings, 50), 3),
+            "p95_ms": round(self.percentile(timings, 95), 3),
+            "p99_ms": round(self.percentile(timings, 99), 3),
+            "queries": max(queries) if queries else None,
+            "bytes": self.percentile(sizes, 50),
+            "status": sorted(statuses),
+        }
+
+    def request_in_process(self, method, path, data, headers, options):
+        if options["cold_cache"]:
+            caches[CATALOGUE_CACHE].clear()
+        rollback = method != "GET" or callable(path)
+        with transaction.atomic() if rollback else nullcontext():
+            if callable(path):
+                path = path()
+            counter = QueryCounter()
+            with ExitStack() as stack:
+                QueryBudgetMiddleware.wrap_connections(stack, counter)
+                started = time.perf_counter()
+                response = self.client.generic(
+                    method,
+                    path,
+                    json.dumps(data) if data is not None else "",
+                    content_type="application/json",
+                    headers=headers,
+                )
+                # Streaming responses do their work while being consumed.
+                content = (
+                    b"".join(response.streaming_content)
+                    if response.streaming
+                    else response.content
+                )
+                elapsed = time.perf_counter() - started
+            if rollback:
+                transaction.set_rollback(True)
+        return response.status_code, elapsed, counter.count, len(content)
+
+    @staticmethod
+    def request_http(method, path, data, headers, options):
+        request = urllib.request.Request(
+            options["url"].rstrip("/") + path, method=method, headers=headers
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                content = response.read()
+        except urllib.error.HTTPError as exc:
+            response, content = exc, exc.read()
+        elapsed = time.perf_counter() - started
+        count = response.headers.get("X-Query-Count")
+        return (
+            response.status,
+            elapsed,
+            int(count) if count is not None else None,
+            len(content),
+        )
+
+    @staticmethod
+    def percentile(values, percent):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
+
+    @staticmethod
+    def describe(name, result):
+        queries = "?" if result["queries"] is None else result["queries"]
+        return (
+            f"{name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+            f"p99 {result['p99_ms']:.2f} ms, {queries} queries, "
+            f"{result['bytes']:,} bytes, status {result['status']}"
+        )
+
+    def compare(self, before, after):
+        for name in sorted(before.keys() & after.keys()):
+            old, new = before[name], after[name]
+            change = new["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0
+            line = (
+                f"{name}: p50 {old['p50_ms']:.2f} -> {new['p50_ms']:.2f} ms "
+                f"({change:+.0%}), p95 {old['p95_ms']:.2f} -> {new['p95_ms']:.2f} ms, "
+                f"queries {old['queries']} -> {new['queries']}, "
+                f"bytes {old['bytes']:,} -> {new['bytes']:,}"
+            )
+            regressed = new["queries"] != old["queries"] or change > 0.1
+            self.log.write(self.style.WARNING(line) if regressed else line)
+        for name in sorted(before.keys() - after.keys()):
+            self.log.write(f"{name}: no longer measured")
+        for name in sorted(after.keys() - before.keys()):
+            self.log.write(f"{name}: new")
+
+    @staticmethod
+    def commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
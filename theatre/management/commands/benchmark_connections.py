@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from theatre.models import Genre
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-request cost of opening a database connection by "
+        "timing a small query with and without persistent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=600,
+            help="CONN_MAX_AGE used for the persistent connection run.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Simulates ``--requests`` requests per connection mode. Each one runs
+        the same request_started/request_finished connection handling as a
+        real request around a single query.
+        """
+        connection = connections["default"]
+        original = dict(connection.settings_dict)
+        original_options = dict(original.get("OPTIONS", {}))
+        without_pool = {
+            key: value for key, value in original_options.items() if key != "pool"
+        }
+
+        modes = [
+            (
+                "new connection per request",
+                {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+                without_pool,
+            ),
+            (
+                "persistent connection",
+                {"CONN_MAX_AGE": options["max_age"], "CONN_HEALTH_CHECKS": True},
+                without_pool,
+            ),
+        ]
+        if "pool" in original_options:
+            modes.append(
+                (
+                    "connection pool",
+                    {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+                    original_options,
+                )
+            )
+
+        results = {}
+        try:
+            for name, overrides, db_options in modes:
+                connection.close()
+                connection.settings_dict.update(overrides, OPTIONS=db_options)
+                results[name] = self.run(options["requests"])
+                self.stdout.write(
+                    f"{name}: mean {statistics.mean(results[name]):.2f} ms, "
+                    f"p50 {self.percentile(results[name], 50):.2f} ms, "
+                    f"p95 {self.percentile(results[name], 95):.2f} ms"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+        baseline = statistics.mean(results["new connection per request"])
+        saved = baseline - statistics.mean(results["persistent connection"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Persistent connections save {saved:.2f} ms per request "
+                f"({saved / baseline:.0%})"
+            )
+        )
+
+    @staticmethod
+    def run(requests):
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            close_old_connections()
+            list(Genre.objects.order_by("id")[:20])
+            close_old_connections()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    def percentile(timings, percent):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
@@ -0,0 +1,138 @@
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from theatre.parsers import MessagePackParser, ORJSONParser
+from theatre.renderers import MessagePackRenderer, ORJSONRenderer
+
+CODECS = {
+    "json": (JSONRenderer, JSONParser),
+    "orjson": (ORJSONRenderer, ORJSONParser),
+    "msgpack": (MessagePackRenderer, MessagePackParser),
+}
+
+
+def performance(index):
+    return {
+        "id": index,
+        "show_time": f"2025-09-{index % 28 + 1:02d}T19:30:00Z",
+        "play_title": f"Play {index}",
+        "theatre_hall_name": "Main stage",
+        "theatre_hall_capacity": 900,
+        "tickets_available": 900 - index % 900,
+    }
+
+
+def performance_detail(rows, seats_in_row):
+    """A sold-out performance, as returned by the performance detail."""
+    return {
+        "id": 1,
+        "show_time": "2025-09-01T19:30:00Z",
+        "play": {
+            "id": 1,
+            "title": "Hamlet",
+            "description": "The Tragedy of Hamlet, Prince of Denmark. " * 10,
+            "genres": ["Tragedy", "Drama"],
+            "actors": [f"Actor {index}" for index in range(12)],
+        },
+        "theatre_hall": {
+            "id": 1,
+            "name": "Main stage",
+            "rows": rows,
+            "seats_in_row": seats_in_row,
+            "capacity": rows * seats_in_row,
+        },
+        "taken_places": [
+            {"row": row, "seat": seat}
+            for row in range(1, rows + 1)
+            for seat in range(1, seats_in_row + 1)
+        ],
+        "held_places": [],
+    }
+
+
+def reservation_list(page_size, tickets):
+    """A page of the reservation list, every ticket with its performance."""
+    return {
+        "next": "http://localhost/api/theatre/reservations/?cursor=cD0yMDI1",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "tickets": [
+                    {
+                        "id": index * tickets + seat,
+                        "row": 1,
+                        "seat": seat,
+                        "performance": performance(index),
+                    }
+                    for seat in range(1, tickets + 1)
+                ],
+                "created_at": "2025-08-01T12:00:00.123000Z",
+            }
+            for index in range(page_size)
+        ],
+    }
+
+
+def performance_list(page_size):
+    return {
+        "next": None,
+        "previous": None,
+        "results": [performance(index) for index in range(page_size)],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares encoding and decoding speed and payload size of the stdlib "
+        "JSON, orjson and MessagePack renderers and parsers on API-shaped "
+        "payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Items per page of the list payloads.",
+        )
+
+    def handle(self, *args, **options):
+        payloads = {
+            "performance detail (30x30 taken)": performance_detail(30, 30),
+            "reservation list": reservation_list(options["page_size"], 4),
+            "performance list": performance_list(options["page_size"]),
+        }
+        for name, data in payloads.items():
+            self.stdout.write(name)
+            baseline = None
+            for codec, (renderer_class, parser_class) in CODECS.items():
+                renderer, parser = renderer_class(), parser_class()
+                content = renderer.render(data, renderer.media_type)
+                render_time = self.run(
+                    lambda: renderer.render(data, renderer.media_type),
+                    options["repeat"],
+                )
+                parse_time = self.run(
+                    lambda: parser.parse(BytesIO(content)), options["repeat"]
+                )
+                baseline = baseline or render_time + parse_time
+                self.stdout.write(
+                    f"  {codec:8} {len(content):>9,} bytes, "
+                    f"render {render_time * 1000:7.3f} ms, "
+                    f"parse {parse_time * 1000:7.3f} ms, "
+                    f"{baseline / (render_time + parse_time):4.1f}x"
+                )
+
+    @staticmethod
+    def run(function, repeat):
+        """Returns the mean time of ``function`` over ``repeat`` calls."""
+        started = time.perf_counter()
+        for _ in range(max(repeat, 1)):
+            function()
+        return (time.perf_counter() - started) / max(repeat, 1)
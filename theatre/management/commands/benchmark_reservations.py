@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.utils import timezone
+
+from theatre import booking
+from theatre.models import Performance, Play, Reservation, TheatreHall
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures reservations per second with several threads competing for "
+        "the seats of one performance. Run it against PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--rows", type=int, default=20)
+        parser.add_argument("--seats-in-row", type=int, default=30)
+        parser.add_argument(
+            "--batch", type=int, default=2, help="Seats per reservation."
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=60,
+            help="Stop after this many seconds even if seats are left.",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the benchmark data."
+        )
+
+    def handle(self, *args, **options):
+        """
+        Sells out a fresh performance from ``--threads`` threads that pick
+        random free seats, so they keep colliding, and reports throughput.
+        """
+        if connection.vendor != "postgresql":
+            self.stderr.write(
+                self.style.WARNING(
+                    f"Running on {connection.vendor}: rows are not locked and "
+                    "writers are serialized by the database file instead."
+                )
+            )
+
+        tag = uuid.uuid4().hex[:8]
+        hall = TheatreHall.objects.create(
+            name=f"Benchmark {tag}",
+            rows=options["rows"],
+            seats_in_row=options["seats_in_row"],
+        )
+        play = Play.objects.create(title=f"Benchmark {tag}", description="")
+        performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        users = [
+            get_user_model().objects.create_user(
+                f"benchmark-{tag}-{index}@example.com", uuid.uuid4().hex
+            )
+            for index in range(options["threads"])
+        ]
+        seats = [
+            (row, seat)
+            for row in range(1, hall.rows + 1)
+            for seat in range(1, hall.seats_in_row + 1)
+        ]
+
+        outcomes = Counter()
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["duration"]
+        # Seats not known to be sold. Like clients refreshing a seat map, the
+        # workers stop picking seats they have seen sold, but they still race
+        # each other for the ones that are left.
+        free = set(seats)
+
+        def worker(user):
+            try:
+                while time.monotonic() < deadline:
+                    with lock:
+                        if not free:
+                            return
+                        picked = random.sample(
+                            sorted(free), min(options["batch"], len(free))
+                        )
+                    places = [(performance.pk, row, seat) for row, seat in picked]
+                    try:
+                        booking.reserve(user, places)
+                        outcome, sold = "reserved", picked
+                    except booking.SeatsUnavailable as exc:
+                        outcome = "conflicts"
+                        sold = [(row, seat) for _, row, seat in exc.places]
+                    except Exception as exc:
+                        outcome, sold = "errors", []
+                        self.stderr.write(f"{type(exc).__name__}: {exc}")
+                    with lock:
+                        outcomes[outcome] += 1
+                        if outcome == "reserved":
+                            outcomes["seats"] += len(picked)
+                        free.difference_update(sold)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        attempts = outcomes["reserved"] + outcomes["conflicts"] + outcomes["errors"]
+        self.stdout.write(
+            f"{options['threads']} threads, {len(seats)} seats, "
+            f"{options['batch']} seat(s) per reservation, {elapsed:.2f}s"
+        )
+        self.stdout.write(
+            f"reserved: {outcomes['reserved']}, conflicts: {outcomes['conflicts']}, "
+            f"errors: {outcomes['errors']}, seats sold: {outcomes['seats']}"
+        )
+
+        performance.refresh_from_db()
+        if performance.tickets_sold != outcomes["seats"]:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"tickets_sold is {performance.tickets_sold}, "
+                    f"expected {outcomes['seats']}"
+                )
+            )
+
+        if not options["keep"]:
+            Reservation.objects.filter(user__in=users).delete()
+            performance.delete()
+            play.delete()
+            hall.delete()
+            get_user_model().objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{outcomes['reserved'] / elapsed:.1f} reservations/s, "
+                f"{attempts / elapsed:.1f} attempts/s"
+            )
+        )
@@ -0,0 +1,117 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from theatre.models import Actor, Genre, Performance, Play, Reservation
+from theatre.projections import (
+    PerformanceListProjection,
+    PlayListProjection,
+    ReservationListProjection,
+)
+
+LISTS = ("plays", "performances", "reservations")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the rows per second of the play, performance and reservation "
+        "list serializers with the values() projections serving those lists."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="append",
+            choices=LISTS,
+            dest="lists",
+            help="List to benchmark, repeatable; all of them by default.",
+        )
+        parser.add_argument(
+            "--rows", type=int, default=500, help="Rows serialized per run."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per path; the best counts."
+        )
+
+    def handle(self, *args, **options):
+        """
+        Times loading ``--rows`` rows from the database and rendering them
+        to JSON both ways, like the list endpoints do, and checks that both
+        paths render the same bytes.
+        """
+        renderer = JSONRenderer()
+        for name in options["lists"] or LISTS:
+            queryset, projected, projection = getattr(self, f"{name}_querysets")()
+            queryset = queryset.order_by("id")[: options["rows"]]
+            projected = projected.order_by("id")[: options["rows"]]
+
+            def serialize():
+                objects = list(queryset.all())
+                data = projection.serializer_class(objects, many=True).data
+                return len(objects), renderer.render(data)
+
+            def project():
+                rows = list(projected.all())
+                return len(rows), renderer.render(projection.to_representation(rows))
+
+            (count, expected), serializer_time = self.run(serialize, options["repeat"])
+            (_, content), projection_time = self.run(project, options["repeat"])
+            if not count:
+                self.stdout.write(f"{name}: no rows to serialize")
+                continue
+            if content != expected:
+                raise CommandError(f"{name}: the projection renders different JSON.")
+
+            self.stdout.write(
+                f"{name} ({count} rows): serializer "
+                f"{count / serializer_time:,.0f} rows/s, projection "
+                f"{count / projection_time:,.0f} rows/s"
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: projection is {serializer_time / projection_time:.1f}x "
+                    "as fast"
+                )
+            )
+
+    @staticmethod
+    def run(serialize, repeat):
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = serialize()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    @staticmethod
+    def plays_querysets():
+        queryset = Play.objects.prefetch_related(
+            Prefetch("genres", queryset=Genre.objects.order_by("id")),
+            Prefetch("actors", queryset=Actor.objects.order_by("id")),
+        )
+        projection = PlayListProjection()
+        return queryset, projection.project(Play.objects.all()), projection
+
+    @staticmethod
+    def performances_querysets():
+        queryset = Performance.objects.select_related(
+            "play", "theatre_hall"
+        ).with_tickets_available()
+        projection = PerformanceListProjection()
+        return queryset, projection.project(Performance.objects.all()), projection
+
+    @staticmethod
+    def reservations_querysets():
+        queryset = Reservation.objects.prefetch_related(
+            Prefetch(
+                "tickets__performance",
+                queryset=Performance.objects.select_related(
+                    "play", "theatre_hall"
+                ).with_tickets_available(),
+            )
+        )
+        projection = ReservationListProjection()
+        return queryset, projection.project(Reservation.objects.all()), projection
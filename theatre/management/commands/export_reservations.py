@@ -0,0 +1,62 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from theatre import exports
+
+
+class Command(BaseCommand):
+    help = "Exports every reservation or ticket as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(exports.COLUMNS))
+        parser.add_argument("--format", choices=sorted(exports.FORMATS), default="csv")
+        parser.add_argument(
+            "--from", dest="date_from", help="First reservation day (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--to", dest="date_to", help="Last reservation day (YYYY-MM-DD)."
+        )
+        parser.add_argument("--performance", type=int)
+        parser.add_argument("--output", help="Output file; stdout by default.")
+
+    def handle(self, *args, **options):
+        """
+        Streams the rows through a server-side cursor and writes them out
+        chunk by chunk, so the export can be larger than memory.
+        """
+        columns, rows = exports.export_rows(
+            options["kind"],
+            start=self.day_start(options["date_from"], "--from"),
+            end=self.day_start(options["date_to"], "--to", next_day=True),
+            performance=options["performance"],
+        )
+        chunks = exports.render(columns, rows, options["format"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            output.writelines(chunks)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {options['kind']} to {options['output']}.")
+        )
+
+    @staticmethod
+    def day_start(value, option, next_day=False):
+        if value is None:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"{option} must be a date (YYYY-MM-DD).")
+        start = datetime.combine(day + timedelta(days=next_day), time.min)
+        if settings.USE_TZ:
+            start = timezone.make_aware(start)
+        return start
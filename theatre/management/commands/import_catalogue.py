@@ -0,0 +1,265 @@
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from theatre.cache import invalidate
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+KINDS = ("genres", "actors", "halls", "plays", "performances")
+# Separator of the genres and actors columns of plays in CSV files.
+LIST_SEPARATOR = "|"
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams genres, actors, theatre halls, plays or performances from a "
+        "CSV or JSON Lines file into the catalogue in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("path", help='Input file, or "-" for stdin.')
+        parser.add_argument(
+            "--format",
+            choices=("csv", "jsonl"),
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--progress",
+            help=(
+                "File recording how many records have been imported, so an "
+                "interrupted import resumes after them. Defaults to "
+                "<path>.progress; pass an empty string to disable."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """
+        Reads the input one batch at a time, so memory use does not grow with
+        the file. Every batch is written in its own transaction with
+        bulk_create; genres and actors are matched by name against lookup
+        maps loaded once and created when missing.
+        """
+        path = options["path"]
+        input_format = options["format"] or (
+            "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+        )
+        progress = options["progress"]
+        if progress is None and path != "-":
+            progress = f"{path}.progress"
+        done = self.read_progress(progress)
+
+        self.genres = dict(Genre.objects.values_list("name", "pk"))
+        self.actors = {
+            (first_name, last_name): pk
+            for pk, first_name, last_name in Actor.objects.values_list(
+                "pk", "first_name", "last_name"
+            )
+        }
+        self.plays = {}
+        self.halls = {}
+        if options["kind"] == "performances":
+            # The oldest play or hall wins when names are not unique.
+            self.plays = dict(Play.objects.order_by("-pk").values_list("title", "pk"))
+            self.halls = dict(
+                TheatreHall.objects.order_by("-pk").values_list("name", "pk")
+            )
+
+        write = getattr(self, f"import_{options['kind']}")
+        self.namespaces = set()
+        imported = 0
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            records = enumerate(self.read(stream, input_format), start=1)
+            # Skip the records a previous run already imported.
+            for _ in islice(records, done):
+                pass
+            while batch := list(islice(records, options["batch_size"])):
+                with transaction.atomic():
+                    write(batch)
+                imported += len(batch)
+                self.write_progress(progress, done + imported)
+                self.stdout.write(f"{done + imported} record(s) imported")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            # bulk_create sends no signals, so evict cached responses here.
+            if self.namespaces:
+                invalidate(*sorted(self.namespaces))
+
+        if progress and os.path.exists(progress):
+            os.remove(progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} {options['kind']}"
+                + (f", skipped {done} imported earlier." if done else ".")
+            )
+        )
+
+    @staticmethod
+    def read(stream, input_format):
+        if input_format == "csv":
+            yield from csv.DictReader(stream)
+            return
+        record = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            record += 1
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"Record {record}: invalid JSON ({exc}).")
+            if not isinstance(value, dict):
+                raise CommandError(f"Record {record}: expected a JSON object.")
+            yield value
+
+    @staticmethod
+    def read_progress(progress):
+        if not progress or not os.path.exists(progress):
+            return 0
+        with open(progress) as file:
+            return int(file.read().strip() or 0)
+
+    @staticmethod
+    def write_progress(progress, count):
+        if not progress:
+            return
+        with open(f"{progress}.tmp", "w") as file:
+            file.write(str(count))
+        os.replace(f"{progress}.tmp", progress)
+
+    @staticmethod
+    def field(line, record, name, convert=str):
+        try:
+            value = record[name]
+        except KeyError:
+            raise CommandError(f"Record {line}: missing {name!r}.")
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            raise CommandError(f"Record {line}: invalid {name} {value!r}.")
+
+    @staticmethod
+    def names(value):
+        if isinstance(value, str):
+            value = value.split(LIST_SEPARATOR)
+        names = []
+        for name in value or ():
+            if isinstance(name, str):
+                name = name.strip()
+            if name:
+                names.append(name)
+        return names
+
+    @staticmethod
+    def actor_key(name):
+        if isinstance(name, dict):
+            return name["first_name"], name["last_name"]
+        first_name, _, last_name = name.partition(" ")
+        return first_name, last_name
+
+    def resolve_genres(self, names):
+        missing = {name for name in names if name not in self.genres}
+        if missing:
+            created = Genre.objects.bulk_create(Genre(name=name) for name in missing)
+            self.genres.update((genre.name, genre.pk) for genre in created)
+            self.namespaces.add("genres")
+
+    def resolve_actors(self, keys):
+        missing = {key for key in keys if key not in self.actors}
+        if missing:
+            created = Actor.objects.bulk_create(
+                Actor(first_name=first_name, last_name=last_name)
+                for first_name, last_name in missing
+            )
+            self.actors.update(
+                ((actor.first_name, actor.last_name), actor.pk) for actor in created
+            )
+            self.namespaces.add("actors")
+
+    def import_genres(self, batch):
+        self.resolve_genres(self.field(line, record, "name") for line, record in batch)
+
+    def import_actors(self, batch):
+        self.resolve_actors(
+            (
+                self.field(line, record, "first_name"),
+                self.field(line, record, "last_name"),
+            )
+            for line, record in batch
+        )
+
+    def import_halls(self, batch):
+        TheatreHall.objects.bulk_create(
+            TheatreHall(
+                name=self.field(line, record, "name"),
+                rows=self.field(line, record, "rows", int),
+                seats_in_row=self.field(line, record, "seats_in_row", int),
+            )
+            for line, record in batch
+        )
+        self.namespaces.add("theatre_halls")
+
+    def import_plays(self, batch):
+        genres = [self.names(record.get("genres")) for _, record in batch]
+        actors = [
+            [self.actor_key(name) for name in self.names(record.get("actors"))]
+            for _, record in batch
+        ]
+        self.resolve_genres(name for names in genres for name in names)
+        self.resolve_actors(key for keys in actors for key in keys)
+
+        plays = Play.objects.bulk_create(
+            Play(
+                title=self.field(line, record, "title"),
+                description=record.get("description", ""),
+            )
+            for line, record in batch
+        )
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play_id=play.pk, genre_id=self.genres[name])
+            for play, names in zip(plays, genres)
+            for name in dict.fromkeys(names)
+        )
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(play_id=play.pk, actor_id=self.actors[key])
+            for play, keys in zip(plays, actors)
+            for key in dict.fromkeys(keys)
+        )
+        self.namespaces.add("plays")
+
+    def import_performances(self, batch):
+        Performance.objects.bulk_create(
+            Performance(
+                play_id=self.lookup(line, self.plays, record, "play"),
+                theatre_hall_id=self.lookup(line, self.halls, record, "theatre_hall"),
+                show_time=self.field(line, record, "show_time", self.show_time),
+            )
+            for line, record in batch
+        )
+
+    def lookup(self, line, mapping, record, name):
+        value = self.field(line, record, name)
+        try:
+            return mapping[value]
+        except KeyError:
+            raise CommandError(f"Record {line}: unknown {name} {value!r}.")
+
+    @staticmethod
+    def show_time(value):
+        show_time = parse_datetime(value)
+        if show_time is None:
+            raise ValueError(value)
+        if settings.USE_TZ and timezone.is_naive(show_time):
+            show_time = timezone.make_aware(show_time)
+        return show_time
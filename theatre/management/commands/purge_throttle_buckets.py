@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from theatre.models import ThrottleBucket
+
+
+class Command(BaseCommand):
+    help = "Deletes throttle buckets that have refilled completely."
+
+    def handle(self, *args, **options):
+        """
+        A full bucket behaves exactly like a missing one, so its row can go.
+        Meant to run periodically, e.g. from cron, to keep the table small.
+        """
+        deleted, _ = ThrottleBucket.objects.expired(time.time()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} throttle bucket(s)."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from theatre.models import DailySales, Ticket
+
+
+class Command(BaseCommand):
+    help = "Recomputes the DailySales summary table from the tickets."
+
+    def handle(self, *args, **options):
+        """
+        Replaces every DailySales row with tickets counted per performance
+        and reservation day, in one transaction so reports never see a
+        half-built table.
+        """
+        rows = (
+            Ticket.objects.order_by()
+            .values("performance", date=TruncDate("reservation__created_at"))
+            .annotate(tickets_sold=Count("pk"))
+        )
+        with transaction.atomic():
+            DailySales.objects.all().delete()
+            created = DailySales.objects.bulk_create(
+                (
+                    DailySales(
+                        date=row["date"],
+                        performance_id=row["performance"],
+                        tickets_sold=row["tickets_sold"],
+                    )
+                    for row in rows.iterator()
+                ),
+                batch_size=1000,
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(created)} daily sales row(s).")
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from theatre.models import SeatHold
+
+
+class Command(BaseCommand):
+    help = "Releases the seats of every expired seat hold."
+
+    def handle(self, *args, **options):
+        """
+        Deletes expired holds in bulk. Meant to run periodically, e.g. from
+        cron, so lapsed holds do not linger in the database.
+        """
+        released = SeatHold.release_expired()
+        self.stdout.write(self.style.SUCCESS(f"Released {released} expired hold(s)."))
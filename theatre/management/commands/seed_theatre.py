@@ -0,0 +1,102 @@
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from theatre import dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with a synthetic catalogue, users and up to "
+        "millions of tickets with realistic occupancy, loaded with COPY on "
+        "PostgreSQL in parallel chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=dataset.SCALES,
+            default="small",
+            help="Preset row counts; the options below override single ones.",
+        )
+        for name in dataset.SCALES["small"]:
+            parser.add_argument(f"--{name}", type=int, help=f"Number of {name}.")
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="The same seed and chunk size always produce the same data.",
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.fromisoformat,
+            help="Day of the first performance, YYYY-MM-DD; 2025-01-01 by default.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes loading bookings in parallel (PostgreSQL only).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=dataset.CHUNK_SIZE,
+            help="Performances whose bookings are loaded per transaction.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        """
+        Generates the dataset with theatre.dataset, reporting progress as
+        every batch or chunk is written. Run it against an empty database:
+        the rows are added to whatever is there.
+        """
+        counts = dict(dataset.SCALES[options["scale"]])
+        for name in counts:
+            if options[name] is not None:
+                counts[name] = options[name]
+        if counts["halls"] < 1 or counts["plays"] < 1:
+            raise CommandError("At least one hall and one play are needed.")
+        if counts["tickets"] and counts["users"] < 1:
+            raise CommandError("Tickets need at least one user to book them.")
+        if connection.vendor != "postgresql" and options["workers"] > 1:
+            self.stdout.write(
+                "Parallel loading needs PostgreSQL; loading in one process."
+            )
+
+        started = time.perf_counter()
+        printed = {"tickets": 0}
+
+        def progress(name, count):
+            if name == "reservations":
+                return
+            if name == "tickets":
+                # About every tenth of the way rather than every chunk.
+                step = max(counts["tickets"] // 10, 1)
+                previous, printed["tickets"] = printed["tickets"], count
+                if count // step == previous // step:
+                    return
+            self.stdout.write(f"{count:,} {name}")
+
+        created = dataset.generate(
+            counts,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            start=options["start"],
+            progress=progress,
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Seeded "
+                + ", ".join(f"{count:,} {name}" for name, count in created.items())
+                + f" in {elapsed:.1f} s ({created.get('tickets', 0) / elapsed:,.0f} "
+                "tickets/s)."
+            )
+        )
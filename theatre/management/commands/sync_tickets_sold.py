@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from theatre.models import Performance, Ticket
+
+
+class Command(BaseCommand):
+    help = "Verifies and rebuilds the stored Performance.tickets_sold counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report performances with a wrong counter, do not fix them.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Compares every performance's tickets_sold counter with the actual
+        number of tickets and rewrites the ones that drifted.
+        """
+        sold = Coalesce(
+            Subquery(
+                Ticket.objects.filter(performance=OuterRef("pk"))
+                .order_by()
+                .values("performance")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+        with transaction.atomic():
+            stale = list(
+                Performance.objects.annotate(actual=sold)
+                .exclude(tickets_sold=F("actual"))
+                .values_list("pk", "tickets_sold", "actual")
+            )
+            for pk, stored, actual in stale:
+                self.stdout.write(
+                    f"Performance {pk}: tickets_sold is {stored}, expected {actual}"
+                )
+
+            if not stale:
+                self.stdout.write(self.style.SUCCESS("All counters are correct."))
+                return
+            if options["check"]:
+                raise CommandError(f"{len(stale)} performance counter(s) are wrong.")
+
+            Performance.objects.filter(pk__in=[pk for pk, *_ in stale]).update(
+                tickets_sold=sold
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(stale)} performance counter(s).")
+        )
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0004_performance_tickets_sold"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="play",
+            index=models.Index(fields=["title", "id"], name="play_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "-created_at", "id"],
+                name="reservation_user_created_idx",
+            ),
+        ),
+    ]
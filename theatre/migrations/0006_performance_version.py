@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0005_play_reservation_cursor_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="version",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:10
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The search vector is kept up to date by a trigger so bulk inserts and
+# queryset updates are covered too. The GIN indexes back the full-text
+# (@@) and trigram (%) operators. Other databases only get the column.
+CREATE_SEARCH = """
+CREATE OR REPLACE FUNCTION theatre_play_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER theatre_play_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON theatre_play
+    FOR EACH ROW EXECUTE FUNCTION theatre_play_search_vector_update();
+
+UPDATE theatre_play SET search_vector =
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B');
+
+CREATE INDEX theatre_play_search_vector_idx
+    ON theatre_play USING gin (search_vector);
+CREATE INDEX theatre_play_title_trgm_idx
+    ON theatre_play USING gin (title gin_trgm_ops);
+"""
+
+DROP_SEARCH = """
+DROP INDEX IF EXISTS theatre_play_title_trgm_idx;
+DROP INDEX IF EXISTS theatre_play_search_vector_idx;
+DROP TRIGGER IF EXISTS theatre_play_search_vector_trigger ON theatre_play;
+DROP FUNCTION IF EXISTS theatre_play_search_vector_update();
+"""
+
+
+def create_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH, params=None)
+
+
+def drop_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0006_performance_version"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="play",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search, drop_search),
+    ]
@@ -1,8 +1,26 @@
 import os
 import uuid
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+    TrigramSimilarity,
+)
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Now
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -38,6 +56,25 @@ class TheatreHall(models.Model):
         return self.name
 
 
+class PlayQuerySet(models.QuerySet):
+    def search(self, text):
+        """
+        Full-text search over title and description ranked by relevance and
+        title similarity, so misspelled titles still match. Falls back to a
+        plain substring match on databases other than PostgreSQL.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(
+                Q(title__icontains=text) | Q(description__icontains=text)
+            )
+
+        query = SearchQuery(text, config="english", search_type="websearch")
+        return self.annotate(
+            rank=SearchRank(F("search_vector"), query)
+            + TrigramSimilarity("title", text)
+        ).filter(Q(search_vector=query) | Q(title__trigram_similar=text))
+
+
 class Play(models.Model):
     title = models.CharField(max_length=128)
     description = models.TextField()
@@ -51,14 +88,57 @@ class Play(models.Model):
         blank=True,
         related_name="plays",
     )
+    # Maintained by a database trigger, see migration 0007.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PlayQuerySet.as_manager()
 
     class Meta:
         ordering = ["title"]
+        # Backs the keyset pagination of the play list.
+        indexes = [models.Index(fields=["title", "id"], name="play_title_id_idx")]
 
     def __str__(self):
         return self.title
 
 
+def tickets_available(path=""):
+    """
+    Expression counting the seats of a performance that are neither sold nor
+    held; ``path`` leads to the performance, e.g. ``"performance__"``.
+    """
+    held = (
+        HeldSeat.objects.active()
+        .filter(performance=OuterRef(f"{path}pk"))
+        .order_by()
+        .values("performance")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return (
+        F(f"{path}theatre_hall__rows") * F(f"{path}theatre_hall__seats_in_row")
+        - F(f"{path}tickets_sold")
+        - Coalesce(Subquery(held), 0)
+    )
+
+
+class PerformanceQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        return self.annotate(tickets_available=tickets_available())
+
+    def show_time_between(self, start=None, end=None):
+        """
+        Half-open ``[start, end)`` range on the raw column, so the show_time
+        indexes can serve it (unlike a ``show_time__date`` cast).
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(show_time__gte=start)
+        if end is not None:
+            queryset = queryset.filter(show_time__lt=end)
+        return queryset
+
+
 class Performance(models.Model):
     show_time = models.DateTimeField()
     play = models.ForeignKey(
@@ -68,13 +148,46 @@ class Performance(models.Model):
     theatre_hall = models.ForeignKey(
         TheatreHall, on_delete=models.CASCADE, related_name="performances"
     )
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveBigIntegerField(default=1, editable=False)
+
+    objects = PerformanceQuerySet.as_manager()
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [
+            models.Index(fields=["show_time"], name="performance_show_time_idx"),
+            models.Index(
+                fields=["play", "show_time"], name="performance_play_time_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.play.title + " " + str(self.show_time)
 
+    @classmethod
+    def add_tickets_sold(cls, counts):
+        """
+        Atomically adds ``counts[performance_id]`` (negative when tickets are
+        released) to the stored tickets_sold counters and bumps the version
+        of those performances in a single UPDATE.
+        """
+        counts = {pk: count for pk, count in counts.items() if count}
+        if not counts:
+            return
+        cls.objects.filter(pk__in=counts).update(
+            tickets_sold=F("tickets_sold")
+            + Case(
+                *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+                default=Value(0),
+            ),
+            version=F("version") + 1,
+        )
+
+    @classmethod
+    def bump_version(cls, pks):
+        cls.objects.filter(pk__in=pks).update(version=F("version") + 1)
+
 
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -87,6 +200,13 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Backs the keyset pagination of a user's reservations.
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "id"],
+                name="reservation_user_created_idx",
+            )
+        ]
 
 
 class Ticket(models.Model):
@@ -128,3 +248,183 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("performance", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=Now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=Now())
+
+
+class SeatHold(models.Model):
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.performance} — held until {self.expires_at}"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    @classmethod
+    def release_expired(cls):
+        """
+        Deletes every expired hold with its seats and bumps the version of
+        the performances they were on. Returns the number of holds released.
+        """
+        with transaction.atomic():
+            expired = dict(cls.objects.expired().values_list("pk", "performance_id"))
+            if not expired:
+                return 0
+            cls.objects.filter(pk__in=expired).delete()
+            Performance.bump_version(set(expired.values()))
+        return len(expired)
+
+
+class HeldSeatQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(hold__expires_at__gt=Now())
+
+    def expired(self):
+        return self.filter(hold__expires_at__lte=Now())
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(SeatHold, on_delete=models.CASCADE, related_name="seats")
+    # Denormalised from the hold so a seat can only be held once.
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="held_seats"
+    )
+    row = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+
+    objects = HeldSeatQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("performance", "row", "seat")
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return f"{self.performance} — Row {self.row}, Seat {self.seat} (held)"
+
+
+class ThrottleBucketQuerySet(models.QuerySet):
+    def expired(self, now):
+        return self.filter(tat__lte=now)
+
+
+class ThrottleBucket(models.Model):
+    """
+    Rate limit state shared by every worker: one row per throttle key,
+    updated with the generic cell rate algorithm (GCRA).
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    # Theoretical arrival time, in Unix seconds, of the next request at the
+    # sustained rate. A bucket whose tat has passed is full again.
+    tat = models.FloatField()
+
+    objects = ThrottleBucketQuerySet.as_manager()
+
+    def __str__(self):
+        return self.key
+
+    @classmethod
+    def consume(cls, key, now, interval, period):
+        """
+        Lets one request through unless that would push the bucket's tat
+        more than ``period`` seconds ahead of ``now``. The check and the
+        update are a single upsert, so concurrent workers cannot both take
+        the last token.
+
+        Returns ``(allowed, tat)``; on refusal tat is the stored value, from
+        which the caller can work out how long to wait.
+        """
+        connection = connections[cls.objects.db]
+        quote = connection.ops.quote_name
+        table = quote(cls._meta.db_table)
+        key_column = quote(cls._meta.get_field("key").column)
+        tat_column = quote(cls._meta.get_field("tat").column)
+        greatest = "GREATEST" if connection.vendor == "postgresql" else "MAX"
+        next_tat = f"{greatest}({table}.{tat_column}, %s) + %s"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({key_column}, {tat_column}) VALUES (%s, %s) "
+                f"ON CONFLICT ({key_column}) DO UPDATE SET {tat_column} = {next_tat} "
+                f"WHERE {next_tat} <= %s "
+                f"RETURNING {tat_column}",
+                [key, now + interval, now, interval, now, interval, now + period],
+            )
+            row = cursor.fetchone()
+        if row is not None:
+            return True, row[0]
+        tat = cls.objects.filter(pk=key).values_list("tat", flat=True).first()
+        return False, now if tat is None else tat
+
+
+class DailySales(models.Model):
+    """
+    Tickets sold per performance and sale day, kept up to date as
+    reservations are made and cancelled so sales reports never scan
+    tickets. ``manage.py rebuild_sales_summary`` recomputes it.
+    """
+
+    date = models.DateField()
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    tickets_sold = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("date", "performance")
+        ordering = ["date", "performance"]
+        verbose_name_plural = "daily sales"
+
+    def __str__(self):
+        return f"{self.performance} — {self.tickets_sold} sold on {self.date}"
+
+    @classmethod
+    def record(cls, sold_at, counts):
+        """
+        Adds ``counts[performance_id]`` (negative for cancellations) to the
+        sales of the day ``sold_at`` falls on, in a single upsert.
+        """
+        counts = {pk: count for pk, count in counts.items() if count}
+        if not counts:
+            return
+        if timezone.is_aware(sold_at):
+            sold_at = timezone.localtime(sold_at)
+        connection = connections[cls.objects.db]
+        quote = connection.ops.quote_name
+        table = quote(cls._meta.db_table)
+        date, performance, tickets_sold = (
+            quote(cls._meta.get_field(name).column)
+            for name in ("date", "performance", "tickets_sold")
+        )
+        rows = ", ".join(["(%s, %s, %s)"] * len(counts))
+        day = connection.ops.adapt_datefield_value(sold_at.date())
+        params = []
+        for pk, count in counts.items():
+            params += [day, pk, count]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({date}, {performance}, {tickets_sold}) "
+                f"VALUES {rows} ON CONFLICT ({date}, {performance}) DO UPDATE "
+                f"SET {tickets_sold} = {table}.{tickets_sold} "
+                f"+ EXCLUDED.{tickets_sold}",
+                params,
+            )
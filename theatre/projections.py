@@ -0,0 +1,224 @@
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connections
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from theatre.models import Play, Ticket, tickets_available
+from theatre.serializers import (
+    PerformanceListSerializer,
+    PlayListSerializer,
+    ReservationListSerializer,
+)
+
+
+class ListProjection:
+    """
+    Serializes a read-only list from ``values()`` rows, skipping model
+    instances and per-field ``to_representation`` calls. ``project`` turns
+    a queryset into the rows and ``to_representation`` builds the items,
+    byte for byte what ``serializer_class`` returns for the same objects;
+    it may run a query for the related rows of the page.
+    """
+
+    serializer_class = None
+    datetime = serializers.DateTimeField()
+
+    def project(self, queryset):
+        raise NotImplementedError
+
+    def to_representation(self, rows):
+        raise NotImplementedError
+
+    @staticmethod
+    def values(queryset, *fields, **expressions):
+        # Annotations already on the queryset stay in the rows, such as the
+        # search rank keyset pagination reads off the page edges.
+        annotations = [
+            name
+            for name in queryset.query.annotations
+            if name not in expressions and name not in fields
+        ]
+        return queryset.prefetch_related(None).values(
+            *fields, *annotations, **expressions
+        )
+
+
+class PlayListProjection(ListProjection):
+    """
+    Genre names and actor full names are aggregated into arrays by the play
+    query itself on PostgreSQL and read with one query per relation
+    elsewhere, ordered by id like the serializer's prefetches.
+    """
+
+    serializer_class = PlayListSerializer
+    relations = {
+        "genres": ("genre", F("genre__name")),
+        "actors": (
+            "actor",
+            Concat("actor__first_name", Value(" "), "actor__last_name"),
+        ),
+    }
+
+    def project(self, queryset):
+        expressions = {}
+        if connections[queryset.db].vendor == "postgresql":
+            for name, (target, expression) in self.relations.items():
+                names = (
+                    getattr(Play, name)
+                    .through.objects.filter(play=OuterRef("pk"))
+                    .order_by()
+                    .values("play")
+                    .annotate(names=ArrayAgg(expression, order_by=f"{target}_id"))
+                    .values("names")
+                )
+                # Not named after the relation, which values() would reject.
+                expressions[f"{name}_names"] = Subquery(names)
+        return self.values(queryset, "id", "title", "description", **expressions)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        related = {}
+        for name, (target, expression) in self.relations.items():
+            if rows and f"{name}_names" not in rows[0]:
+                related[name] = defaultdict(list)
+                through = (
+                    getattr(Play, name)
+                    .through.objects.filter(play_id__in=[row["id"] for row in rows])
+                    .order_by(f"{target}_id")
+                    .values_list("play_id", expression)
+                )
+                for play_id, value in through:
+                    related[name][play_id].append(value)
+
+        items = []
+        for row in rows:
+            item = {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+            }
+            for name in self.relations:
+                if name in related:
+                    item[name] = related[name][row["id"]]
+                else:
+                    item[name] = row[f"{name}_names"] or []
+            items.append(item)
+        return items
+
+
+class PerformanceListProjection(ListProjection):
+    serializer_class = PerformanceListSerializer
+
+    @staticmethod
+    def expressions(path="", prefix=""):
+        """
+        The annotations behind the item of the performance at ``path``,
+        named with ``prefix``.
+        """
+        return {
+            f"{prefix}play_title": F(f"{path}play__title"),
+            f"{prefix}theatre_hall_name": F(f"{path}theatre_hall__name"),
+            f"{prefix}theatre_hall_capacity": F(f"{path}theatre_hall__rows")
+            * F(f"{path}theatre_hall__seats_in_row"),
+            f"{prefix}tickets_available": tickets_available(path),
+        }
+
+    def project(self, queryset):
+        expressions = self.expressions()
+        if "tickets_available" in queryset.query.annotations:
+            # Annotated by with_tickets_available() already.
+            del expressions["tickets_available"]
+        return self.values(queryset, "id", "show_time", **expressions)
+
+    def item(self, row, prefix=""):
+        return {
+            "id": row[f"{prefix}id"],
+            "show_time": self.datetime.to_representation(row[f"{prefix}show_time"]),
+            "play_title": row[f"{prefix}play_title"],
+            "theatre_hall_name": row[f"{prefix}theatre_hall_name"],
+            "theatre_hall_capacity": row[f"{prefix}theatre_hall_capacity"],
+            "tickets_available": row[f"{prefix}tickets_available"],
+        }
+
+    def to_representation(self, rows):
+        return [self.item(row) for row in rows]
+
+
+class ReservationListProjection(ListProjection):
+    """
+    The tickets of the page and their performances come from a single
+    query, joined and annotated instead of prefetched.
+    """
+
+    serializer_class = ReservationListSerializer
+    performances = PerformanceListProjection()
+
+    def project(self, queryset):
+        return self.values(queryset, "id", "created_at")
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        tickets = defaultdict(list)
+        if rows:
+            ticket_rows = (
+                Ticket.objects.filter(reservation_id__in=[row["id"] for row in rows])
+                .order_by("row", "seat", "id")
+                .values(
+                    "id",
+                    "row",
+                    "seat",
+                    "reservation_id",
+                    "performance_id",
+                    performance_show_time=F("performance__show_time"),
+                    **self.performances.expressions("performance__", "performance_"),
+                )
+            )
+            for ticket in ticket_rows:
+                tickets[ticket["reservation_id"]].append(
+                    {
+                        "id": ticket["id"],
+                        "row": ticket["row"],
+                        "seat": ticket["seat"],
+                        "performance": self.performances.item(ticket, "performance_"),
+                    }
+                )
+
+        return [
+            {
+                "id": row["id"],
+                "tickets": tickets[row["id"]],
+                "created_at": self.datetime.to_representation(row["created_at"]),
+            }
+            for row in rows
+        ]
+
+
+class ProjectedListMixin:
+    """
+    Serves the list action from ``list_projection`` when the request wants
+    the default representation. Requests with ``?fields=`` or ``?expand=``
+    go through the serializers, see FieldsetViewMixin.
+    """
+
+    list_projection = None
+
+    def get_list_projection(self):
+        fieldset = self.get_fieldset()
+        if fieldset.fields is not None or fieldset.expand is not None:
+            return None
+        return self.list_projection
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_list_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = projection.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(projection.to_representation(queryset))
+        return self.get_paginated_response(projection.to_representation(page))
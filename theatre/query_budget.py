@@ -0,0 +1,105 @@
+import logging
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def get_query_budget(view_func, method):
+    """
+    Returns the maximum number of queries declared for the handler behind
+    ``view_func`` or ``None`` when the view declares no budget.
+
+    Views declare ``query_budget`` either as an int for every handler or as
+    a dict keyed by viewset action (``"list"``, ``"retrieve"``, ...) or, for
+    plain API views and Django views, by lowercase HTTP method.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    budget = getattr(view_class, "query_budget", None)
+    if not isinstance(budget, dict):
+        return budget
+    handler = method.lower()
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        handler = actions.get(handler, handler)
+    return budget.get(handler)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    In DEBUG mode counts the queries of every request, reports them in the
+    X-Query-Count header and logs a warning (plus an X-Query-Budget-Exceeded
+    header) when a view runs more queries than its declared query_budget.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DEBUG:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            self.wrap_connections(stack, counter)
+            response = self.get_response(request)
+        return self.report(request, response, counter)
+
+    async def __acall__(self, request):
+        if not settings.DEBUG:
+            return await self.get_response(request)
+
+        # Async ORM calls run in the request's thread sensitive executor, so
+        # that is where the connections have to be wrapped.
+        counter = QueryCounter()
+        stack = ExitStack()
+        await sync_to_async(self.wrap_connections)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, counter)
+
+    @staticmethod
+    def wrap_connections(stack, counter):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+    @staticmethod
+    def report(request, response, counter):
+        response["X-Query-Count"] = str(counter.count)
+        budget = getattr(request, "query_budget", None)
+        if budget is not None and counter.count > budget:
+            response["X-Query-Budget-Exceeded"] = f"{counter.count}/{budget}"
+            logger.warning(
+                "Query budget exceeded for %s %s: %d queries, budget is %d",
+                request.method,
+                request.path,
+                counter.count,
+                budget,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
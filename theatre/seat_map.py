@@ -0,0 +1,12 @@
+def pack_seat_map(rows, seats_in_row, places):
+    """
+    Packs taken (row, seat) places into a row-major bitset with one bit per
+    seat, most significant bit first: seat ``s`` of row ``r`` is bit
+    ``(r - 1) * seats_in_row + (s - 1)``.
+    """
+    seat_map = bytearray((rows * seats_in_row + 7) // 8)
+    for row, seat in places:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            index = (row - 1) * seats_in_row + seat - 1
+            seat_map[index >> 3] |= 0x80 >> (index & 7)
+    return bytes(seat_map)
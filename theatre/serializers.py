@@ -1,7 +1,17 @@
-from django.db import transaction
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.validators import UniqueValidator
 
+from theatre import booking
+from theatre.booking import places_filter
+from theatre.fieldsets import FieldsetSerializerMixin
 from theatre.models import (
     Genre,
     Actor,
@@ -10,28 +20,122 @@ from theatre.models import (
     Performance,
     Ticket,
     Reservation,
+    SeatHold,
+    HeldSeat,
 )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        queryset = self.child_relation.get_queryset()
+        try:
+            pks = [queryset.model._meta.pk.to_python(item) for item in data]
+        except (TypeError, ValueError, DjangoValidationError):
+            self.child_relation.fail("incorrect_type", data_type=type(data).__name__)
+        objects = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                self.child_relation.fail("does_not_exist", pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolves every primary key of a ``many=True`` field in one query."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """
+    Validates and creates a JSON array of objects in bulk: unique fields are
+    checked with one query per field instead of one per item, and every
+    object is inserted with a single bulk_create. Errors are reported per
+    item, in the order of the input.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", 1000)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        unique = self.pop_unique_validators()
+        validated = super().to_internal_value(data)
+
+        errors = [{} for _ in validated]
+        for name, validator in unique.items():
+            seen = {}
+            for index, attrs in enumerate(validated):
+                if name not in attrs:
+                    continue
+                if attrs[name] in seen:
+                    errors[index][name] = ["This value is repeated in the request."]
+                else:
+                    seen[attrs[name]] = index
+            if not seen:
+                continue
+            existing = validator.queryset.filter(**{f"{name}__in": seen}).values_list(
+                name, flat=True
+            )
+            for value in existing:
+                errors[seen[value]][name] = [validator.message]
+
+        if any(errors):
+            raise ValidationError(errors)
+        return validated
+
+    def pop_unique_validators(self):
+        unique = {}
+        for name, field in self.child.fields.items():
+            for validator in field.validators:
+                if isinstance(validator, UniqueValidator):
+                    unique[field.source] = validator
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return unique
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create(model(**attrs) for attrs in validated_data)
+
+
+class GenreSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("id", "name")
+        list_serializer_class = BulkCreateListSerializer
 
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "full_name")
+        list_serializer_class = BulkCreateListSerializer
 
 
-class TheatreHallSerializer(serializers.ModelSerializer):
+class TheatreHallSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = TheatreHall
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
+        list_serializer_class = BulkCreateListSerializer
+
 
+class PlaySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
 
-class PlaySerializer(serializers.ModelSerializer):
     class Meta:
         model = Play
         fields = ("id", "title", "description", "genres", "actors")
@@ -48,8 +152,11 @@ class PlayDetailSerializer(PlaySerializer):
     genres = GenreSerializer(many=True, read_only=True)
     actors = ActorSerializer(many=True, read_only=True)
 
+    class Meta(PlaySerializer.Meta):
+        expandable_fields = ("genres", "actors")
 
-class PerformanceSerializer(serializers.ModelSerializer):
+
+class PerformanceSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Performance
         fields = ("id", "show_time", "play", "theatre_hall")
@@ -77,25 +184,23 @@ class PerformanceListSerializer(PerformanceSerializer):
         )
 
 
-class TicketSerializer(serializers.ModelSerializer):
-    def validate(self, attrs):
-        data = super().validate(attrs)
-        Ticket.validate_ticket(
-            attrs["row"],
-            attrs["seat"],
-            attrs["performance"].theatre_hall,
-            ValidationError,
-        )
-        return data
+class TicketSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    performance = serializers.IntegerField(source="performance_id")
 
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "performance")
+        # Seat ranges and uniqueness are checked for the whole reservation
+        # at once in ReservationSerializer.validate_tickets.
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
     performance = PerformanceListSerializer(read_only=True)
 
+    class Meta(TicketSerializer.Meta):
+        expandable_fields = ("performance",)
+
 
 class TicketSeatsSerializer(TicketSerializer):
     class Meta:
@@ -103,31 +208,320 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
+class HeldSeatSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = HeldSeat
+        fields = ("row", "seat")
+
+
 class PerformanceDetailSerializer(PerformanceSerializer):
     play = PlayListSerializer(read_only=True)
     theatre_hall = TheatreHallSerializer(read_only=True)
     taken_places = TicketSeatsSerializer(source="tickets", many=True, read_only=True)
+    held_places = HeldSeatSerializer(
+        source="active_held_seats", many=True, read_only=True
+    )
 
     class Meta:
         model = Performance
-        fields = ("id", "show_time", "play", "theatre_hall", "taken_places")
+        fields = (
+            "id",
+            "show_time",
+            "play",
+            "theatre_hall",
+            "taken_places",
+            "held_places",
+        )
+        expandable_fields = ("play", "theatre_hall")
+
+
+class PerformanceSeatMapSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    seat_map = serializers.CharField(
+        help_text=(
+            "Base64 encoded row-major bitset of taken and held seats, "
+            "one bit per seat, most significant bit first."
+        )
+    )
+
+
+class PerformanceScheduleSerializer(serializers.Serializer):
+    WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+    MAX_PERFORMANCES = 1000
+
+    play = serializers.PrimaryKeyRelatedField(queryset=Play.objects.all())
+    # Locked when read, so concurrent runs in one hall are checked for
+    # conflicts one at a time; validate inside a transaction.
+    theatre_hall = serializers.PrimaryKeyRelatedField(
+        queryset=TheatreHall.objects.select_for_update()
+    )
+    start_date = serializers.DateField()
+    end_date = serializers.DateField(help_text="Last day of the run, inclusive.")
+    weekdays = serializers.ListField(
+        child=serializers.ChoiceField(choices=WEEKDAYS),
+        required=False,
+        help_text="Days of the week with performances; every day by default.",
+    )
+    times = serializers.ListField(child=serializers.TimeField(), allow_empty=False)
+    interval = serializers.IntegerField(
+        min_value=1,
+        default=1,
+        help_text="Play every n-th week, counted from the week of start_date.",
+    )
+
+    def validate(self, attrs):
+        if attrs["end_date"] < attrs["start_date"]:
+            raise ValidationError({"end_date": "The run cannot end before it starts."})
+
+        show_times = self.expand(attrs)
+        if not show_times:
+            raise ValidationError("The schedule contains no performances.")
+        if len(show_times) > self.MAX_PERFORMANCES:
+            raise ValidationError(
+                f"At most {self.MAX_PERFORMANCES} performances can be "
+                "scheduled at once."
+            )
+
+        # A hall hosts one performance per PERFORMANCE_SLOT. Every booking
+        # around the run is loaded in one query and matched by bisection.
+        slot = settings.PERFORMANCE_SLOT
+        booked = sorted(
+            Performance.objects.filter(
+                theatre_hall=attrs["theatre_hall"],
+                show_time__gt=show_times[0] - slot,
+                show_time__lt=show_times[-1] + slot,
+            ).values_list("show_time", flat=True)
+        )
+        conflicts = []
+        for index, show_time in enumerate(show_times):
+            following = bisect_right(booked, show_time - slot)
+            if (following < len(booked) and booked[following] < show_time + slot) or (
+                index and show_time - show_times[index - 1] < slot
+            ):
+                conflicts.append(f"The hall is not free at {show_time.isoformat()}.")
+        if conflicts:
+            raise ValidationError({"theatre_hall": conflicts})
+
+        attrs["show_times"] = show_times
+        return attrs
+
+    def expand(self, attrs):
+        """Returns the sorted show times the recurrence rule describes."""
+        weekdays = {
+            self.WEEKDAYS.index(weekday)
+            for weekday in attrs.get("weekdays") or self.WEEKDAYS
+        }
+        times = sorted(set(attrs["times"]))
+        first_week = attrs["start_date"] - timedelta(days=attrs["start_date"].weekday())
+        show_times = []
+        day = attrs["start_date"]
+        while day <= attrs["end_date"] and len(show_times) <= self.MAX_PERFORMANCES:
+            week = (day - first_week).days // 7
+            if day.weekday() in weekdays and week % attrs["interval"] == 0:
+                show_times.extend(datetime.combine(day, time) for time in times)
+            day += timedelta(days=1)
+        if settings.USE_TZ:
+            show_times = [timezone.make_aware(show_time) for show_time in show_times]
+        return show_times
 
+    def create(self, validated_data):
+        return Performance.objects.bulk_create(
+            Performance(
+                play=validated_data["play"],
+                theatre_hall=validated_data["theatre_hall"],
+                show_time=show_time,
+            )
+            for show_time in validated_data["show_times"]
+        )
+
+
+class OccupancySerializer(serializers.Serializer):
+    performances = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    tickets_sold = serializers.IntegerField()
+    occupancy = serializers.SerializerMethodField(
+        help_text="Share of the seats sold, from 0 to 1."
+    )
+
+    def get_occupancy(self, row) -> float:
+        if not row["capacity"]:
+            return 0.0
+        return round(row["tickets_sold"] / row["capacity"], 4)
+
+
+class PerformanceOccupancySerializer(OccupancySerializer):
+    performances = None
+    id = serializers.IntegerField()
+    play = serializers.IntegerField()
+    theatre_hall = serializers.IntegerField()
+    show_time = serializers.DateTimeField()
+
+
+class PlayOccupancySerializer(OccupancySerializer):
+    play = serializers.IntegerField()
+    title = serializers.CharField()
+
+
+class TheatreHallOccupancySerializer(OccupancySerializer):
+    theatre_hall = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class DayOccupancySerializer(OccupancySerializer):
+    date = serializers.DateField()
+
+
+class DailySalesSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    tickets_sold = serializers.IntegerField()
 
-class ReservationSerializer(serializers.ModelSerializer):
+
+class ReservationSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
 
     class Meta:
         model = Reservation
         fields = ("id", "tickets", "created_at")
 
+    def validate_tickets(self, tickets):
+        performances = Performance.objects.select_related("theatre_hall").in_bulk(
+            {ticket["performance_id"] for ticket in tickets}
+        )
+        errors = [{} for _ in tickets]
+        places = {}
+
+        for index, ticket in enumerate(tickets):
+            performance = performances.get(ticket["performance_id"])
+            if performance is None:
+                errors[index] = {
+                    "performance": [
+                        f'Invalid pk "{ticket["performance_id"]}" - '
+                        f"object does not exist."
+                    ]
+                }
+                continue
+            try:
+                Ticket.validate_ticket(
+                    ticket["row"],
+                    ticket["seat"],
+                    performance.theatre_hall,
+                    ValidationError,
+                )
+            except ValidationError as exc:
+                errors[index] = exc.detail
+                continue
+
+            place = (ticket["performance_id"], ticket["row"], ticket["seat"])
+            if place in places:
+                errors[index] = {
+                    "non_field_errors": ["This seat is repeated in the reservation."]
+                }
+                continue
+            places[place] = index
+
+        if places:
+            held = (
+                HeldSeat.objects.active()
+                .filter(places_filter(places))
+                .exclude(hold__user=self.context["request"].user)
+                .values_list("performance_id", "row", "seat")
+            )
+            for place in held:
+                errors[places[place]] = {
+                    "non_field_errors": ["This seat is held by another customer."]
+                }
+            taken = Ticket.objects.filter(places_filter(places)).values_list(
+                "performance_id", "row", "seat"
+            )
+            for place in taken:
+                errors[places[place]] = {
+                    "non_field_errors": [
+                        "The fields performance, row, seat must make a unique set."
+                    ]
+                }
+
+        if any(errors):
+            raise ValidationError(errors)
+        return tickets
+
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
-            return reservation
+        return booking.reserve(
+            validated_data["user"],
+            [
+                (ticket["performance_id"], ticket["row"], ticket["seat"])
+                for ticket in validated_data["tickets"]
+            ],
+        )
 
 
 class ReservationListSerializer(ReservationSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+    class Meta(ReservationSerializer.Meta):
+        expandable_fields = ("tickets",)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    performance = serializers.PrimaryKeyRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+    seats = HeldSeatSerializer(
+        many=True, allow_empty=False, max_length=settings.SEAT_HOLD_MAX_SEATS
+    )
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "performance", "seats", "created_at", "expires_at")
+        read_only_fields = ("created_at", "expires_at")
+
+    def validate(self, attrs):
+        performance = attrs["performance"]
+        errors = [{} for _ in attrs["seats"]]
+        places = {}
+
+        for index, seat in enumerate(attrs["seats"]):
+            try:
+                Ticket.validate_ticket(
+                    seat["row"], seat["seat"], performance.theatre_hall, ValidationError
+                )
+            except ValidationError as exc:
+                errors[index] = exc.detail
+                continue
+
+            place = (performance.pk, seat["row"], seat["seat"])
+            if place in places:
+                errors[index] = {
+                    "non_field_errors": ["This seat is repeated in the hold."]
+                }
+                continue
+            places[place] = index
+
+        if places:
+            held = (
+                HeldSeat.objects.active()
+                .filter(places_filter(places))
+                .values_list("performance_id", "row", "seat")
+            )
+            for place in held:
+                errors[places[place]] = {
+                    "non_field_errors": ["This seat is already held."]
+                }
+            taken = Ticket.objects.filter(places_filter(places)).values_list(
+                "performance_id", "row", "seat"
+            )
+            for place in taken:
+                errors[places[place]] = {
+                    "non_field_errors": ["This seat is already taken."]
+                }
+
+        if any(errors):
+            raise ValidationError({"seats": errors})
+        return attrs
+
+    def create(self, validated_data):
+        return booking.hold(
+            validated_data["user"],
+            validated_data["performance"],
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]],
+        )
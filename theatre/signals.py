@@ -0,0 +1,85 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from theatre.cache import invalidate
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+@receiver([post_save, post_delete], sender=Genre)
+@receiver([post_save, post_delete], sender=Actor)
+def invalidate_genres_and_actors(sender, created=False, **kwargs):
+    namespace = "genres" if sender is Genre else "actors"
+    if created:
+        invalidate(namespace)
+    else:
+        # Plays embed genre names and actor names.
+        invalidate(namespace, "play_relations")
+
+
+@receiver([post_save, post_delete], sender=TheatreHall)
+def invalidate_theatre_halls(sender, **kwargs):
+    invalidate("theatre_halls")
+
+
+@receiver([post_save, post_delete], sender=Play)
+def invalidate_play(sender, instance, **kwargs):
+    invalidate("plays", f"play:{instance.pk}")
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def invalidate_play_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate("plays", f"play:{instance.pk}")
+    elif pk_set:
+        invalidate("plays", *(f"play:{pk}" for pk in pk_set))
+    else:
+        # Reverse clear: the affected plays are unknown, drop every play.
+        invalidate("plays", "play_relations")
+
+
+def bump_performances(**lookups):
+    """
+    Bumps the version of the performances matching ``lookups``: their
+    detail responses embed the play and the hall, so ETags issued before
+    an edit to either must stop matching.
+    """
+    Performance.objects.filter(**lookups).update(version=F("version") + 1)
+
+
+@receiver([post_save, pre_delete], sender=Genre)
+@receiver([post_save, pre_delete], sender=Actor)
+def bump_genre_and_actor_performances(sender, instance, created=False, **kwargs):
+    if not created:
+        # Deletion runs before the links to the plays go with the row.
+        lookup = "play__genres" if sender is Genre else "play__actors"
+        bump_performances(**{lookup: instance})
+
+
+@receiver(post_save, sender=TheatreHall)
+def bump_theatre_hall_performances(sender, instance, created, **kwargs):
+    if not created:
+        bump_performances(theatre_hall=instance)
+
+
+@receiver(post_save, sender=Play)
+def bump_play_performances(sender, instance, created, **kwargs):
+    if not created:
+        bump_performances(play=instance)
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+@receiver(m2m_changed, sender=Play.actors.through)
+def bump_linked_performances(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            bump_performances(play=instance)
+    elif action == "pre_clear":
+        # The plays losing the link are only known before it is gone.
+        lookup = "play__genres" if sender is Play.genres.through else "play__actors"
+        bump_performances(**{lookup: instance})
+    elif action.startswith("post_") and pk_set:
+        bump_performances(play__in=pk_set)
@@ -0,0 +1,134 @@
+from datetime import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import booking
+from theatre.models import DailySales, Performance, Play, Reservation, TheatreHall
+
+
+def analytics_url(report):
+    return reverse(f"theatre:analytics-{report}")
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.admin)
+        self.hall = TheatreHall.objects.create(name="Main", rows=2, seats_in_row=5)
+        self.small_hall = TheatreHall.objects.create(
+            name="Small", rows=1, seats_in_row=5
+        )
+        self.hamlet = Play.objects.create(title="Hamlet", description="Prince")
+        self.macbeth = Play.objects.create(title="Macbeth", description="King")
+        self.first = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.hall,
+            show_time=make_aware(datetime(2025, 9, 1, 19, 0)),
+        )
+        self.second = Performance.objects.create(
+            play=self.hamlet,
+            theatre_hall=self.small_hall,
+            show_time=make_aware(datetime(2025, 9, 2, 19, 0)),
+        )
+        self.third = Performance.objects.create(
+            play=self.macbeth,
+            theatre_hall=self.hall,
+            show_time=make_aware(datetime(2025, 9, 2, 21, 0)),
+        )
+        booking.reserve(
+            self.user,
+            [(self.first.id, 1, 1), (self.first.id, 1, 2), (self.second.id, 1, 1)],
+        )
+        self.cancelled = booking.reserve(self.user, [(self.third.id, 2, 2)])
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(analytics_url("plays"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_performance_occupancy(self):
+        res = self.client.get(analytics_url("performances"), {"to": "2025-09-01"})
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["id"], self.first.id)
+        self.assertEqual(res.data[0]["capacity"], 10)
+        self.assertEqual(res.data[0]["tickets_sold"], 2)
+        self.assertEqual(res.data[0]["occupancy"], 0.2)
+
+    def test_play_occupancy(self):
+        res = self.client.get(analytics_url("plays"))
+
+        self.assertEqual(
+            [
+                (
+                    row["title"],
+                    row["performances"],
+                    row["capacity"],
+                    row["tickets_sold"],
+                )
+                for row in res.data
+            ],
+            [("Hamlet", 2, 15, 3), ("Macbeth", 1, 10, 1)],
+        )
+
+    def test_hall_and_day_occupancy(self):
+        halls = self.client.get(analytics_url("theatre-halls"))
+        days = self.client.get(analytics_url("days"), {"from": "2025-09-02"})
+
+        self.assertEqual(
+            [(row["name"], row["tickets_sold"]) for row in halls.data],
+            [("Main", 3), ("Small", 1)],
+        )
+        self.assertEqual(
+            [(row["date"], row["performances"]) for row in days.data],
+            [("2025-09-02", 2)],
+        )
+
+    def test_sales_are_recorded_as_reservations_change(self):
+        self.client.force_authenticate(self.user)
+        self.client.delete(
+            reverse("theatre:reservation-detail", args=[self.cancelled.id])
+        )
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.get(analytics_url("sales"))
+        by_play = self.client.get(analytics_url("sales"), {"play": self.macbeth.id})
+
+        today = timezone.now().date().isoformat()
+        self.assertEqual(res.data, [{"date": today, "tickets_sold": 3}])
+        self.assertEqual(by_play.data, [{"date": today, "tickets_sold": 0}])
+
+    def test_rebuild_matches_incremental_summary(self):
+        Reservation.objects.filter(pk=self.cancelled.pk).update(
+            created_at=make_aware(datetime(2025, 8, 1, 12, 0))
+        )
+        expected = {(self.first.id, 2), (self.second.id, 1), (self.third.id, 1)}
+        self.assertEqual(
+            set(DailySales.objects.values_list("performance", "tickets_sold")),
+            expected,
+        )
+
+        call_command("rebuild_sales_summary", stdout=StringIO())
+
+        self.assertEqual(
+            set(DailySales.objects.values_list("performance", "tickets_sold")),
+            expected,
+        )
+        self.assertEqual(
+            DailySales.objects.get(performance=self.third).date.isoformat(),
+            "2025-08-01",
+        )
@@ -0,0 +1,161 @@
+import base64
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        hall = TheatreHall.objects.create(name="Hall", rows=2, seats_in_row=5)
+        cls.play = Play.objects.create(title="Hamlet", description="Prince")
+        cls.play.genres.add(Genre.objects.create(name="Drama"))
+        cls.play.actors.add(Actor.objects.create(first_name="A", last_name="B"))
+        Play.objects.create(title="Macbeth", description="King")
+        cls.performance = Performance.objects.create(
+            play=cls.play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 8, 1, 19, 0)),
+        )
+        Performance.objects.create(
+            play=cls.play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 8, 2, 19, 0)),
+        )
+        reservation = Reservation.objects.create(user=cls.user)
+        Ticket.objects.create(
+            performance=cls.performance, reservation=reservation, row=1, seat=1
+        )
+        Performance.add_tickets_sold({cls.performance.id: 1})
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    async def test_requires_authentication(self):
+        res = await self.async_client.get(reverse("theatre:async-play-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_is_read_only(self):
+        res = await self.async_client.post(
+            reverse("theatre:async-play-list"), {}, headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_play_list(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-play-list"), {"page_size": 1}, headers=self.headers
+        )
+        data = res.json()
+        following = await self.async_client.get(data["next"], headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([play["title"] for play in data["results"]], ["Hamlet"])
+        self.assertEqual(data["results"][0]["genres"], ["Drama"])
+        self.assertEqual(
+            [play["title"] for play in following.json()["results"]], ["Macbeth"]
+        )
+        self.assertIsNone(following.json()["next"])
+
+    async def test_play_detail(self):
+        url = reverse("theatre:async-play-detail", args=[self.play.id])
+
+        res = await self.async_client.get(url, headers=self.headers)
+        cached = await self.async_client.get(url, headers=self.headers)
+        missing = await self.async_client.get(
+            reverse("theatre:async-play-detail", args=[0]), headers=self.headers
+        )
+
+        self.assertEqual(res.json()["title"], "Hamlet")
+        self.assertEqual([genre["name"] for genre in res.json()["genres"]], ["Drama"])
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_performance_list_filters(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-list"),
+            {"date": "2025-08-01"},
+            headers=self.headers,
+        )
+        invalid = await self.async_client.get(
+            reverse("theatre:async-performance-list"),
+            {"date": "soon"},
+            headers=self.headers,
+        )
+
+        results = res.json()["results"]
+        self.assertEqual([p["id"] for p in results], [self.performance.id])
+        self.assertEqual(results[0]["tickets_available"], 9)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_performance_detail_etag(self):
+        url = reverse("theatre:async-performance-detail", args=[self.performance.id])
+
+        res = await self.async_client.get(url, headers=self.headers)
+        revalidated = await self.async_client.get(
+            url, headers={**self.headers, "If-None-Match": res["ETag"]}
+        )
+
+        self.assertEqual(res.json()["taken_places"], [{"row": 1, "seat": 1}])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_seat_map(self):
+        url = reverse("theatre:async-performance-seat-map", args=[self.performance.id])
+
+        res = await self.async_client.get(url, headers=self.headers)
+        raw = await self.async_client.get(
+            url, headers={**self.headers, "Accept": "application/octet-stream"}
+        )
+
+        self.assertEqual(base64.b64decode(res.json()["seat_map"]), b"\x80\x00")
+        self.assertEqual(raw.content, b"\x80\x00")
+        self.assertEqual(raw["X-Seat-Map-Rows"], "2")
+
+    async def test_seat_map_binary_errors_are_json(self):
+        url = reverse("theatre:async-performance-seat-map", args=[0])
+
+        res = await self.async_client.get(
+            url, headers={**self.headers, "Accept": "application/octet-stream"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertIn("detail", res.json())
+
+
+@override_settings(DEBUG=True)
+class AsyncQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("user@test.com", "testpass")
+
+    async def test_reports_query_count(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-list"),
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-Query-Count"], "3")
+        self.assertNotIn("X-Query-Budget-Exceeded", res)
@@ -0,0 +1,132 @@
+import threading
+from datetime import datetime
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import booking
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+from theatre.serializers import ReservationSerializer
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def sample_performance():
+    return Performance.objects.create(
+        play=Play.objects.create(title="Play", description="Description"),
+        theatre_hall=TheatreHall.objects.create(name="Hall", rows=5, seats_in_row=5),
+        show_time=make_aware(datetime(2025, 8, 1, 19, 0)),
+    )
+
+
+class ReserveTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.performance = sample_performance()
+
+    def test_reserve(self):
+        reservation = booking.reserve(
+            self.user, [(self.performance.id, 1, 1), (self.performance.id, 1, 2)]
+        )
+
+        self.assertEqual(reservation.tickets.count(), 2)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+    def test_contested_seats_are_named(self):
+        booking.reserve(self.user, [(self.performance.id, 1, 2)])
+
+        with self.assertRaises(booking.SeatsUnavailable) as raised:
+            booking.reserve(
+                self.user, [(self.performance.id, 1, 1), (self.performance.id, 1, 2)]
+            )
+
+        self.assertEqual(raised.exception.places, [(self.performance.id, 1, 2)])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    @mock.patch("theatre.booking.time.sleep")
+    def test_transient_errors_are_retried(self, sleep):
+        with mock.patch(
+            "theatre.booking.lock_performances",
+            side_effect=[OperationalError("deadlock detected"), None],
+        ):
+            reservation = booking.reserve(self.user, [(self.performance.id, 1, 1)])
+
+        self.assertEqual(reservation.tickets.count(), 1)
+        self.assertEqual(sleep.call_count, 1)
+
+    @mock.patch("theatre.booking.time.sleep")
+    def test_retries_are_bounded(self, sleep):
+        with mock.patch(
+            "theatre.booking.lock_performances",
+            side_effect=OperationalError("deadlock detected"),
+        ):
+            with self.assertRaises(OperationalError):
+                booking.reserve(self.user, [(self.performance.id, 1, 1)])
+
+        self.assertEqual(sleep.call_count, booking.MAX_ATTEMPTS - 1)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_lost_race_returns_conflict(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        booking.reserve(self.user, [(self.performance.id, 3, 3)])
+
+        # Both requests passed validation before either one committed.
+        with mock.patch.object(
+            ReservationSerializer, "validate_tickets", lambda self, tickets: tickets
+        ):
+            res = client.post(
+                RESERVATION_URL,
+                {
+                    "tickets": [
+                        {"row": 3, "seat": 3, "performance": self.performance.id}
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["seats"],
+            [{"performance": self.performance.id, "row": 3, "seat": 3}],
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "Needs row locking")
+class ConcurrentReserveTests(TransactionTestCase):
+    def test_only_one_writer_wins_a_seat(self):
+        performance = sample_performance()
+        users = [
+            get_user_model().objects.create_user(f"user{i}@test.com", "testpass")
+            for i in range(8)
+        ]
+        barrier = threading.Barrier(len(users))
+        outcomes = []
+
+        def attempt(user):
+            barrier.wait()
+            try:
+                booking.reserve(user, [(performance.id, 1, 1)])
+                outcomes.append("reserved")
+            except booking.SeatsUnavailable:
+                outcomes.append("conflict")
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count("reserved"), 1)
+        self.assertEqual(outcomes.count("conflict"), len(users) - 1)
+        performance.refresh_from_db()
+        self.assertEqual(performance.tickets_sold, 1)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.cache import CATALOGUE_CACHE
+from theatre.models import Genre, Play
+
+GENRE_URL = reverse("theatre:genre-list")
+PLAY_URL = reverse("theatre:play-list")
+CACHE_STATS_URL = reverse("theatre:cache-stats")
+
+
+class CatalogueCacheTests(TestCase):
+    def setUp(self):
+        caches[CATALOGUE_CACHE].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_served_from_cache(self):
+        Genre.objects.create(name="Drama")
+
+        first = self.client.get(GENRE_URL)
+        # Only the throttle touches the database.
+        with self.assertNumQueries(1):
+            second = self.client.get(GENRE_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(PLAY_URL, {"title": "hamlet"})
+        res = self.client.get(PLAY_URL, {"title": "macbeth"})
+
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    def test_genre_change_invalidates_genres_and_plays(self):
+        genre = Genre.objects.create(name="Drama")
+        play = Play.objects.create(title="Hamlet", description="Tragedy")
+        play.genres.add(genre)
+        self.client.get(GENRE_URL)
+        self.client.get(PLAY_URL)
+
+        genre.name = "Tragedy"
+        genre.save()
+
+        genres = self.client.get(GENRE_URL)
+        plays = self.client.get(PLAY_URL)
+        self.assertEqual(genres["X-Cache"], "MISS")
+        self.assertEqual(genres.data[0]["name"], "Tragedy")
+        self.assertEqual(plays.data["results"][0]["genres"], ["Tragedy"])
+
+    def test_play_links_invalidate_only_that_play(self):
+        hamlet = Play.objects.create(title="Hamlet", description="Tragedy")
+        macbeth = Play.objects.create(title="Macbeth", description="Tragedy")
+        hamlet_url = reverse("theatre:play-detail", args=[hamlet.id])
+        macbeth_url = reverse("theatre:play-detail", args=[macbeth.id])
+        self.client.get(hamlet_url)
+        self.client.get(macbeth_url)
+
+        hamlet.genres.add(Genre.objects.create(name="Drama"))
+
+        hamlet_res = self.client.get(hamlet_url)
+        self.assertEqual(hamlet_res["X-Cache"], "MISS")
+        self.assertEqual(hamlet_res.data["genres"][0]["name"], "Drama")
+        self.assertEqual(self.client.get(macbeth_url)["X-Cache"], "HIT")
+
+    def test_stats(self):
+        self.client.get(GENRE_URL)
+        self.client.get(GENRE_URL)
+        Genre.objects.create(name="Drama")
+
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@test.com", "testpass", is_staff=True
+            )
+        )
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["hits"], 1)
+        self.assertEqual(res.data["misses"], 1)
+        # The genres namespace.
+        self.assertEqual(res.data["invalidations"], 1)
+
+    def test_stats_admin_only(self):
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,138 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F, Sum
+from django.test import TestCase
+
+from theatre import dataset
+from theatre.models import DailySales, Performance, Reservation, Ticket
+
+SCALE = {
+    "genres": 3,
+    "actors": 8,
+    "halls": 2,
+    "plays": 4,
+    "performances": 9,
+    "users": 5,
+    "tickets": 500,
+}
+
+
+class DatasetTests(TestCase):
+    def seat_plan(self):
+        return list(
+            Ticket.objects.order_by(
+                "performance__show_time", "row", "seat"
+            ).values_list(
+                "performance__show_time",
+                "performance__play__title",
+                "row",
+                "seat",
+                "reservation__user__email",
+            )
+        )
+
+    def daily_sales(self):
+        return set(
+            DailySales.objects.values_list("date", "performance", "tickets_sold")
+        )
+
+    def test_generate(self):
+        created = dataset.generate(SCALE, seed=1, batch_size=100)
+
+        self.assertEqual(created["performances"], 9)
+        self.assertEqual(created["tickets"], Ticket.objects.count())
+        self.assertGreater(created["tickets"], 0)
+        sold = Performance.objects.annotate(count=Count("tickets"))
+        for performance in sold:
+            self.assertEqual(performance.tickets_sold, performance.count)
+        self.assertEqual(
+            DailySales.objects.aggregate(total=Sum("tickets_sold"))["total"],
+            created["tickets"],
+        )
+        self.assertLessEqual(
+            Reservation.objects.annotate(count=Count("tickets"))
+            .order_by("-count")
+            .values_list("count", flat=True)
+            .first(),
+            max(dataset.PARTY_SIZES),
+        )
+        self.assertFalse(
+            Ticket.objects.filter(
+                reservation__created_at__gte=F("performance__show_time")
+            ).exists()
+        )
+
+    def test_sales_match_rebuilt_summary(self):
+        dataset.generate(SCALE, seed=2, batch_size=100)
+        sales = self.daily_sales()
+
+        call_command("rebuild_sales_summary", stdout=StringIO())
+        self.assertEqual(self.daily_sales(), sales)
+
+    def test_same_seed_same_data(self):
+        dataset.generate(SCALE, seed=1, batch_size=100)
+        first = self.seat_plan()
+        Performance.objects.all().delete()
+
+        dataset.generate(SCALE, seed=1, batch_size=7)
+        self.assertEqual(self.seat_plan(), first)
+
+    def test_seed_command(self):
+        out = StringIO()
+        call_command(
+            "seed_theatre",
+            "--performances",
+            "6",
+            "--tickets",
+            "300",
+            "--halls",
+            "2",
+            "--plays",
+            "3",
+            "--genres",
+            "2",
+            "--actors",
+            "4",
+            "--users",
+            "5",
+            "--workers",
+            "1",
+            stdout=out,
+        )
+
+        self.assertEqual(Performance.objects.count(), 6)
+        self.assertEqual(
+            Performance.objects.aggregate(total=Sum("tickets_sold"))["total"],
+            Ticket.objects.count(),
+        )
+        self.assertIn("Seeded", out.getvalue())
+
+    def test_seed_command_needs_halls(self):
+        with self.assertRaises(CommandError):
+            call_command("seed_theatre", "--halls", "0", stdout=StringIO())
+
+    def test_benchmark_command(self):
+        dataset.generate(SCALE, seed=1)
+        out = StringIO()
+        call_command(
+            "benchmark_api",
+            "--requests",
+            "2",
+            "--warmup",
+            "0",
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["dataset"]["performance"], 9)
+        for name, result in report["endpoints"].items():
+            with self.subTest(name):
+                self.assertTrue(all(200 <= s < 300 for s in result["status"]))
+                self.assertIsNotNone(result["queries"])
+        # Writes were rolled back.
+        self.assertEqual(Performance.objects.count(), 9)
+        self.assertEqual(Ticket.objects.count(), report["dataset"]["ticket"])
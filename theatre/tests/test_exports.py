@@ -0,0 +1,135 @@
+import csv
+import json
+from datetime import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre import booking, exports
+from theatre.models import Performance, Play, Reservation, TheatreHall
+
+
+def export_url(kind, file_format):
+    return reverse("theatre:export", kwargs={"kind": kind, "file_format": file_format})
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.admin)
+        hall = TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Hamlet", description="Prince")
+        self.performance = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 9, 1, 19, 0)),
+        )
+        self.other = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 9, 2, 19, 0)),
+        )
+        self.old = booking.reserve(
+            self.user, [(self.performance.id, 1, 1), (self.performance.id, 1, 2)]
+        )
+        Reservation.objects.filter(pk=self.old.pk).update(
+            created_at=make_aware(datetime(2025, 8, 1, 12, 0))
+        )
+        self.new = booking.reserve(self.user, [(self.other.id, 2, 1)])
+
+    def content(self, res):
+        return b"".join(res.streaming_content).decode()
+
+    def test_tickets_csv(self):
+        res = self.client.get(export_url("tickets", "csv"))
+
+        rows = list(csv.DictReader(StringIO(self.content(res))))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn('filename="tickets.csv"', res["Content-Disposition"])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(list(rows[0]), list(exports.COLUMNS["tickets"]))
+        self.assertEqual(
+            (rows[0]["user_email"], rows[0]["play"], rows[0]["row"], rows[0]["seat"]),
+            ("user@test.com", "Hamlet", "1", "1"),
+        )
+
+    def test_reservations_jsonl_filtered_by_date(self):
+        res = self.client.get(
+            export_url("reservations", "jsonl"),
+            {"from": "2025-08-01", "to": "2025-08-01"},
+        )
+
+        rows = [json.loads(line) for line in self.content(res).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.old.id])
+        self.assertEqual(rows[0]["tickets"], 2)
+
+    def test_filtered_by_performance(self):
+        res = self.client.get(
+            export_url("tickets", "jsonl"), {"performance": self.other.id}
+        )
+
+        rows = [json.loads(line) for line in self.content(res).splitlines()]
+        self.assertEqual([row["reservation"] for row in rows], [self.new.id])
+
+    def test_invalid_requests(self):
+        unknown = self.client.get(export_url("users", "csv"))
+        invalid = self.client.get(export_url("tickets", "csv"), {"performance": "x"})
+
+        self.assertEqual(unknown.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_accepts_export_media_types(self):
+        csv_res = self.client.get(export_url("tickets", "csv"), HTTP_ACCEPT="text/csv")
+        jsonl_res = self.client.get(
+            export_url("tickets", "jsonl"), HTTP_ACCEPT="application/x-ndjson"
+        )
+        error = self.client.get(
+            export_url("tickets", "csv"), {"performance": "x"}, HTTP_ACCEPT="text/csv"
+        )
+
+        self.assertEqual(csv_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.content(csv_res).splitlines()), 4)
+        self.assertEqual(jsonl_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.content(jsonl_res).splitlines()), 3)
+        self.assertEqual(error.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(error["Content-Type"], "application/json")
+
+    async def test_streams_asynchronously_under_asgi(self):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.admin)}"}
+
+        res = await self.async_client.get(
+            export_url("tickets", "jsonl"), headers=headers
+        )
+
+        self.assertTrue(res.is_async)
+        content = b"".join([chunk async for chunk in res.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 3)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(export_url("tickets", "csv"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command(
+            "export_reservations", "tickets", "--from", "2025-08-02", stdout=out
+        )
+
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual([row["reservation"] for row in rows], [str(self.new.id)])
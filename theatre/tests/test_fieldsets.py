@@ -0,0 +1,139 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from theatre import booking
+from theatre.fieldsets import Fieldset
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def performance_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+def play_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+class FieldsetTests(TestCase):
+    def test_nested_paths(self):
+        fieldset = Fieldset.from_query_params(
+            {"fields": "id, tickets.performance.show_time", "expand": "tickets"}
+        )
+
+        self.assertTrue(fieldset.wants("tickets"))
+        self.assertTrue(fieldset.wants("tickets.performance"))
+        self.assertFalse(fieldset.wants("created_at"))
+        self.assertTrue(fieldset.expands("tickets"))
+        self.assertFalse(fieldset.expands("tickets.performance"))
+        tickets = fieldset.at("tickets")
+        self.assertEqual(tickets.fields, {("performance", "show_time")})
+        self.assertEqual(tickets.expand, set())
+
+    def test_whole_object_keeps_nested_fields(self):
+        fieldset = Fieldset.from_query_params({"fields": "play"})
+
+        self.assertTrue(fieldset.wants("play.title"))
+        self.assertIsNone(fieldset.at("play").fields)
+
+
+class SparseFieldsetApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5)
+        self.play = Play.objects.create(title="Hamlet", description="Prince")
+        self.genre = Genre.objects.create(name="Tragedy")
+        self.actor = Actor.objects.create(first_name="Ian", last_name="McKellen")
+        self.play.genres.add(self.genre)
+        self.play.actors.add(self.actor)
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.hall,
+            show_time=make_aware(datetime(2025, 9, 1, 19, 0)),
+        )
+        self.reservation = booking.reserve(
+            self.user, [(self.performance.id, 1, 1), (self.performance.id, 1, 2)]
+        )
+
+    def test_performance_list_without_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PERFORMANCE_URL, {"fields": "id,show_time"})
+
+        # Rendered as the project's USE_TZ setting has it, with or without Z.
+        self.performance.refresh_from_db()
+        show_time = serializers.DateTimeField().to_representation(
+            self.performance.show_time
+        )
+        self.assertTrue(show_time.startswith("2025-09-01T19:00:00"))
+        self.assertEqual(
+            res.data["results"],
+            [{"id": self.performance.id, "show_time": show_time}],
+        )
+        sql = next(
+            query["sql"]
+            for query in queries
+            if Performance._meta.db_table in query["sql"]
+        )
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn("play_id", sql)
+
+    def test_performance_detail_with_collapsed_relations(self):
+        res = self.client.get(
+            performance_url(self.performance.id),
+            {"fields": "id,play,theatre_hall", "expand": "theatre_hall"},
+        )
+
+        self.assertEqual(res.data["play"], self.play.id)
+        self.assertEqual(res.data["theatre_hall"]["name"], "Main")
+        self.assertNotIn("taken_places", res.data)
+
+    def test_play_detail_genres_as_ids(self):
+        res = self.client.get(play_url(self.play.id), {"expand": ""})
+
+        self.assertEqual(res.data["genres"], [self.genre.id])
+        self.assertEqual(res.data["actors"], [self.actor.id])
+        self.assertEqual(res.data["title"], "Hamlet")
+
+    def test_reservation_list_ticket_performance_as_id(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                RESERVATION_URL,
+                {"fields": "id,tickets.row,tickets.performance", "expand": "tickets"},
+            )
+
+        self.assertEqual(
+            res.data["results"],
+            [
+                {
+                    "id": self.reservation.id,
+                    "tickets": [
+                        {"row": 1, "performance": self.performance.id},
+                        {"row": 1, "performance": self.performance.id},
+                    ],
+                }
+            ],
+        )
+        self.assertFalse(any(Play._meta.db_table in query["sql"] for query in queries))
+
+    def test_default_response_unchanged(self):
+        full = self.client.get(RESERVATION_URL).data["results"][0]
+        expanded = self.client.get(
+            RESERVATION_URL, {"expand": "tickets.performance"}
+        ).data["results"][0]
+
+        self.assertEqual(full, expanded)
+        self.assertEqual(
+            full["tickets"][0]["performance"]["play_title"], self.play.title
+        )
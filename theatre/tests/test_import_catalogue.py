@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from theatre.cache import get_versions
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+class ImportCatalogueTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def call(self, *args, **options):
+        call_command("import_catalogue", *args, stdout=StringIO(), **options)
+
+    def test_plays_from_csv(self):
+        Genre.objects.create(name="Drama")
+        path = self.write(
+            "plays.csv",
+            "title,description,genres,actors\n"
+            "Hamlet,Prince,Drama|Tragedy,Anna Smith|Tom Jones\n"
+            "Macbeth,King,Tragedy,Anna Smith\n",
+        )
+        versions = get_versions(["plays", "genres"])
+
+        self.call("plays", path, batch_size=1)
+
+        hamlet = Play.objects.get(title="Hamlet")
+        self.assertEqual(
+            sorted(hamlet.genres.values_list("name", flat=True)), ["Drama", "Tragedy"]
+        )
+        self.assertEqual(
+            sorted(actor.full_name for actor in hamlet.actors.all()),
+            ["Anna Smith", "Tom Jones"],
+        )
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertEqual(Actor.objects.count(), 2)
+        self.assertEqual(Play.objects.get(title="Macbeth").genres.count(), 1)
+        self.assertNotEqual(get_versions(["plays", "genres"]), versions)
+
+    def test_performances_from_jsonl(self):
+        play = Play.objects.create(title="Hamlet", description="Prince")
+        hall = TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5)
+        path = self.write(
+            "performances.jsonl",
+            json.dumps(
+                {
+                    "play": "Hamlet",
+                    "theatre_hall": "Main",
+                    "show_time": "2025-09-01T19:00",
+                }
+            )
+            + "\n\n",
+        )
+
+        self.call("performances", path)
+
+        performance = Performance.objects.get()
+        self.assertEqual(performance.play, play)
+        self.assertEqual(performance.theatre_hall, hall)
+
+    def test_plays_from_jsonl(self):
+        path = self.write(
+            "plays.jsonl",
+            json.dumps(
+                {
+                    "title": "Hamlet",
+                    "genres": ["Drama"],
+                    "actors": [{"first_name": "Anna Maria", "last_name": "Smith"}],
+                }
+            ),
+        )
+
+        self.call("plays", path)
+
+        actor = Play.objects.get().actors.get()
+        self.assertEqual((actor.first_name, actor.last_name), ("Anna Maria", "Smith"))
+
+    def test_invalid_record(self):
+        path = self.write("halls.csv", "name,rows,seats_in_row\nMain,many,10\n")
+
+        with self.assertRaisesMessage(CommandError, "Record 1: invalid rows 'many'"):
+            self.call("halls", path)
+
+    def test_invalid_json(self):
+        path = self.write("genres.jsonl", '{"name": "Drama"}\n\n{"name": \n')
+
+        with self.assertRaisesMessage(CommandError, "Record 2: invalid JSON"):
+            self.call("genres", path)
+
+        path = self.write("actors.jsonl", '["Anna", "Smith"]\n')
+        with self.assertRaisesMessage(
+            CommandError, "Record 1: expected a JSON object."
+        ):
+            self.call("actors", path)
+
+    def test_resumes_after_last_imported_batch(self):
+        path = self.write("genres.csv", "name\nDrama\nComedy\nTragedy\n")
+        self.write("genres.csv.progress", "2")
+
+        self.call("genres", path)
+
+        self.assertEqual(
+            list(Genre.objects.values_list("name", flat=True)), ["Tragedy"]
+        )
+        self.assertFalse(os.path.exists(f"{path}.progress"))
+
+    def test_failed_batch_is_not_recorded(self):
+        path = self.write(
+            "performances.csv",
+            "play,theatre_hall,show_time\n"
+            "Hamlet,Main,2025-09-01T19:00\n"
+            "Missing,Main,2025-09-02T19:00\n",
+        )
+        Play.objects.create(title="Hamlet", description="Prince")
+        TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5)
+
+        with self.assertRaises(CommandError):
+            self.call("performances", path, batch_size=1)
+
+        self.assertEqual(Performance.objects.count(), 1)
+        with open(f"{path}.progress") as file:
+            self.assertEqual(file.read(), "1")
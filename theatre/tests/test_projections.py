@@ -0,0 +1,123 @@
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from theatre import booking
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+from theatre.projections import ReservationListProjection
+from theatre.views import PerformanceViewSet, PlayViewSet, ReservationViewSet
+
+
+class ListProjectionTests(TestCase):
+    """The projected lists must render exactly what the serializers do."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.other = get_user_model().objects.create_user("other@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        genres = Genre.objects.bulk_create(
+            Genre(name=name) for name in ("Tragedy", "Drama", "Comedy")
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=first_name, last_name=last_name)
+            for first_name, last_name in (("Ian", "McKellen"), ("Judi", "Dench"))
+        )
+        hamlet = Play.objects.create(title="Hamlet", description="Prince")
+        hamlet.genres.set(genres[:2])
+        hamlet.actors.set(actors)
+        macbeth = Play.objects.create(title="Macbeth", description="Thane")
+        macbeth.genres.set(genres[2:])
+        Play.objects.create(title="Untitled", description="")
+        halls = [
+            TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5),
+            TheatreHall.objects.create(name="Studio", rows=2, seats_in_row=3),
+        ]
+        performances = [
+            Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=make_aware(datetime(2025, 9, day, 19, 30)),
+            )
+            for day, (play, hall) in enumerate(
+                [(hamlet, halls[0]), (macbeth, halls[1]), (hamlet, halls[1])], 1
+            )
+        ]
+        booking.reserve(
+            self.user,
+            [
+                (performances[0].id, 2, 1),
+                (performances[0].id, 1, 3),
+                (performances[1].id, 1, 1),
+            ],
+        )
+        booking.reserve(self.user, [(performances[2].id, 2, 2)])
+        booking.reserve(self.other, [(performances[2].id, 1, 1)])
+        booking.hold(self.other, performances[1], [(2, 1), (2, 2)])
+
+    def assertSameAsSerializer(self, viewset, url):
+        projected = self.client.get(url)
+        caches["catalogue"].clear()
+        with mock.patch.object(viewset, "list_projection", None):
+            serialized = self.client.get(url)
+
+        self.assertEqual(projected.status_code, 200)
+        self.assertEqual(projected.content, serialized.content)
+        return projected
+
+    def test_play_list(self):
+        res = self.assertSameAsSerializer(PlayViewSet, reverse("theatre:play-list"))
+
+        self.assertEqual(res.data["results"][0]["genres"], ["Tragedy", "Drama"])
+        self.assertEqual(res.data["results"][2]["actors"], [])
+
+    def test_async_play_list(self):
+        self.assertSameAsSerializer(PlayViewSet, reverse("theatre:async-play-list"))
+
+    def test_performance_list(self):
+        res = self.assertSameAsSerializer(
+            PerformanceViewSet, reverse("theatre:performance-list")
+        )
+
+        self.assertEqual(
+            [row["tickets_available"] for row in res.data["results"]], [4, 3, 23]
+        )
+
+    def test_async_performance_list(self):
+        self.assertSameAsSerializer(
+            PerformanceViewSet, reverse("theatre:async-performance-list")
+        )
+
+    def test_reservation_list(self):
+        res = self.assertSameAsSerializer(
+            ReservationViewSet, reverse("theatre:reservation-list")
+        )
+
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertEqual(
+            [ticket["row"] for ticket in res.data["results"][1]["tickets"]], [1, 1, 2]
+        )
+
+    def test_sparse_fieldsets_use_serializers(self):
+        with mock.patch.object(
+            ReservationListProjection, "to_representation"
+        ) as to_representation:
+            res = self.client.get(reverse("theatre:reservation-list"), {"expand": ""})
+
+        to_representation.assert_not_called()
+        self.assertIsInstance(res.data["results"][0]["tickets"][0], int)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_serializers", "--repeat", "1", stdout=out)
+
+        for name in ("plays", "performances", "reservations"):
+            self.assertIn(f"{name}: projection is", out.getvalue())
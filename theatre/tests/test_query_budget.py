@@ -0,0 +1,441 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import urlparse
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from theatre.cache import CATALOGUE_CACHE
+from theatre.models import (
+    Actor,
+    DailySales,
+    Genre,
+    Performance,
+    Play,
+    HeldSeat,
+    Reservation,
+    SeatHold,
+    TheatreHall,
+    Ticket,
+)
+from theatre.query_budget import get_query_budget
+from theatre.views import GenreViewSet
+
+SIZES = (2, 10)
+
+
+def create_plays(size):
+    genres = Genre.objects.bulk_create(Genre(name=f"Genre {i}") for i in range(size))
+    actors = Actor.objects.bulk_create(
+        Actor(first_name="Actor", last_name=str(i)) for i in range(size)
+    )
+    plays = Play.objects.bulk_create(
+        Play(title=f"Play {i}", description="Description") for i in range(size)
+    )
+    for play in plays:
+        play.genres.set(genres)
+        play.actors.set(actors)
+    return plays
+
+
+def create_performances(size):
+    hall = TheatreHall.objects.create(name="Hall", rows=20, seats_in_row=20)
+    return Performance.objects.bulk_create(
+        Performance(
+            play=play,
+            theatre_hall=hall,
+            show_time=datetime(2025, 9, 1, 19) + timedelta(days=index),
+        )
+        for index, play in enumerate(create_plays(size))
+    )
+
+
+def create_tickets(performance, reservation, size):
+    Performance.add_tickets_sold({performance.id: size})
+    return Ticket.objects.bulk_create(
+        Ticket(
+            performance=performance,
+            reservation=reservation,
+            row=index // performance.theatre_hall.seats_in_row + 1,
+            seat=index % performance.theatre_hall.seats_in_row + 1,
+        )
+        for index in range(size)
+    )
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every endpoint is hit twice with differently sized datasets; the number
+    of queries must not depend on the dataset size and must stay within the
+    query_budget declared by the view.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    def assertQueriesFlat(self, method, seed, budgeted=True):
+        counts = []
+        for size in SIZES:
+            for cache in caches.all():
+                cache.clear()
+            savepoint = transaction.savepoint()
+            url, data = seed(size)
+            with CaptureQueriesContext(connection) as queries:
+                res = getattr(self.client, method)(url, data, format="json")
+            transaction.savepoint_rollback(savepoint)
+            self.assertLess(res.status_code, 400, res.content)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[-1], f"{method} {url}: {counts}")
+        if budgeted:
+            budget = get_query_budget(resolve(urlparse(url).path).func, method)
+            self.assertIsNotNone(budget, f"{method} {url} declares no budget")
+            self.assertLessEqual(counts[-1], budget, f"{method} {url}")
+
+    def test_catalogue_endpoints(self):
+        self.authenticate(self.admin)
+        for name, model, payload, make in [
+            ("genre", Genre, {"name": "New"}, lambda i: Genre(name=f"Genre {i}")),
+            (
+                "actor",
+                Actor,
+                {"first_name": "New", "last_name": "Actor"},
+                lambda i: Actor(first_name="Actor", last_name=str(i)),
+            ),
+            (
+                "theatrehall",
+                TheatreHall,
+                {"name": "New", "rows": 5, "seats_in_row": 5},
+                lambda i: TheatreHall(name=f"Hall {i}", rows=5, seats_in_row=5),
+            ),
+        ]:
+            url = reverse(f"theatre:{name}-list")
+
+            def seed(size, payload=payload, url=url, model=model, make=make):
+                model.objects.bulk_create(make(i) for i in range(size))
+                return url, payload
+
+            def seed_bulk(size, payload=payload, url=url):
+                return url, [
+                    {
+                        key: f"{value} {i}" if isinstance(value, str) else value
+                        for key, value in payload.items()
+                    }
+                    for i in range(size)
+                ]
+
+            with self.subTest(name):
+                self.assertQueriesFlat("get", seed)
+                self.assertQueriesFlat("post", seed)
+                self.assertQueriesFlat("post", seed_bulk)
+
+    def test_play_endpoints(self):
+        self.authenticate(self.user)
+
+        def seed_list(size):
+            create_plays(size)
+            return reverse("theatre:play-list"), None
+
+        def seed_detail(size):
+            play = create_plays(size)[0]
+            return reverse("theatre:play-detail", args=[play.id]), None
+
+        self.assertQueriesFlat("get", seed_list)
+        self.assertQueriesFlat("get", seed_detail)
+
+        self.authenticate(self.admin)
+
+        def seed_create(size):
+            create_plays(size)
+            return reverse("theatre:play-list"), {
+                "title": "New",
+                "description": "New play",
+                "genres": list(Genre.objects.values_list("id", flat=True)),
+                "actors": list(Actor.objects.values_list("id", flat=True)),
+            }
+
+        self.assertQueriesFlat("post", seed_create)
+
+    def test_performance_endpoints(self):
+        self.authenticate(self.user)
+
+        def seed_list(size):
+            performances = create_performances(size)
+            reservation = Reservation.objects.create(user=self.user)
+            for performance in performances:
+                create_tickets(performance, reservation, 3)
+            return reverse("theatre:performance-list"), None
+
+        def seed_performance(size):
+            performance = create_performances(size)[0]
+            reservation = Reservation.objects.create(user=self.user)
+            create_tickets(performance, reservation, size)
+            return performance
+
+        self.assertQueriesFlat("get", seed_list)
+        self.assertQueriesFlat(
+            "get",
+            lambda size: (
+                reverse("theatre:performance-detail", args=[seed_performance(size).id]),
+                None,
+            ),
+        )
+        self.assertQueriesFlat(
+            "get",
+            lambda size: (
+                reverse("theatre:performance-detail", args=[seed_performance(size).id]),
+                {"fields": "id,play,taken_places", "expand": ""},
+            ),
+        )
+        self.assertQueriesFlat(
+            "get",
+            lambda size: (
+                reverse(
+                    "theatre:performance-seat-map", args=[seed_performance(size).id]
+                ),
+                None,
+            ),
+        )
+
+        self.authenticate(self.admin)
+
+        def seed_write(size):
+            performance = seed_performance(size)
+            return reverse("theatre:performance-detail", args=[performance.id]), {
+                "show_time": "2025-10-01T19:00:00",
+                "play": performance.play_id,
+                "theatre_hall": performance.theatre_hall_id,
+            }
+
+        def seed_create(size):
+            url, data = seed_write(size)
+            return reverse("theatre:performance-list"), data
+
+        self.assertQueriesFlat("post", seed_create)
+        self.assertQueriesFlat("put", seed_write)
+        self.assertQueriesFlat("patch", seed_write)
+        self.assertQueriesFlat("delete", seed_write)
+
+        def seed_schedule(size):
+            performance = seed_performance(size)
+            return reverse("theatre:performance-schedule"), {
+                "play": performance.play_id,
+                "theatre_hall": performance.theatre_hall_id,
+                "start_date": "2026-01-01",
+                "end_date": f"2026-01-{size:02}",
+                "times": ["19:00"],
+            }
+
+        self.assertQueriesFlat("post", seed_schedule)
+
+    def test_analytics_endpoints(self):
+        self.authenticate(self.admin)
+
+        for report in ("performances", "plays", "theatre-halls", "days", "sales"):
+
+            def seed(size, report=report):
+                performances = create_performances(size)
+                reservation = Reservation.objects.create(user=self.user)
+                for performance in performances:
+                    create_tickets(performance, reservation, size)
+                    DailySales.record(reservation.created_at, {performance.id: size})
+                return reverse(f"theatre:analytics-{report}"), None
+
+            with self.subTest(report):
+                self.assertQueriesFlat("get", seed)
+
+    def test_async_read_endpoints(self):
+        self.authenticate(self.user)
+
+        def seed_plays(size):
+            create_plays(size)
+            return reverse("theatre:async-play-list"), None
+
+        def seed_play(size):
+            play = create_plays(size)[0]
+            return reverse("theatre:async-play-detail", args=[play.id]), None
+
+        def seed_performances(size):
+            create_performances(size)
+            return reverse("theatre:async-performance-list"), None
+
+        def seed_performance(name):
+            def seed(size):
+                performance = create_performances(size)[0]
+                reservation = Reservation.objects.create(user=self.user)
+                create_tickets(performance, reservation, size)
+                return reverse(name, args=[performance.id]), None
+
+            return seed
+
+        for seed in [
+            seed_plays,
+            seed_play,
+            seed_performances,
+            seed_performance("theatre:async-performance-detail"),
+            seed_performance("theatre:async-performance-seat-map"),
+        ]:
+            self.assertQueriesFlat("get", seed)
+
+    def test_reservation_endpoints(self):
+        self.authenticate(self.user)
+
+        def seed_list(size):
+            for performance in create_performances(size):
+                reservation = Reservation.objects.create(user=self.user)
+                create_tickets(performance, reservation, 2)
+            return reverse("theatre:reservation-list"), None
+
+        def seed_sparse_list(size):
+            url, _ = seed_list(size)
+            return url, {"fields": "id,tickets.performance.show_time"}
+
+        def seed_create(size):
+            performance = create_performances(1)[0]
+            return reverse("theatre:reservation-list"), {
+                "tickets": [
+                    {"row": 1, "seat": seat, "performance": performance.id}
+                    for seat in range(1, size + 1)
+                ]
+            }
+
+        def seed_destroy(size):
+            reservation = Reservation.objects.create(user=self.user)
+            for performance in create_performances(size):
+                create_tickets(performance, reservation, size)
+            return reverse("theatre:reservation-detail", args=[reservation.id]), None
+
+        self.assertQueriesFlat("get", seed_list)
+        self.assertQueriesFlat("get", seed_sparse_list)
+        self.assertQueriesFlat("post", seed_create)
+        self.assertQueriesFlat("delete", seed_destroy)
+
+    def test_seat_hold_endpoints(self):
+        self.authenticate(self.user)
+
+        def create_hold(performance, size):
+            hold = SeatHold.objects.create(
+                performance=performance,
+                user=self.user,
+                expires_at=timezone.now() + timedelta(minutes=10),
+            )
+            HeldSeat.objects.bulk_create(
+                HeldSeat(hold=hold, performance=performance, row=1, seat=seat)
+                for seat in range(1, size + 1)
+            )
+            return hold
+
+        def seed_list(size):
+            for performance in create_performances(size):
+                create_hold(performance, size)
+            return reverse("theatre:seathold-list"), None
+
+        def seed_hold(size):
+            hold = create_hold(create_performances(1)[0], size)
+            return reverse("theatre:seathold-detail", args=[hold.id]), None
+
+        def seed_create(size):
+            performance = create_performances(1)[0]
+            create_hold(performance, size)
+            return reverse("theatre:seathold-list"), {
+                "performance": performance.id,
+                "seats": [{"row": 2, "seat": seat} for seat in range(1, size + 1)],
+            }
+
+        def seed_confirm(size):
+            hold = create_hold(create_performances(1)[0], size)
+            return reverse("theatre:seathold-confirm", args=[hold.id]), None
+
+        self.assertQueriesFlat("get", seed_list)
+        self.assertQueriesFlat("get", seed_hold)
+        self.assertQueriesFlat("post", seed_create)
+        self.assertQueriesFlat("delete", seed_hold)
+        self.assertQueriesFlat("post", seed_confirm)
+
+    def test_user_endpoints(self):
+        def seed_users(size):
+            get_user_model().objects.bulk_create(
+                get_user_model()(email=f"other{i}@test.com") for i in range(size)
+            )
+
+        def seed_register(size):
+            seed_users(size)
+            return reverse("user:create"), {
+                "email": "new@test.com",
+                "password": "newpass",
+            }
+
+        def seed_token(size):
+            seed_users(size)
+            return reverse("user:token_obtain_pair"), {
+                "email": "user@test.com",
+                "password": "testpass",
+            }
+
+        def seed_refresh(size):
+            seed_users(size)
+            return reverse("user:token_refresh"), {
+                "refresh": str(RefreshToken.for_user(self.user))
+            }
+
+        def seed_verify(size):
+            seed_users(size)
+            return reverse("user:token_verify"), {
+                "token": str(AccessToken.for_user(self.user))
+            }
+
+        def seed_me(size):
+            seed_users(size)
+            return reverse("user:manage"), {
+                "email": "user@test.com",
+                "password": "newpass",
+            }
+
+        self.assertQueriesFlat("post", seed_register)
+        self.assertQueriesFlat("post", seed_token, budgeted=False)
+        self.assertQueriesFlat("post", seed_refresh, budgeted=False)
+        self.assertQueriesFlat("post", seed_verify, budgeted=False)
+
+        self.authenticate(self.user)
+        self.assertQueriesFlat("get", seed_me)
+        self.assertQueriesFlat("put", seed_me)
+        self.assertQueriesFlat("patch", seed_me)
+
+
+@override_settings(DEBUG=True)
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self):
+        caches[CATALOGUE_CACHE].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "testpass")
+        )
+
+    def test_reports_query_count(self):
+        res = self.client.get(reverse("theatre:genre-list"))
+
+        self.assertEqual(res["X-Query-Count"], "2")
+        self.assertNotIn("X-Query-Budget-Exceeded", res)
+
+    def test_flags_exceeded_budget(self):
+        with mock.patch.dict(GenreViewSet.query_budget, {"list": 0}):
+            with self.assertLogs("theatre.query_budget", "WARNING"):
+                res = self.client.get(reverse("theatre:genre-list"))
+
+        self.assertEqual(res["X-Query-Budget-Exceeded"], "2/0")
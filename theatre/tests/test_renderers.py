@@ -0,0 +1,96 @@
+from datetime import datetime
+from decimal import Decimal
+from io import BytesIO
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, TheatreHall
+from theatre.parsers import MessagePackParser, ORJSONParser
+from theatre.renderers import ORJSONRenderer
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class RendererTests(TestCase):
+    def test_json_matches_drf(self):
+        data = {
+            "id": 1,
+            "title": "Hamlet   Гамлет",
+            "price": Decimal("12.50"),
+            "errors": [ErrorDetail("Invalid.", code="invalid")],
+            "label": gettext_lazy("Reservation"),
+            "nested": {"seats": [(1, 2), (1, 3)], "empty": None},
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_json_uses_stdlib(self):
+        data = {"id": 1, "seats": [1, 2]}
+        media_type = "application/json; indent=4"
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_parse_errors(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"id": NaN}'))
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+
+class MessagePackApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(name="Main", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Hamlet", description="Prince")
+        self.performance = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 9, 1, 19, 0)),
+        )
+
+    def test_accept_msgpack(self):
+        url = reverse("theatre:performance-detail", args=[self.performance.id])
+        res = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content), self.client.get(url).json())
+
+    def test_msgpack_request_body(self):
+        payload = {
+            "tickets": [{"row": 1, "seat": 2, "performance": self.performance.id}]
+        }
+        res = self.client.post(
+            RESERVATION_URL,
+            msgpack.packb(payload),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        ticket = msgpack.unpackb(res.content)["tickets"][0]
+        self.assertEqual(
+            (ticket["row"], ticket["seat"], ticket["performance"]),
+            (1, 2, self.performance.id),
+        )
+
+    def test_malformed_msgpack_body(self):
+        res = self.client.post(
+            RESERVATION_URL, b"\xc1", content_type="application/msgpack"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
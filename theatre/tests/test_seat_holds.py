@@ -0,0 +1,259 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    HeldSeat,
+    Performance,
+    Play,
+    Reservation,
+    SeatHold,
+    TheatreHall,
+    Ticket,
+)
+
+SEAT_HOLD_URL = reverse("theatre:seathold-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def confirm_url(hold_id):
+    return reverse("theatre:seathold-confirm", args=[hold_id])
+
+
+def performance_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class SeatHoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.other = get_user_model().objects.create_user("other@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(name="Hall", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Play", description="Description")
+        self.performance = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=make_aware(datetime(2025, 8, 1, 19, 0)),
+        )
+
+    def hold(self, user, *seats, expires_in=timedelta(minutes=10)):
+        hold = SeatHold.objects.create(
+            performance=self.performance,
+            user=user,
+            expires_at=timezone.now() + expires_in,
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(hold=hold, performance=self.performance, row=row, seat=seat)
+            for row, seat in seats
+        )
+        return hold
+
+    def test_create_hold(self):
+        res = self.client.post(
+            SEAT_HOLD_URL,
+            {
+                "performance": self.performance.id,
+                "seats": [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        hold = SeatHold.objects.get(pk=res.data["id"])
+        self.assertEqual(hold.user, self.user)
+        self.assertEqual(hold.seats.count(), 2)
+        self.assertGreater(hold.expires_at, timezone.now())
+
+    def test_cannot_hold_held_or_taken_seats(self):
+        self.hold(self.other, (1, 1))
+        reservation = Reservation.objects.create(user=self.other)
+        Ticket.objects.create(
+            performance=self.performance, reservation=reservation, row=1, seat=2
+        )
+
+        res = self.client.post(
+            SEAT_HOLD_URL,
+            {
+                "performance": self.performance.id,
+                "seats": [
+                    {"row": 1, "seat": 1},
+                    {"row": 1, "seat": 2},
+                    {"row": 1, "seat": 3},
+                    {"row": 9, "seat": 1},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data["seats"]
+        self.assertEqual(
+            errors[0], {"non_field_errors": ["This seat is already held."]}
+        )
+        self.assertEqual(
+            errors[1], {"non_field_errors": ["This seat is already taken."]}
+        )
+        self.assertEqual(errors[2], {})
+        self.assertIn("row", errors[3])
+
+    @override_settings(SEAT_HOLD_MAX_ACTIVE=2)
+    def test_active_hold_limit(self):
+        self.hold(self.user, (1, 1))
+        self.hold(self.user, (1, 2), expires_in=timedelta(minutes=-1))
+        payload = {"performance": self.performance.id, "seats": [{"row": 2, "seat": 1}]}
+
+        first = self.client.post(SEAT_HOLD_URL, payload, format="json")
+        payload["seats"] = [{"row": 2, "seat": 2}]
+        second = self.client.post(SEAT_HOLD_URL, payload, format="json")
+
+        # The expired hold does not count.
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(second.data["detail"].code, "too_many_holds")
+
+    def test_hold_seat_limit(self):
+        seats = [
+            {"row": row, "seat": seat} for row in range(1, 6) for seat in range(1, 6)
+        ]
+
+        res = self.client.post(
+            SEAT_HOLD_URL,
+            {"performance": self.performance.id, "seats": seats},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", res.data)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_expired_hold_does_not_block_seats(self):
+        self.hold(self.other, (1, 1), expires_in=timedelta(minutes=-1))
+
+        res = self.client.post(
+            SEAT_HOLD_URL,
+            {"performance": self.performance.id, "seats": [{"row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        self.assertEqual(HeldSeat.objects.filter(hold__user=self.other).count(), 0)
+
+    def test_availability_accounts_for_active_holds(self):
+        self.hold(self.other, (1, 1), (1, 2))
+        self.hold(self.other, (2, 1), expires_in=timedelta(minutes=-1))
+
+        performance = Performance.objects.with_tickets_available().get()
+        res = self.client.get(performance_url(self.performance.id))
+
+        self.assertEqual(performance.tickets_available, 23)
+        self.assertEqual(
+            res.data["held_places"], [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]
+        )
+
+    def test_expiry_changes_etag(self):
+        hold = self.hold(self.other, (1, 1))
+        url = performance_url(self.performance.id)
+        etag = self.client.get(url)["ETag"]
+        # Lapsed but not swept yet, so the version has not moved.
+        SeatHold.objects.filter(pk=hold.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["held_places"], [])
+
+    def test_reservation_rejects_seats_held_by_others(self):
+        self.hold(self.other, (1, 1))
+
+        res = self.client.post(
+            RESERVATION_URL,
+            {"tickets": [{"row": 1, "seat": 1, "performance": self.performance.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["tickets"][0],
+            {"non_field_errors": ["This seat is held by another customer."]},
+        )
+
+    def test_reservation_releases_own_held_seats(self):
+        self.hold(self.user, (1, 1))
+
+        res = self.client.post(
+            RESERVATION_URL,
+            {"tickets": [{"row": 1, "seat": 1, "performance": self.performance.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED, res.data)
+        self.assertFalse(HeldSeat.objects.exists())
+
+    def test_confirm_hold(self):
+        hold = self.hold(self.user, (1, 1), (1, 2))
+
+        res = self.client.post(confirm_url(hold.id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+        reservation = Reservation.objects.get(pk=res.data["id"])
+        self.assertEqual(
+            list(reservation.tickets.values_list("row", "seat")), [(1, 1), (1, 2)]
+        )
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+    def test_confirm_expired_hold(self):
+        hold = self.hold(self.user, (1, 1), expires_in=timedelta(minutes=-1))
+
+        res = self.client.post(confirm_url(hold.id))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_cannot_access_other_users_holds(self):
+        hold = self.hold(self.other, (1, 1))
+
+        res = self.client.post(confirm_url(hold.id))
+        listed = self.client.get(SEAT_HOLD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(listed.data["results"], [])
+
+    def test_release_hold(self):
+        hold = self.hold(self.user, (1, 1))
+        version = self.performance.version
+
+        res = self.client.delete(reverse("theatre:seathold-detail", args=[hold.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(HeldSeat.objects.exists())
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.version, version + 1)
+
+    def test_release_expired_holds_command(self):
+        active = self.hold(self.user, (1, 1))
+        self.hold(self.other, (1, 2), expires_in=timedelta(minutes=-1))
+        self.hold(self.other, (1, 3), expires_in=timedelta(minutes=-1))
+        version = self.performance.version
+        out = StringIO()
+
+        call_command("release_expired_holds", stdout=out)
+
+        self.assertIn("Released 2 expired hold(s).", out.getvalue())
+        self.assertEqual(list(SeatHold.objects.all()), [active])
+        self.assertEqual(HeldSeat.objects.count(), 1)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.version, version + 1)
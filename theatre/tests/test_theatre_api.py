@@ -1,5 +1,13 @@
+import base64
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework.test import APIClient
@@ -7,6 +15,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.utils.timezone import make_aware
 from datetime import datetime, timedelta
+from unittest import skipUnless
 from django.urls import reverse
 from theatre.models import (
     Play,
@@ -16,16 +25,22 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    DailySales,
 )
 from theatre.serializers import (
     PlayListSerializer,
     PlayDetailSerializer,
     PerformanceListSerializer,
 )
+from theatre.views import ReservationViewSet
 
 PLAY_URL = reverse("theatre:play-list")
 PERFORMANCE_URL = reverse("theatre:performance-list")
 RESERVATION_URL = reverse("theatre:reservation-list")
+SCHEDULE_URL = reverse("theatre:performance-schedule")
+GENRE_URL = reverse("theatre:genre-list")
+ACTOR_URL = reverse("theatre:actor-list")
+THEATRE_HALL_URL = reverse("theatre:theatrehall-list")
 
 
 def sample_play(**params):
@@ -95,7 +110,7 @@ class PrivatePlayTests(TestCase):
         plays = Play.objects.order_by("id")
         serializer = PlayListSerializer(plays, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_plays_by_genres(self):
         genre1 = sample_genre(name="Drama")
@@ -112,9 +127,9 @@ class PrivatePlayTests(TestCase):
         serializer2 = PlayListSerializer(play2)
         serializer3 = PlayListSerializer(play3)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
 
     def test_filter_plays_by_actors(self):
         actor1 = sample_actor(first_name="Actor1", last_name="Last1")
@@ -134,9 +149,9 @@ class PrivatePlayTests(TestCase):
         serializer2 = PlayListSerializer(play2)
         serializer3 = PlayListSerializer(play3)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
 
     def test_filter_plays_by_title(self):
         play1 = sample_play(title="Hamlet")
@@ -149,9 +164,41 @@ class PrivatePlayTests(TestCase):
         serializer2 = PlayListSerializer(play2)
         serializer3 = PlayListSerializer(play3)
 
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer1.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
+
+    def test_search_plays_in_title_and_description(self):
+        hamlet = sample_play(title="Hamlet", description="Prince of Denmark")
+        macbeth = sample_play(title="Macbeth", description="A Scottish king")
+        sample_play(title="Othello", description="The Moor of Venice")
+
+        by_title = self.client.get(PLAY_URL, {"search": "hamlet"})
+        by_description = self.client.get(PLAY_URL, {"search": "scottish"})
+
+        self.assertEqual([p["id"] for p in by_title.data["results"]], [hamlet.id])
+        self.assertEqual(
+            [p["id"] for p in by_description.data["results"]], [macbeth.id]
+        )
+
+    def test_list_plays_cursor_pagination(self):
+        for title in ["Othello", "Hamlet", "Hamlet", "Macbeth", "Hamlet"]:
+            sample_play(title=title)
+
+        pages = []
+        url = f"{PLAY_URL}?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            pages.append([play["id"] for play in res.data["results"]])
+            url = res.data["next"]
+
+        self.assertEqual(
+            sum(pages, []),
+            list(Play.objects.order_by("title", "id").values_list("id", flat=True)),
+        )
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
 
     def test_retrieve_play_detail(self):
         play = sample_play()
@@ -174,6 +221,32 @@ class PrivatePlayTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
 
 
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL full-text search")
+class PostgresPlaySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def test_search_tolerates_typos_in_title(self):
+        hamlet = sample_play(title="Hamlet", description="Prince of Denmark")
+        sample_play(title="Macbeth", description="A Scottish king")
+
+        res = self.client.get(PLAY_URL, {"search": "Hamlett"})
+
+        self.assertEqual([p["id"] for p in res.data["results"]], [hamlet.id])
+
+    def test_search_ranks_title_matches_first(self):
+        mention = sample_play(title="Rosencrantz", description="Friends of Hamlet")
+        hamlet = sample_play(title="Hamlet", description="Prince of Denmark")
+
+        res = self.client.get(PLAY_URL, {"search": "hamlet"})
+
+        self.assertEqual(
+            [p["id"] for p in res.data["results"]], [hamlet.id, mention.id]
+        )
+
+
 class AdminPlayTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -281,7 +354,7 @@ class PerformanceTests(APITestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        res_data_sorted = sorted(res.data, key=lambda x: x["id"])
+        res_data_sorted = sorted(res.data["results"], key=lambda x: x["id"])
         serializer_data_sorted = sorted(serializer.data, key=lambda x: x["id"])
 
         for res_item, ser_item in zip(res_data_sorted, serializer_data_sorted):
@@ -290,6 +363,118 @@ class PerformanceTests(APITestCase):
             ser_copy = {k: v for k, v in ser_item.items() if k != "tickets_available"}
             self.assertEqual(res_copy, ser_copy)
 
+    def test_filter_performances_by_date(self):
+        res = self.client.get(PERFORMANCE_URL, {"date": "2025-08-02"})
+
+        self.assertEqual([p["id"] for p in res.data["results"]], [self.performance2.id])
+
+    def test_filter_performances_by_range(self):
+        late = sample_performance(show_time=make_aware(datetime(2025, 8, 3, 19, 0)))
+
+        from_day = self.client.get(PERFORMANCE_URL, {"from": "2025-08-02"})
+        to_day = self.client.get(PERFORMANCE_URL, {"to": "2025-08-02"})
+        to_time = self.client.get(
+            PERFORMANCE_URL, {"from": "2025-08-01", "to": "2025-08-02T20:00:00"}
+        )
+
+        self.assertEqual(
+            [p["id"] for p in from_day.data["results"]],
+            [late.id, self.performance2.id],
+        )
+        self.assertEqual(
+            [p["id"] for p in to_day.data["results"]],
+            [self.performance2.id, self.performance.id],
+        )
+        self.assertEqual(
+            [p["id"] for p in to_time.data["results"]], [self.performance.id]
+        )
+
+    def test_filter_performances_invalid_date(self):
+        res = self.client.get(PERFORMANCE_URL, {"from": "2025-13-01"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("from", res.data)
+
+
+class PerformanceShowTimeIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hall = sample_theatre_hall()
+        plays = [sample_play(title=f"Play {i}") for i in range(10)]
+        start = make_aware(datetime(2025, 1, 1, 19, 0))
+        Performance.objects.bulk_create(
+            Performance(
+                play=plays[i % len(plays)],
+                theatre_hall=hall,
+                show_time=start + timedelta(hours=6 * i),
+            )
+            for i in range(2000)
+        )
+        cls.play = plays[0]
+        cls.day = (
+            make_aware(datetime(2025, 3, 1)),
+            make_aware(datetime(2025, 3, 2)),
+        )
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if connection.vendor == "postgresql":
+                # A freshly seeded table is small enough for a sequential
+                # scan to look cheaper; this only checks an index can serve it.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def test_date_range_uses_show_time_index(self):
+        plan = self.explain(Performance.objects.show_time_between(*self.day))
+
+        self.assertIn("performance_show_time_idx", plan)
+
+    def test_play_and_date_range_uses_composite_index(self):
+        plan = self.explain(
+            Performance.objects.filter(play=self.play).show_time_between(*self.day)
+        )
+
+        self.assertIn("performance_play_time_idx", plan)
+
+
+class CursorIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        other = get_user_model().objects.create_user("other@test.com", "testpass")
+        Play.objects.bulk_create(
+            Play(title=f"Play {i:04}", description="") for i in range(2000)
+        )
+        Reservation.objects.bulk_create(
+            Reservation(user=cls.user if i % 10 == 0 else other) for i in range(2000)
+        )
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if connection.vendor == "postgresql":
+                # A freshly seeded table is small enough for a sequential
+                # scan to look cheaper; this only checks an index can serve it.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def test_play_pages_use_title_index(self):
+        plan = self.explain(
+            Play.objects.filter(title__gt="Play 1000").order_by("title", "id")[:21]
+        )
+
+        self.assertIn("play_title_id_idx", plan)
+
+    def test_reservation_pages_use_user_index(self):
+        plan = self.explain(
+            Reservation.objects.filter(user=self.user).order_by("-created_at", "id")[
+                :11
+            ]
+        )
+
+        self.assertIn("reservation_user_created_idx", plan)
+
 
 class ReservationTests(TestCase):
     def setUp(self):
@@ -344,6 +529,219 @@ class ReservationTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Row must be in range", str(res.data))
 
+    def test_create_reservation_reports_all_taken_seats(self):
+        Ticket.objects.create(
+            performance=self.performance_with_taken_seats,
+            reservation=Reservation.objects.create(user=self.user),
+            row=2,
+            seat=2,
+        )
+        payload = {
+            "tickets": [
+                {
+                    "row": 1,
+                    "seat": 1,
+                    "performance": self.performance_with_taken_seats.id,
+                },
+                {
+                    "row": 1,
+                    "seat": 2,
+                    "performance": self.performance_with_taken_seats.id,
+                },
+                {
+                    "row": 2,
+                    "seat": 2,
+                    "performance": self.performance_with_taken_seats.id,
+                },
+            ]
+        }
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data["tickets"]
+        self.assertIn("non_field_errors", errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("non_field_errors", errors[2])
+        self.assertEqual(self.performance_with_taken_seats.tickets.count(), 2)
+
+    def test_create_reservation_query_count_is_constant(self):
+        def post_seats(row, seats):
+            payload = {
+                "tickets": [
+                    {"row": row, "seat": seat, "performance": self.performance.id}
+                    for seat in range(1, seats + 1)
+                ]
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RESERVATION_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(post_seats(row=1, seats=2), post_seats(row=2, seats=10))
+
+
+class TicketsSoldCounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+
+    def reserve(self, *seats):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": self.performance.id}
+                for seat in seats
+            ]
+        }
+        return self.client.post(RESERVATION_URL, payload, format="json")
+
+    def test_reservation_updates_counter(self):
+        self.reserve(1, 2, 3)
+        res = self.reserve(4)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 4)
+
+        self.client.delete(reverse("theatre:reservation-detail", args=[res.data["id"]]))
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 3)
+
+    def test_cancelling_twice_releases_tickets_once(self):
+        res = self.reserve(1, 2)
+        stale = Reservation.objects.get(pk=res.data["id"])
+        self.client.delete(reverse("theatre:reservation-detail", args=[stale.id]))
+
+        # A concurrent DELETE that read the reservation before it was gone.
+        ReservationViewSet().perform_destroy(stale)
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 0)
+        self.assertEqual(
+            DailySales.objects.aggregate(total=Sum("tickets_sold"))["total"], 0
+        )
+
+    def test_list_reads_counter(self):
+        self.reserve(1, 2)
+        res = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(res.data["results"][0]["tickets_available"], 10 * 15 - 2)
+
+    def test_sync_tickets_sold_command(self):
+        self.reserve(1, 2)
+        Performance.objects.update(tickets_sold=7)
+
+        with self.assertRaises(CommandError):
+            call_command("sync_tickets_sold", "--check", stdout=StringIO())
+        call_command("sync_tickets_sold", stdout=StringIO())
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+
+class SeatMapTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance(
+            theatre_hall=sample_theatre_hall(rows=2, seats_in_row=5)
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        for row, seat in [(1, 1), (2, 2), (2, 5)]:
+            Ticket.objects.create(
+                performance=self.performance,
+                reservation=reservation,
+                row=row,
+                seat=seat,
+            )
+        self.url = reverse("theatre:performance-seat-map", args=[self.performance.id])
+
+    def test_seat_map_base64(self):
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 2)
+        self.assertEqual(res.data["seats_in_row"], 5)
+        self.assertEqual(base64.b64decode(res.data["seat_map"]), b"\x82\x40")
+
+    def test_seat_map_binary(self):
+        res = self.client.get(self.url, HTTP_ACCEPT="application/octet-stream")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/octet-stream")
+        self.assertEqual(res.content, b"\x82\x40")
+
+    def test_seat_map_binary_errors_are_json(self):
+        url = reverse("theatre:performance-seat-map", args=[0])
+
+        res = self.client.get(url, HTTP_ACCEPT="application/octet-stream")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertIn("detail", res.json())
+
+
+class PerformanceETagTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+        self.url = reverse("theatre:performance-detail", args=[self.performance.id])
+
+    def test_not_modified_without_loading_tickets(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        # The throttle and the version lookup.
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_reservation_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(
+            RESERVATION_URL,
+            {"tickets": [{"row": 1, "seat": 1, "performance": self.performance.id}]},
+            format="json",
+        )
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+
+    def assertEditChangesETag(self, edit):
+        etag = self.client.get(self.url)["ETag"]
+        edit()
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_play_and_hall_edits_change_etag(self):
+        play = self.performance.play
+        genre = Genre.objects.create(name="Drama")
+
+        self.assertEditChangesETag(play.save)
+        self.assertEditChangesETag(lambda: play.genres.add(genre))
+        self.assertEditChangesETag(genre.save)
+        self.assertEditChangesETag(genre.plays.clear)
+        self.assertEditChangesETag(self.performance.theatre_hall.save)
+
+    def test_seat_map_etag_depends_on_representation(self):
+        url = reverse("theatre:performance-seat-map", args=[self.performance.id])
+        json_etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(
+            url, HTTP_ACCEPT="application/octet-stream", HTTP_IF_NONE_MATCH=json_etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], json_etag)
+
 
 class AdminPerformanceTests(TestCase):
     def setUp(self):
@@ -367,3 +765,168 @@ class AdminPerformanceTests(TestCase):
         performance = Performance.objects.get(id=res.data["id"])
         self.assertEqual(performance.play, play)
         self.assertEqual(performance.theatre_hall, theatre_hall)
+
+
+class PerformanceScheduleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.play = sample_play()
+        self.theatre_hall = sample_theatre_hall()
+        self.payload = {
+            "play": self.play.id,
+            "theatre_hall": self.theatre_hall.id,
+            "start_date": "2025-09-01",
+            "end_date": "2025-09-28",
+            "weekdays": ["FR", "SA"],
+            "times": ["14:00", "19:30"],
+        }
+
+    def show_times(self):
+        return [
+            show_time.strftime("%m-%d %H:%M")
+            for show_time in Performance.objects.order_by("show_time").values_list(
+                "show_time", flat=True
+            )
+        ]
+
+    def test_schedule_run(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 16)
+        self.assertEqual(
+            self.show_times()[:4],
+            ["09-05 14:00", "09-05 19:30", "09-06 14:00", "09-06 19:30"],
+        )
+        self.assertLessEqual(len(queries), 8)
+        # The hall is locked while the run is checked and inserted.
+        self.assertTrue(
+            any(
+                TheatreHall._meta.db_table in query["sql"]
+                and "FOR UPDATE" in query["sql"]
+                for query in queries
+            )
+        )
+
+    def test_interval(self):
+        self.payload.update(weekdays=["MO"], times=["19:00"], interval=2)
+
+        self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(self.show_times(), ["09-01 19:00", "09-15 19:00"])
+
+    def test_hall_conflict_rejects_the_run(self):
+        sample_performance(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=make_aware(datetime(2025, 9, 13, 21, 0)),
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data["theatre_hall"]), 1)
+        self.assertIn("2025-09-13T19:30:00", res.data["theatre_hall"][0])
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_overlapping_times_are_rejected(self):
+        self.payload["times"] = ["19:00", "20:00"]
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Performance.objects.exists())
+
+    def test_invalid_range(self):
+        self.payload["end_date"] = "2025-08-01"
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("end_date", res.data)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "testpass")
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@test.com", "testpass", is_staff=True
+            )
+        )
+
+    def test_create_genres(self):
+        sample_genre("Drama")
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                GENRE_URL, [{"name": "Comedy"}, {"name": "Opera"}], format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([genre["name"] for genre in res.data], ["Comedy", "Opera"])
+        self.assertTrue(all(genre["id"] for genre in res.data))
+        self.assertEqual(Genre.objects.count(), 3)
+        self.assertLessEqual(len(queries), 4)
+
+    def test_errors_are_reported_per_item(self):
+        sample_genre("Drama")
+
+        res = self.client.post(
+            GENRE_URL,
+            [{"name": "Comedy"}, {"name": "Drama"}, {"name": "Comedy"}],
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertEqual(res.data[1]["name"], ["genre with this name already exists."])
+        self.assertEqual(
+            res.data[2]["name"], ["This value is repeated in the request."]
+        )
+        self.assertEqual(Genre.objects.count(), 1)
+
+    def test_field_errors_are_reported_per_item(self):
+        res = self.client.post(
+            ACTOR_URL,
+            [{"first_name": "Anna", "last_name": "Smith"}, {"first_name": "Tom"}],
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("last_name", res.data[1])
+        self.assertFalse(Actor.objects.exists())
+
+    def test_create_halls_invalidates_cache(self):
+        self.client.get(THEATRE_HALL_URL)
+
+        self.client.post(
+            THEATRE_HALL_URL,
+            [{"name": "Main", "rows": 10, "seats_in_row": 20}],
+            format="json",
+        )
+        res = self.client.get(THEATRE_HALL_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual([hall["capacity"] for hall in res.data], [200])
+
+    def test_single_object_still_accepted(self):
+        res = self.client.post(GENRE_URL, {"name": "Drama"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["name"], "Drama")
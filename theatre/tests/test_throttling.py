@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from theatre.models import ThrottleBucket
+
+GENRE_URL = reverse("theatre:genre-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+RATES = {"anon": "2/minute", "user": "3/minute", "bookings": "1/minute"}
+
+
+class ThrottleBucketTests(TestCase):
+    def test_burst_then_sustained_rate(self):
+        # 3/minute: three at once, then one every 20 seconds.
+        results = [ThrottleBucket.consume("key", 1000, 20, 60)[0] for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertFalse(ThrottleBucket.consume("key", 1019, 20, 60)[0])
+        self.assertTrue(ThrottleBucket.consume("key", 1020, 20, 60)[0])
+        self.assertEqual(ThrottleBucket.objects.count(), 1)
+
+    def test_refused_requests_do_not_drain_the_bucket(self):
+        for _ in range(10):
+            ThrottleBucket.consume("key", 1000, 20, 60)
+
+        allowed, tat = ThrottleBucket.consume("key", 1000, 20, 60)
+
+        self.assertFalse(allowed)
+        self.assertEqual(tat, 1060)
+
+    def test_purge_removes_only_full_buckets(self):
+        ThrottleBucket.objects.create(key="full", tat=0)
+        ThrottleBucket.objects.create(key="draining", tat=10**12)
+
+        call_command("purge_throttle_buckets", stdout=mock.Mock())
+
+        self.assertEqual(
+            list(ThrottleBucket.objects.values_list("key", flat=True)), ["draining"]
+        )
+
+
+class ThrottleApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        # The rates are read from the settings once, at import time.
+        patcher = mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", RATES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_user_rate(self):
+        statuses = [self.client.get(GENRE_URL).status_code for _ in range(4)]
+
+        self.assertEqual(statuses[:3], [status.HTTP_200_OK] * 3)
+        self.assertEqual(statuses[3], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_retry_after(self):
+        with mock.patch("theatre.throttling.BucketRateThrottle.timer", return_value=0):
+            for _ in range(3):
+                self.client.get(GENRE_URL)
+            res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res["Retry-After"], "20")
+
+    def test_scoped_rate_applies_to_reservation_writes_only(self):
+        payload = {"tickets": []}
+
+        first = self.client.post(RESERVATION_URL, payload, format="json")
+        second = self.client.post(RESERVATION_URL, payload, format="json")
+        listing = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(listing.status_code, status.HTTP_200_OK)
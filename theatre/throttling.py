@@ -0,0 +1,84 @@
+import hashlib
+
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+from theatre.models import ThrottleBucket
+
+MAX_KEY_LENGTH = ThrottleBucket._meta.get_field("key").max_length
+
+
+class BucketRateThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle keeping its state in the ThrottleBucket table instead
+    of a per-process cache: a rate of N/period lets N requests through at
+    once and then one every period/N seconds, with O(1) state per key.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        if len(self.key) > MAX_KEY_LENGTH:
+            self.key = hashlib.sha256(self.key.encode()).hexdigest()
+
+        self.now = self.timer()
+        allowed, self.tat = ThrottleBucket.consume(
+            self.key, self.now, self.interval, self.duration
+        )
+        return allowed
+
+    @property
+    def interval(self):
+        return self.duration / self.num_requests
+
+    def wait(self):
+        return max(0, self.tat + self.interval - self.now - self.duration)
+
+
+class AnonBucketThrottle(BucketRateThrottle, AnonRateThrottle):
+    pass
+
+
+class UserBucketThrottle(BucketRateThrottle, UserRateThrottle):
+    pass
+
+
+class ScopedBucketThrottle(BucketRateThrottle):
+    """
+    Limits the views that declare a ``throttle_scope``, on top of the anon
+    and user rates. Like ``query_budget`` the scope may be a dict keyed by
+    viewset action or lowercase HTTP method, e.g. ``{"create": "bookings"}``
+    to throttle only the writes of a viewset.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # The rate depends on the view, so it is looked up per request.
+        pass
+
+    def allow_request(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if isinstance(scope, dict):
+            scope = scope.get(getattr(view, "action", None) or request.method.lower())
+        if not scope:
+            return True
+
+        self.scope = scope
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
@@ -1,6 +1,13 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from theatre.async_views import (
+    PlayListView,
+    PlayDetailView,
+    PerformanceListView,
+    PerformanceDetailView,
+    PerformanceSeatMapView,
+)
 from theatre.views import (
     GenreViewSet,
     ActorViewSet,
@@ -8,6 +15,10 @@ from theatre.views import (
     PlayViewSet,
     PerformanceViewSet,
     ReservationViewSet,
+    SeatHoldViewSet,
+    CatalogueCacheStatsView,
+    AnalyticsViewSet,
+    ExportView,
 )
 
 router = routers.DefaultRouter()
@@ -17,7 +28,30 @@ router.register("theatre_halls", TheatreHallViewSet)
 router.register("plays", PlayViewSet)
 router.register("performances", PerformanceViewSet)
 router.register("reservations", ReservationViewSet)
+router.register("seat_holds", SeatHoldViewSet)
+router.register("analytics", AnalyticsViewSet, basename="analytics")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("cache_stats/", CatalogueCacheStatsView.as_view(), name="cache-stats"),
+    path("exports/<slug:kind>.<slug:file_format>", ExportView.as_view(), name="export"),
+    path("async/plays/", PlayListView.as_view(), name="async-play-list"),
+    path("async/plays/<int:pk>/", PlayDetailView.as_view(), name="async-play-detail"),
+    path(
+        "async/performances/",
+        PerformanceListView.as_view(),
+        name="async-performance-list",
+    ),
+    path(
+        "async/performances/<int:pk>/",
+        PerformanceDetailView.as_view(),
+        name="async-performance-detail",
+    ),
+    path(
+        "async/performances/<int:pk>/seat_map/",
+        PerformanceSeatMapView.as_view(),
+        name="async-performance-seat-map",
+    ),
+]
 
 app_name = "theatre"
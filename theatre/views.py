@@ -1,15 +1,32 @@
-from datetime import datetime
-
-from django.db.models import Count, F
+import base64
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, F, Prefetch, Sum
+from django.db.models.functions import TruncDate
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from theatre import booking, exports
+from theatre.cache import CachedResponseMixin, get_stats, invalidate
+from theatre.conditional import conditional_on_version
+from theatre.fieldsets import FIELDSET_PARAMETERS, FieldsetViewMixin
 from theatre.models import (
     Genre,
     Actor,
@@ -18,8 +35,19 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
+    HeldSeat,
+    DailySales,
 )
 from theatre.permissions import IsAdminOrIfAuthenticatedReadOnly
+from theatre.projections import (
+    PerformanceListProjection,
+    PlayListProjection,
+    ProjectedListMixin,
+    ReservationListProjection,
+)
+from theatre.renderers import SeatMapRenderer
+from theatre.seat_map import pack_seat_map
 from theatre.serializers import (
     GenreSerializer,
     ActorSerializer,
@@ -28,53 +56,180 @@ from theatre.serializers import (
     PlayListSerializer,
     PlayDetailSerializer,
     PerformanceSerializer,
+    PerformanceScheduleSerializer,
+    PerformanceOccupancySerializer,
+    PlayOccupancySerializer,
+    TheatreHallOccupancySerializer,
+    DayOccupancySerializer,
+    DailySalesSerializer,
     PerformanceListSerializer,
     PerformanceDetailSerializer,
+    PerformanceSeatMapSerializer,
     ReservationSerializer,
     ReservationListSerializer,
     TicketSerializer,
+    SeatHoldSerializer,
 )
 
 
-class GenreViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class KeysetPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        ``paginate_queryset`` for async views, run in a worker thread so the
+        cursor handling stays DRF's own.
+        """
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class PlayPagination(KeysetPagination):
+    ordering = ("title", "id")
+
+    def get_ordering(self, request, queryset, view):
+        if "rank" in queryset.query.annotations:
+            return ("-rank", "id")
+        return super().get_ordering(request, queryset, view)
+
+
+class PerformancePagination(KeysetPagination):
+    ordering = ("-show_time", "id")
+
+
+class ReservationPagination(KeysetPagination):
+    page_size = 10
+    ordering = ("-created_at", "id")
+
+
+class SeatHoldPagination(ReservationPagination):
+    pass
+
+
+# Field paths of PerformanceListSerializer -> the lookups behind them.
+PERFORMANCE_LIST_COLUMNS = {
+    "show_time": ["show_time"],
+    "play_title": ["play__title"],
+    "theatre_hall_name": ["theatre_hall__name"],
+    "theatre_hall_capacity": ["theatre_hall__rows", "theatre_hall__seats_in_row"],
+}
+
+
+class BulkCreateModelMixin(mixins.CreateModelMixin):
+    """
+    Create that also accepts a JSON array of objects, validated and inserted
+    in bulk by the serializer's list_serializer_class.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        if isinstance(serializer, ListSerializer):
+            # bulk_create sends no post_save signals.
+            invalidate(*self.get_cache_namespaces())
+
+
+@extend_schema_view(list=extend_schema(parameters=FIELDSET_PARAMETERS))
+class GenreViewSet(
+    FieldsetViewMixin,
+    CachedResponseMixin,
+    BulkCreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_namespaces = ("genres",)
+    fieldset_columns = {"name": ["name"]}
+    query_budget = {"list": 3, "create": 4}
 
 
-class ActorViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+@extend_schema_view(list=extend_schema(parameters=FIELDSET_PARAMETERS))
+class ActorViewSet(
+    FieldsetViewMixin,
+    CachedResponseMixin,
+    BulkCreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_namespaces = ("actors",)
+    fieldset_columns = {
+        "first_name": ["first_name"],
+        "last_name": ["last_name"],
+        "full_name": ["first_name", "last_name"],
+    }
+    query_budget = {"list": 3, "create": 3}
 
 
+@extend_schema_view(list=extend_schema(parameters=FIELDSET_PARAMETERS))
 class TheatreHallViewSet(
-    mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet
+    FieldsetViewMixin,
+    CachedResponseMixin,
+    BulkCreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
 ):
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_namespaces = ("theatre_halls",)
+    fieldset_columns = {
+        "name": ["name"],
+        "rows": ["rows"],
+        "seats_in_row": ["seats_in_row"],
+        "capacity": ["rows", "seats_in_row"],
+    }
+    query_budget = {"list": 3, "create": 3}
 
 
 class PlayViewSet(
+    FieldsetViewMixin,
+    CachedResponseMixin,
+    ProjectedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Play.objects.prefetch_related("genres", "actors")
+    queryset = Play.objects.all()
+    pagination_class = PlayPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    # Linking genres and actors bumps the versions of the play's performances.
+    query_budget = {"list": 5, "retrieve": 5, "create": 15}
+    fieldset_columns = {"title": ["title"], "description": ["description"]}
+    list_projection = PlayListProjection()
 
     def get_queryset(self):
         title = self.request.query_params.get("title")
+        search = self.request.query_params.get("search")
         genres = self.request.query_params.get("genres")
         actors = self.request.query_params.get("actors")
 
-        queryset = self.queryset
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        for name, model in (("genres", Genre), ("actors", Actor)):
+            if not fieldset.wants(name):
+                continue
+            related = model.objects.order_by("id")
+            if self.action == "retrieve" and not fieldset.expands(name):
+                related = related.only("id")
+            queryset = queryset.prefetch_related(Prefetch(name, queryset=related))
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
+        if search:
+            queryset = queryset.search(search)
+
         if genres:
             genre_ids = [int(id) for id in genres.split(",")]
             queryset = queryset.filter(genres__id__in=genre_ids)
@@ -85,6 +240,11 @@ class PlayViewSet(
 
         return queryset.distinct()
 
+    def get_cache_namespaces(self):
+        if self.action == "retrieve":
+            return f"play:{self.kwargs['pk']}", "play_relations"
+        return "plays", "play_relations"
+
     def get_serializer_class(self):
         if self.action == "list":
             return PlayListSerializer
@@ -107,40 +267,158 @@ class PlayViewSet(
             OpenApiParameter(
                 "title", type=OpenApiTypes.STR, description="Filter by title"
             ),
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Full-text search in title and description, "
+                    "tolerant to typos in the title; results are ranked"
+                ),
+            ),
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-
-class PerformanceViewSet(viewsets.ModelViewSet):
-    queryset = Performance.objects.select_related("play", "theatre_hall").annotate(
-        tickets_available=(
-            F("theatre_hall__rows") * F("theatre_hall__seats_in_row") - Count("tickets")
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+def _parse_show_time_bound(name, value, end=False):
+    """
+    Parses a ``date``/``from``/``to`` query parameter into a datetime bound.
+    A bare date means midnight, or the following midnight for an inclusive
+    ``end`` day.
+    """
+    try:
+        day = parse_date(value)
+        bound = parse_datetime(value) if day is None else None
+    except ValueError:
+        day = bound = None
+
+    if day is not None:
+        bound = datetime.combine(day, time.min)
+        if end:
+            bound += timedelta(days=1)
+    if bound is None:
+        raise ValidationError(
+            {name: "Enter a date (YYYY-MM-DD) or an ISO 8601 datetime."}
         )
-    )
+    if settings.USE_TZ and timezone.is_naive(bound):
+        bound = timezone.make_aware(bound)
+    return bound
+
+
+class PerformanceViewSet(FieldsetViewMixin, ProjectedListMixin, viewsets.ModelViewSet):
+    queryset = Performance.objects.all()
+    list_projection = PerformanceListProjection()
+    pagination_class = PerformancePagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    query_budget = {
+        "list": 3,
+        "retrieve": 8,
+        "seat_map": 5,
+        "create": 5,
+        "update": 6,
+        "partial_update": 6,
+        "destroy": 8,
+        # Checked and inserted in one transaction.
+        "schedule": 8,
+    }
 
     def get_queryset(self):
         date = self.request.query_params.get("date")
+        date_from = self.request.query_params.get("from")
+        date_to = self.request.query_params.get("to")
         play_id = self.request.query_params.get("play")
 
-        queryset = self.queryset
+        if self.action == "seat_map":
+            return Performance.objects.select_related("theatre_hall")
+
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+
+        if self.action == "list" and fieldset.wants("tickets_available"):
+            queryset = queryset.with_tickets_available()
+
+        if self.action == "retrieve":
+            if fieldset.expands("play"):
+                queryset = queryset.prefetch_related(
+                    *(
+                        f"play__{name}"
+                        for name in ("genres", "actors")
+                        if fieldset.wants(f"play.{name}")
+                    )
+                )
+            if fieldset.wants("taken_places"):
+                queryset = queryset.prefetch_related("tickets")
+            if fieldset.wants("held_places"):
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        "held_seats",
+                        queryset=HeldSeat.objects.active(),
+                        to_attr="active_held_seats",
+                    )
+                )
 
         if date:
-            date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(show_time__date=date)
+            start = _parse_show_time_bound("date", date)
+            queryset = queryset.show_time_between(start, start + timedelta(days=1))
+
+        if date_from:
+            queryset = queryset.show_time_between(
+                start=_parse_show_time_bound("from", date_from)
+            )
+
+        if date_to:
+            queryset = queryset.show_time_between(
+                end=_parse_show_time_bound("to", date_to, end=True)
+            )
 
         if play_id:
             queryset = queryset.filter(play_id=int(play_id))
 
         return queryset
 
+    def get_fieldset_columns(self):
+        if self.action == "list":
+            return PERFORMANCE_LIST_COLUMNS
+        if self.action != "retrieve":
+            return {}
+
+        fieldset = self.get_fieldset()
+        columns = {
+            "show_time": ["show_time"],
+            "play": ["play"],
+            "theatre_hall": ["theatre_hall"],
+        }
+        if fieldset.expands("play"):
+            columns.update(
+                {f"play.{name}": [f"play__{name}"] for name in ("title", "description")}
+            )
+        if fieldset.expands("theatre_hall"):
+            columns.update(
+                {
+                    "theatre_hall.name": ["theatre_hall__name"],
+                    "theatre_hall.rows": ["theatre_hall__rows"],
+                    "theatre_hall.seats_in_row": ["theatre_hall__seats_in_row"],
+                    "theatre_hall.capacity": [
+                        "theatre_hall__rows",
+                        "theatre_hall__seats_in_row",
+                    ],
+                }
+            )
+        return columns
+
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
         if self.action == "retrieve":
             return PerformanceDetailSerializer
+        if self.action == "schedule":
+            return PerformanceScheduleSerializer
         return PerformanceSerializer
 
     @extend_schema(
@@ -151,29 +429,170 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             OpenApiParameter(
                 "date", type=OpenApiTypes.DATE, description="Filter by performance date"
             ),
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.STR,
+                description=("Performances at or after this date or ISO 8601 datetime"),
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Performances before this datetime, or up to the end of "
+                    "this date"
+                ),
+            ),
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    @conditional_on_version
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        serializer.save(version=F("version") + 1)
+
+    @extend_schema(responses={201: PerformanceSerializer(many=True)})
+    @action(detail=False, methods=["post"])
+    def schedule(self, request):
+        """
+        Creates a run of performances from a weekly recurrence rule in one
+        insert, refusing the whole run if the hall is taken at any of them.
+        """
+        serializer = self.get_serializer(data=request.data)
+        # The hall stays locked from the conflict check to the insert.
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            performances = serializer.save()
+        return Response(
+            PerformanceSerializer(performances, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
 
-class ReservationPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
+    @extend_schema(
+        description=(
+            "Taken and held seats as a row-major bitset: raw bytes for "
+            "application/octet-stream, base64 encoded for JSON."
+        ),
+        responses={
+            (200, "application/json"): PerformanceSeatMapSerializer,
+            (200, SeatMapRenderer.media_type): OpenApiTypes.BINARY,
+        },
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, SeatMapRenderer],
+    )
+    @conditional_on_version
+    def seat_map(self, request, pk=None):
+        performance = self.get_object()
+        return self.seat_map_response(
+            request, performance.theatre_hall, self.unavailable_places(performance)
+        )
+
+    @staticmethod
+    def unavailable_places(performance):
+        return (
+            performance.tickets.order_by()
+            .values_list("row", "seat")
+            .union(
+                performance.held_seats.active().order_by().values_list("row", "seat")
+            )
+        )
+
+    def seat_map_response(self, request, hall, places):
+        seat_map = pack_seat_map(hall.rows, hall.seats_in_row, places)
+
+        if request.accepted_renderer.format == SeatMapRenderer.format:
+            return Response(
+                seat_map,
+                headers={
+                    "X-Seat-Map-Rows": hall.rows,
+                    "X-Seat-Map-Seats-In-Row": hall.seats_in_row,
+                },
+            )
+
+        serializer = PerformanceSeatMapSerializer(
+            {
+                "rows": hall.rows,
+                "seats_in_row": hall.seats_in_row,
+                "seat_map": base64.b64encode(seat_map).decode(),
+            }
+        )
+        return Response(serializer.data)
+
+    def handle_exception(self, exc):
+        # Errors carry a regular DRF payload, so a client asking for the raw
+        # seat map gets them as JSON rather than octet-stream.
+        if isinstance(
+            getattr(self.request, "accepted_renderer", None), SeatMapRenderer
+        ):
+            renderer = self.get_renderers()[0]
+            self.request.accepted_renderer = renderer
+            self.request.accepted_media_type = renderer.media_type
+        return super().handle_exception(exc)
 
 
+@extend_schema_view(list=extend_schema(parameters=FIELDSET_PARAMETERS))
 class ReservationViewSet(
-    mixins.ListModelMixin, mixins.CreateModelMixin, GenericViewSet
+    FieldsetViewMixin,
+    ProjectedListMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
 ):
-    queryset = Reservation.objects.prefetch_related(
-        "tickets__performance__play", "tickets__performance__theatre_hall"
-    )
+    queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
     permission_classes = (IsAuthenticated,)
+    query_budget = {"list": 6, "create": 17, "destroy": 13}
+    throttle_scope = {"create": "bookings"}
+    list_projection = ReservationListProjection()
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user)
+        queryset = super().get_queryset().filter(user=self.request.user)
+        if self.action == "list" and self.get_list_projection() is None:
+            queryset = queryset.prefetch_related(*self.get_ticket_prefetches())
+        return queryset
+
+    def get_fieldset_columns(self):
+        if self.action == "list":
+            return {"created_at": ["created_at"]}
+        return {}
+
+    def get_ticket_prefetches(self):
+        fieldset = self.get_fieldset()
+        if not fieldset.wants("tickets"):
+            return []
+        if not fieldset.expands("tickets"):
+            return [Prefetch("tickets", queryset=Ticket.objects.only("reservation"))]
+
+        tickets = fieldset.at("tickets")
+        prefetches = [
+            Prefetch(
+                "tickets",
+                queryset=tickets.only(
+                    Ticket.objects.all(),
+                    {"row": ["row"], "seat": ["seat"]},
+                    always=["reservation", "performance"],
+                ),
+            )
+        ]
+        if tickets.expands("performance"):
+            performances = tickets.at("performance")
+            queryset = performances.only(
+                Performance.objects.all(), PERFORMANCE_LIST_COLUMNS
+            )
+            if performances.wants("tickets_available"):
+                queryset = queryset.with_tickets_available()
+            prefetches.append(Prefetch("tickets__performance", queryset=queryset))
+        return prefetches
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -182,3 +601,268 @@ class ReservationViewSet(
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Concurrent cancellations of one reservation queue on its row;
+            # the ones that lose find it gone and leave the counters alone.
+            locked = Reservation.objects.select_for_update().filter(pk=instance.pk)
+            if not locked.exists():
+                return
+            counts = dict(
+                instance.tickets.order_by()
+                .values_list("performance_id")
+                .annotate(count=Count("id"))
+            )
+            instance.delete()
+            released = {
+                performance_id: -count for performance_id, count in counts.items()
+            }
+            Performance.add_tickets_sold(released)
+            # Sales are reported by the day they were made, so a cancellation
+            # is taken off that day.
+            DailySales.record(instance.created_at, released)
+
+
+class SeatHoldViewSet(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    queryset = SeatHold.objects.prefetch_related("seats")
+    serializer_class = SeatHoldSerializer
+    pagination_class = SeatHoldPagination
+    permission_classes = (IsAuthenticated,)
+    # Creating locks the user and counts their active holds first.
+    query_budget = {"list": 4, "retrieve": 4, "create": 18, "destroy": 9, "confirm": 17}
+    throttle_scope = {"create": "bookings", "confirm": "bookings"}
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            Performance.bump_version([instance.performance_id])
+
+    @extend_schema(
+        request=None, responses={201: ReservationSerializer, 409: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        """Turns an active hold into a reservation of the held seats."""
+        reservation = booking.confirm(self.get_object())
+        serializer = ReservationSerializer(reservation)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class CatalogueCacheStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request):
+        return Response(get_stats())
+
+
+class ExportView(APIView):
+    """
+    Streams every reservation or ticket as CSV or JSON Lines. Rows are
+    read in chunks and written out as they arrive, so memory use does not
+    grow with the size of the export.
+    """
+
+    permission_classes = (IsAdminUser,)
+    # The rows are queried while the response streams.
+    query_budget = {"get": 2}
+
+    def perform_content_negotiation(self, request, force=False):
+        # The URL picks the format and the file bypasses the renderers, so
+        # an Accept header of text/csv or application/x-ndjson is fine;
+        # errors are then rendered with the first renderer, as JSON.
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.STR,
+                description="Reservations made at or after this date or datetime",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Reservations made before this datetime, or up to the end "
+                    "of this date"
+                ),
+            ),
+            OpenApiParameter(
+                "performance",
+                type=OpenApiTypes.INT,
+                description="Only tickets for this performance",
+            ),
+        ],
+        responses={
+            (200, media_type): OpenApiTypes.BINARY
+            for media_type in exports.FORMATS.values()
+        },
+    )
+    def get(self, request, kind, file_format):
+        if kind not in exports.COLUMNS or file_format not in exports.FORMATS:
+            raise NotFound()
+
+        params = request.query_params
+        performance = params.get("performance")
+        if performance is not None and not performance.isdigit():
+            raise ValidationError({"performance": "Enter a performance id."})
+        columns, rows = exports.export_rows(
+            kind,
+            start=params.get("from") and _parse_show_time_bound("from", params["from"]),
+            end=params.get("to")
+            and _parse_show_time_bound("to", params["to"], end=True),
+            performance=performance and int(performance),
+        )
+        if isinstance(request._request, ASGIRequest):
+            content = exports.arender(columns, rows, file_format)
+        else:
+            content = exports.render(columns, rows, file_format)
+        response = StreamingHttpResponse(
+            content, content_type=exports.FORMATS[file_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{file_format}"'
+        return response
+
+
+ANALYTICS_PARAMETERS = [
+    OpenApiParameter(
+        "from", type=OpenApiTypes.DATE, description="Performances on or after this day"
+    ),
+    OpenApiParameter(
+        "to", type=OpenApiTypes.DATE, description="Performances up to this day"
+    ),
+]
+
+
+class AnalyticsViewSet(GenericViewSet):
+    """
+    Occupancy and sales reports for admins. Occupancy is aggregated from
+    the tickets_sold counters of performances and sales from DailySales,
+    so no report reads the ticket table.
+    """
+
+    permission_classes = (IsAdminUser,)
+    pagination_class = None
+    query_budget = 3
+
+    def get_performances(self):
+        queryset = Performance.objects.order_by().annotate(
+            capacity=F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+        )
+        date_from = self.request.query_params.get("from")
+        date_to = self.request.query_params.get("to")
+        if date_from:
+            queryset = queryset.show_time_between(
+                start=_parse_show_time_bound("from", date_from)
+            )
+        if date_to:
+            queryset = queryset.show_time_between(
+                end=_parse_show_time_bound("to", date_to, end=True)
+            )
+        return queryset
+
+    def occupancy(self, serializer_class, *fields, **expressions):
+        rows = (
+            self.get_performances()
+            .values(*fields, **expressions)
+            .annotate(
+                performances=Count("pk"),
+                capacity=Sum("capacity"),
+                tickets_sold=Sum("tickets_sold"),
+            )
+            .order_by(*fields, *expressions)
+        )
+        return Response(serializer_class(rows, many=True).data)
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS,
+        responses=PerformanceOccupancySerializer(many=True),
+    )
+    @action(detail=False)
+    def performances(self, request):
+        rows = (
+            self.get_performances()
+            .values(
+                "id", "play", "theatre_hall", "show_time", "capacity", "tickets_sold"
+            )
+            .order_by("show_time", "id")
+        )
+        return Response(PerformanceOccupancySerializer(rows, many=True).data)
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS, responses=PlayOccupancySerializer(many=True)
+    )
+    @action(detail=False)
+    def plays(self, request):
+        return self.occupancy(PlayOccupancySerializer, "play", title=F("play__title"))
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS,
+        responses=TheatreHallOccupancySerializer(many=True),
+    )
+    @action(detail=False)
+    def theatre_halls(self, request):
+        return self.occupancy(
+            TheatreHallOccupancySerializer,
+            "theatre_hall",
+            name=F("theatre_hall__name"),
+        )
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS, responses=DayOccupancySerializer(many=True)
+    )
+    @action(detail=False)
+    def days(self, request):
+        return self.occupancy(DayOccupancySerializer, date=TruncDate("show_time"))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from", type=OpenApiTypes.DATE, description="Sales on or after this day"
+            ),
+            OpenApiParameter(
+                "to", type=OpenApiTypes.DATE, description="Sales up to this day"
+            ),
+            OpenApiParameter(
+                "play", type=OpenApiTypes.INT, description="Only tickets for this play"
+            ),
+        ],
+        responses=DailySalesSerializer(many=True),
+    )
+    @action(detail=False)
+    def sales(self, request):
+        """Tickets sold per day, net of cancellations."""
+        queryset = DailySales.objects.order_by()
+        date_from = self.request.query_params.get("from")
+        date_to = self.request.query_params.get("to")
+        play_id = self.request.query_params.get("play")
+        if date_from:
+            queryset = queryset.filter(
+                date__gte=_parse_show_time_bound("from", date_from).date()
+            )
+        if date_to:
+            queryset = queryset.filter(
+                date__lt=_parse_show_time_bound("to", date_to, end=True).date()
+            )
+        if play_id:
+            queryset = queryset.filter(performance__play_id=int(play_id))
+        rows = (
+            queryset.values("date")
+            .annotate(tickets_sold=Sum("tickets_sold"))
+            .order_by("date")
+        )
+        return Response(DailySalesSerializer(rows, many=True).data)
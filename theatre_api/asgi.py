@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_api.settings")
+# Async requests hop between threads, so a persistent connection would be
+# left open by every thread that touched the database.
+os.environ["DB_CONN_MAX_AGE"] = "0"
 
 application = get_asgi_application()
@@ -9,11 +9,23 @@ from decouple import config
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = ("django-insecure-a+)obuw+(52gwu&dye=14btiza=y&t%st#$3n(3+m!_7v*&y17")
-
-DEBUG = True
-
-ALLOWED_HOSTS = []
+# "development" (the default) or "production".
+DJANGO_ENV = os.environ.get("DJANGO_ENV", "development")
+PRODUCTION = DJANGO_ENV == "production"
+
+if PRODUCTION:
+    SECRET_KEY = os.environ["SECRET_KEY"]
+else:
+    SECRET_KEY = os.environ.get(
+        "SECRET_KEY",
+        "django-insecure-a+)obuw+(52gwu&dye=14btiza=y&t%st#$3n(3+m!_7v*&y17",
+    )
+
+DEBUG = os.environ.get("DEBUG", str(not PRODUCTION)).lower() in ("1", "true", "yes")
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -26,7 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
@@ -42,9 +54,14 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+# Debug instrumentation only outside production.
+if not PRODUCTION:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(0, "theatre.query_budget.QueryBudgetMiddleware")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "theatre_api.urls"
 
 TEMPLATES = [
@@ -72,6 +89,13 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Reuse connections across requests; a health check on reuse
+        # replaces connections the server has dropped. The ASGI entry point
+        # forces 0, as persistent connections leak under async workers.
+        "CONN_MAX_AGE": int(
+            os.environ.get("DB_CONN_MAX_AGE", 600 if PRODUCTION else 0)
+        ),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -101,22 +125,68 @@ USE_TZ = False
 AUTH_USER_MODEL = "user.User"
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "static"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+CACHES = {
+    # Authenticated users among others; point it at a cache shared between
+    # worker processes so edits to a user reach all of them at once.
+    "default": {
+        "BACKEND": os.environ.get(
+            "DEFAULT_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("DEFAULT_CACHE_LOCATION", ""),
+    },
+    # Catalogue responses; set the backend to
+    # django.core.cache.backends.filebased.FileBasedCache and the location
+    # to a directory to share the cache between worker processes.
+    "catalogue": {
+        "BACKEND": os.environ.get(
+            "CATALOGUE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("CATALOGUE_CACHE_LOCATION", "catalogue"),
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson for JSON; MessagePack for clients that send
+    # Accept/Content-Type: application/msgpack.
+    "DEFAULT_RENDERER_CLASSES": [
+        "theatre.renderers.ORJSONRenderer",
+        "theatre.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "theatre.parsers.ORJSONParser",
+        "theatre.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Throttle state lives in the database so every worker shares it.
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "theatre.throttling.AnonBucketThrottle",
+        "theatre.throttling.UserBucketThrottle",
+        "theatre.throttling.ScopedBucketThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    # Overridable, e.g. to benchmark a running server with benchmark_api.
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("THROTTLE_RATE_ANON", "10/day"),
+        "user": os.environ.get("THROTTLE_RATE_USER", "30/day"),
+        # Reservation and seat hold writes, on top of the user rate.
+        "bookings": os.environ.get("THROTTLE_RATE_BOOKINGS", "10/hour"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
 }
 
@@ -133,8 +203,21 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# How long seats stay held for a customer before returning to sale.
+SEAT_HOLD_TTL = timedelta(seconds=int(os.environ.get("SEAT_HOLD_TTL_SECONDS", 600)))
+# Most seats one hold may cover, and most active holds one user may keep.
+SEAT_HOLD_MAX_SEATS = int(os.environ.get("SEAT_HOLD_MAX_SEATS", 10))
+SEAT_HOLD_MAX_ACTIVE = int(os.environ.get("SEAT_HOLD_MAX_ACTIVE", 3))
+
+# How long a performance occupies its hall; scheduled runs may not overlap.
+PERFORMANCE_SLOT = timedelta(hours=3)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
 }
+
+# Seconds an authenticated user is served from the cache instead of the
+# database; see user.authentication.CachedJWTAuthentication.
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 60))
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps the user it loads in the cache for
+    AUTH_USER_CACHE_TIMEOUT seconds, keyed by user id, so repeated requests
+    by one user skip the user query whichever token they carry.
+
+    Saving or deleting a user drops the entry (see user.signals). With a
+    per-process cache, other processes keep theirs until it times out.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = self.get_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+    @staticmethod
+    def get_cache_key(user_id):
+        return f"auth:user:{user_id}"
+
+    @classmethod
+    def cache_user(cls, user):
+        """Stores ``user`` for the next requests, e.g. after an update."""
+        key = cls.get_cache_key(getattr(user, api_settings.USER_ID_FIELD))
+        cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+    @classmethod
+    def forget_user(cls, user):
+        cache.delete(cls.get_cache_key(getattr(user, api_settings.USER_ID_FIELD)))
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = CachedJWTAuthentication
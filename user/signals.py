@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import CachedJWTAuthentication
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    # Profile edits and revoked is_active or is_staff flags, from the API
+    # or the admin, apply to every session from the next request.
+    CachedJWTAuthentication.forget_user(instance)
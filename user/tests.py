@@ -1,3 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+GENRE_URL = reverse("theatre:genre-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+ME_URL = reverse("user:manage")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    def user_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            res = getattr(self.client, method)(url, data, format="json")
+        table = get_user_model()._meta.db_table
+        return res, [query for query in queries if table in query["sql"]]
+
+    def test_user_is_loaded_once_per_token(self):
+        self.authenticate(self.user)
+
+        first, first_queries = self.user_queries("get", RESERVATION_URL)
+        second, second_queries = self.user_queries("get", RESERVATION_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first_queries), 1)
+        self.assertEqual(second_queries, [])
+
+    def test_staff_flag_is_cached(self):
+        self.authenticate(self.admin)
+        self.client.get(GENRE_URL)
+
+        res, queries = self.user_queries("post", GENRE_URL, {"name": "Drama"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(queries, [])
+
+    def test_user_is_reloaded_when_the_entry_expires(self):
+        self.authenticate(self.user)
+        self.client.get(GENRE_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.clear()
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_the_cache(self):
+        self.authenticate(self.user)
+        self.client.get(GENRE_URL)
+
+        self.client.patch(ME_URL, {"email": "new@test.com"}, format="json")
+        res, queries = self.user_queries("get", ME_URL)
+
+        self.assertEqual(res.data["email"], "new@test.com")
+        self.assertEqual(queries, [])
+
+    def test_user_changes_apply_at_once(self):
+        self.authenticate(self.admin)
+        self.client.get(GENRE_URL)
+        self.admin.is_staff = False
+        self.admin.save()
+
+        res = self.client.post(GENRE_URL, {"name": "Drama"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_profile_update_reaches_other_sessions(self):
+        other_session = APIClient()
+        other_session.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        other_session.get(ME_URL)
+        self.authenticate(self.user)
+
+        self.client.patch(ME_URL, {"email": "new@test.com"}, format="json")
+        res = other_session.get(ME_URL)
+
+        self.assertEqual(res.data["email"], "new@test.com")
@@ -1,18 +1,26 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from user.authentication import CachedJWTAuthentication
 from user.serializers import UserSerializer
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    query_budget = {"post": 4}
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
+    query_budget = {"get": 2, "put": 5, "patch": 5}
 
     def get_object(self):
         return self.request.user
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        # Saving dropped the cached user; later requests, with any of the
+        # user's tokens, read the new profile from the cache.
+        if isinstance(self.request.successful_authenticator, CachedJWTAuthentication):
+            CachedJWTAuthentication.cache_user(serializer.instance)